@@ -13,7 +13,7 @@ import os
 from dotenv import load_dotenv
 from langchain.agents import initialize_agent
 from langchain.agents.agent_types import AgentType
-from langchain_community.chat_models import ChatOpenAI
+from backend.core.llm_clients import get_chat_llm
 from backend.tools.registry import tools
 
 # Load environment variables at module level
@@ -28,7 +28,7 @@ def load_agent():
     Runnable
         A configured LangChain agent ready to be invoked with input.
     """
-    llm = ChatOpenAI(model_name="gpt-4o-mini")  # Using same model name consistently
+    llm = get_chat_llm("agent")
     agent = initialize_agent(
         tools=tools,
         llm=llm,
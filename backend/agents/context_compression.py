@@ -0,0 +1,231 @@
+"""
+Query-focused compression of tool output before the summary LLM call.
+
+Tool results can be long (five Tavily articles, five scored shot descriptions)
+while the answer usually depends on a handful of sentences. The compressor
+splits the result into sentences, ranks them by cosine similarity to the query
+with the local embedding model, drops near-duplicates of sentences already
+kept, and keeps the best ones within a per-route token budget, in their
+original order. Sentences far less relevant than the best one are dropped even
+when budget remains. A search result's ``Source:`` line is kept (and charged to
+the budget) whenever one of its sentences is, so the summary can still cite it.
+Results made of scored records (one ``Score: ... | ...`` line per shot) are
+ranked and kept a whole line at a time instead: a shot's classification and
+metrics only mean something next to each other, and the templated sentences
+of different shots would otherwise be pruned as repeats of each other.
+Fewer prompt tokens make the summary call faster and cheaper.
+
+Configuration
+-------------
+CONTEXT_COMPRESSION_ENABLED : bool
+    Set to "false" to send tool results to the summarizer unchanged (default "true").
+CONTEXT_REDUNDANCY_THRESHOLD : float
+    Sentences at least this similar to a kept sentence are dropped (default 0.9).
+CONTEXT_MIN_RELEVANCE : float
+    Sentences scoring below this fraction of the best sentence's relevance are
+    dropped (default 0.5).
+CONTEXT_TOKEN_BUDGETS : JSON object
+    Per-route token budget overrides, e.g. '{"search_golfpedia": 600}'. A budget
+    of null leaves that route's results untouched.
+"""
+
+import json
+import os
+import re
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from dotenv import load_dotenv
+
+from backend.core.local_embeddings import encode_texts
+
+load_dotenv()
+
+CONTEXT_COMPRESSION_ENABLED = (
+    os.getenv("CONTEXT_COMPRESSION_ENABLED", "true").lower() == "true"
+)
+CONTEXT_REDUNDANCY_THRESHOLD = float(os.getenv("CONTEXT_REDUNDANCY_THRESHOLD", "0.9"))
+CONTEXT_MIN_RELEVANCE = float(os.getenv("CONTEXT_MIN_RELEVANCE", "0.5"))
+
+DEFAULT_TOKEN_BUDGET = 400
+# Structured results (course JSON, stat tables) are already compact and must stay intact
+ROUTE_TOKEN_BUDGETS = {
+    "search_golfpedia": 400,
+    "get_shot_recommendations": 300,
+    "course_insights": None,
+    "get_pro_stats": None,
+    **json.loads(os.getenv("CONTEXT_TOKEN_BUDGETS", "{}")),
+}
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])")
+# List numbering and retrieval scores mean nothing to the summarizer
+LINE_PREFIX = re.compile(r"^(Score: -?\d+(\.\d+)? \| |\d+\.\s+)")
+# One retrieved record per line (see format_recommendations in the shot tool)
+SCORED_LINE = re.compile(r"^Score: -?\d+(\.\d+)? \| ")
+# Closes each search result (see search_golfpedia_tool); cited by the summary
+SOURCE_LINE = re.compile(r"^Source: ")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate OpenAI token count (about four characters per token for English)."""
+    return max(1, (len(text) + 3) // 4)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split a tool result into sentences, line by line, dropping exact repeats."""
+    sentences = []
+    seen = set()
+    for line in text.splitlines():
+        line = LINE_PREFIX.sub("", line.strip())
+        for sentence in SENTENCE_BOUNDARY.split(line):
+            sentence = sentence.strip()
+            key = " ".join(sentence.lower().split())
+            if sentence and key not in seen:
+                seen.add(key)
+                sentences.append(sentence)
+    return sentences
+
+
+def split_records(text: str) -> Optional[List[str]]:
+    """
+    The lines of a result made only of scored records, without their scores,
+    or None when ``text`` is not such a result.
+    """
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    if not lines or not all(SCORED_LINE.match(line) for line in lines):
+        return None
+    return [SCORED_LINE.sub("", line) for line in lines]
+
+
+class ContextCompressor:
+    """
+    Extracts the sentences of a tool result most relevant to the query.
+
+    Parameters
+    ----------
+    route_budgets : dict of str to int or None, optional
+        Token budget per route; None disables compression for that route.
+    default_budget : int
+        Budget for routes without an explicit entry.
+    redundancy_threshold : float
+        Cosine similarity above which a sentence counts as a duplicate.
+    min_relevance : float
+        Fraction of the best sentence's relevance below which sentences are dropped.
+    encode : callable, optional
+        Function mapping a list of texts to normalized vectors.
+    """
+
+    def __init__(
+        self,
+        route_budgets: Optional[Dict[str, Optional[int]]] = None,
+        default_budget: int = DEFAULT_TOKEN_BUDGET,
+        redundancy_threshold: float = CONTEXT_REDUNDANCY_THRESHOLD,
+        min_relevance: float = CONTEXT_MIN_RELEVANCE,
+        encode: Optional[Callable] = None,
+    ):
+        self.route_budgets = (
+            ROUTE_TOKEN_BUDGETS if route_budgets is None else route_budgets
+        )
+        self.default_budget = default_budget
+        self.redundancy_threshold = redundancy_threshold
+        self.min_relevance = min_relevance
+        self._encode = encode or encode_texts
+        self._lock = threading.Lock()
+        self.stats = {"compressed": 0, "tokens_in": 0, "tokens_out": 0}
+
+    def budget_for(self, route: Optional[str]) -> Optional[int]:
+        return self.route_budgets.get(route, self.default_budget)
+
+    def compress(self, query: str, text: str, route: Optional[str] = None) -> str:
+        """
+        Compress a tool result to the route's token budget.
+
+        Parameters
+        ----------
+        query : str
+            The user query the sentences are ranked against.
+        text : str
+            The tool result.
+        route : str, optional
+            The tool that produced the result (selects the budget).
+
+        Returns
+        -------
+        str
+            The kept sentences (or whole records), one per line in their
+            original order, or ``text`` unchanged when it already fits the budget.
+        """
+        budget = self.budget_for(route)
+        tokens_in = estimate_tokens(text)
+        if budget is None or tokens_in <= budget:
+            return text
+        records = split_records(text)
+        sources = {}
+        if records is not None:
+            # Templated records all look alike, so only relevance and budget select them
+            sentences, redundancy_threshold = records, None
+        else:
+            sentences, redundancy_threshold = [], self.redundancy_threshold
+        # Source lines are not ranked; each cites the sentences since the previous one
+            cites = []
+            for line in split_sentences(text):
+                if SOURCE_LINE.match(line):
+                    for index in cites:
+                        sources[index] = line
+                    cites = []
+                else:
+                    cites.append(len(sentences))
+                    sentences.append(line)
+        if len(sentences) < 2:
+            return text
+
+        vectors = np.asarray(self._encode([query] + sentences), dtype=np.float32)
+        query_vector, sentence_vectors = vectors[0], vectors[1:]
+        relevance = sentence_vectors @ query_vector
+        cutoff = self.min_relevance * float(np.max(relevance))
+
+        kept: List[int] = []
+        cited = set()
+        used = 0
+        for index in np.argsort(-relevance):
+            if relevance[index] < cutoff:
+                break
+            source = sources.get(int(index))
+            cost = estimate_tokens(sentences[index])
+            if source is not None and source not in cited:
+                cost += estimate_tokens(source)
+            if used + cost > budget:
+                continue
+            if redundancy_threshold is not None and kept:
+                similarity = float(
+                    np.max(sentence_vectors[kept] @ sentence_vectors[index])
+                )
+                if similarity >= redundancy_threshold:
+                    continue
+            kept.append(int(index))
+            if source is not None:
+                cited.add(source)
+            used += cost
+        if not kept:
+        # Every sentence is over budget on its own: keep the most relevant, cut it
+            return sentences[int(np.argmax(relevance))][: budget * 4]
+
+        output = []
+        for index in sorted(kept):
+            output.append(sentences[index])
+            source = sources.get(index)
+            # The source follows the last kept sentence of its result
+            if source is not None and not any(
+                sources.get(later) == source for later in kept if later > index
+            ):
+                output.append(source)
+        compressed = "\n".join(output)
+        with self._lock:
+            self.stats["compressed"] += 1
+            self.stats["tokens_in"] += tokens_in
+            self.stats["tokens_out"] += estimate_tokens(compressed)
+        return compressed
+
+
+context_compressor = ContextCompressor()
@@ -1,105 +1,380 @@
 import os
+import re
+import json
+import asyncio
 from dotenv import load_dotenv
-from langchain_core.runnables import RunnableLambda
+from langchain_core.runnables import RunnableLambda, RunnableConfig
 from langchain_core.messages import AIMessage, HumanMessage
-from langchain_community.chat_models import ChatOpenAI
 from langgraph.graph import StateGraph, END
 from langchain.agents import Tool
-from typing import TypedDict, Optional
-from backend.tools.registry import tools
+from typing import Awaitable, Callable, Iterable, TypedDict, Optional
+from backend.tools.registry import direct_answers, structured_tools, tools
+from backend.agents.local_router import local_router
+from backend.agents.context_compression import (
+    CONTEXT_COMPRESSION_ENABLED,
+    context_compressor,
+)
+from backend.agents.speculation import (
+    SPECULATIVE_EXECUTION_ENABLED,
+    cancel_speculation,
+    resolve_speculation,
+    start_speculation,
+)
+from backend.core.executors import run_blocking
+from backend.core.llm_clients import get_chat_llm
+from backend.core.metrics import timed_node
 from backend.core.logging_config import logger
 
 load_dotenv()
 
+AGENT_BATCH_CONCURRENCY = int(os.getenv("AGENT_BATCH_CONCURRENCY", "8"))
+DIRECT_ANSWERS_ENABLED = os.getenv("DIRECT_ANSWERS_ENABLED", "true").lower() == "true"
+
 class AgentState(TypedDict, total=False):
     input: str
+    next: Optional[str]
+    tool_args: Optional[dict]
+    speculated_tool: Optional[str]
     tool_result: Optional[str]
     final_response: Optional[str]
 
-# lazy instantiation of the llm:
-def get_llm():
-    return ChatOpenAI(
-        temperature=0.3,
-        model="gpt-4",
-        openai_api_key=os.getenv("OPENAI_API_KEY")
-    )
+# pooled, per-node llm clients (see backend/core/llm_clients.py):
+def get_llm(node: str = "summarize"):
+    return get_chat_llm(node)
 
-def route_with_llm(state: AgentState) -> str:
+async def route_with_llm(
+    state: AgentState, config: Optional[RunnableConfig] = None
+) -> str:
     query = state.get("input")
     if not query:
         raise ValueError("[ROUTER FUNC ERROR] No input found in state.")
 
-    llm = get_llm()
-    response = llm.invoke([
-        HumanMessage(content=f"""Classify this golf-related query into one of the following categories:
+    # Fast path: confident local classification skips the LLM round trip
+    if local_router.is_ready:
+        tool_name = await run_blocking(local_router.route, query)
+        if tool_name in tool_map:
+            logger.debug(f"[ROUTER FUNC w/ LOCAL] Routed '{query}' → {tool_name}")
+            return {"next": tool_name}
+
+    # Start likely cheap tools now so their latency overlaps the LLM router call
+    speculative = (
+        start_speculation(query, tool_map) if SPECULATIVE_EXECUTION_ENABLED else {}
+    )
+
+    llm = get_llm("router")
+    try:
+        response = await llm.ainvoke(
+            [
+                HumanMessage(
+                    content=f"""Classify this golf-related query into one of the following categories:
 - "get_pro_stats": if it compares or asks about player stats
 - "course_insights": if it's asking about a specific golf course
-- "get_shot_recommendations": if it's asking about club selection, shot technique, or avoiding certain shot patterns
+- "get_shot_recommendations": if it's asking about club selection, shot technique, avoiding certain shot patterns, or statistics about the golfer's own shots
 - "search_golfpedia": for all other general golf knowledge
 
-Respond with just one word: get_pro_stats, course_insights, get_shot_recommendations, or search_golfpedia.
+Respond with JSON only: {{"tool": "<category>", "args": {{...}}}}
+For "get_shot_recommendations", "args" is the structured intent behind the shot:
+- distance (number or 'unknown')
+- intent ('avoid', 'achieve', or 'aggregate' for statistics about the golfer's past shots)
+- shape (or 'unknown')
+- club (or 'unknown')
+For every other category, "args" is {{}}.
 
 Query: "{query}" """)
-    ])
+        ], config=config)
+    except BaseException:
+        cancel_speculation(speculative)
+        raise
 
-    tool_name = response.content.strip()
-    logger.debug(f"[ROUTER FUNC w/ LLM] Routed '{query}' → {tool_name}")
-    logger.debug(f"[DEBUG] Router output: '{tool_name}'")
+    tool_name, tool_args = parse_route(response.content)
+    logger.debug(
+        f"[ROUTER FUNC w/ LLM] Routed '{query}' → {tool_name} args={tool_args}"
+    )
+    if speculative:
+        speculative_result = await resolve_speculation(speculative, tool_name)
+        if speculative_result is not None:
+            return {
+                "next": tool_name,
+                "speculated_tool": tool_name,
+                "tool_result": speculative_result,
+            }
+    if tool_args:
+        return {"next": tool_name, "tool_args": tool_args}
     return {"next": tool_name}
 
+def parse_route(content: str):
+    """
+    Parse the router's reply into the tool name and its structured arguments.
+
+    Accepts the JSON object the router prompt asks for and, as a fallback, a
+    bare tool name.
+
+    Returns
+    -------
+    tuple of (str, dict or None)
+        The tool name and its arguments (None when there are none).
+    """
+    text = content.strip()
+    match = re.search(r"\{.*\}", text, re.S)
+    if match:
+        try:
+            parsed = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            parsed = None
+        if isinstance(parsed, dict) and parsed.get("tool"):
+            args = parsed.get("args")
+            return str(parsed["tool"]).strip(), args if isinstance(
+                args, dict
+            ) and args else None
+    return text.strip("\"'` "), None
+
 # Tool execution logic
 tool_map = {t.name: t for t in tools}
 
+def refresh_tool_map():
+    """Re-sync ``tool_map`` with the tool registry (in place, for importers)."""
+    tool_map.clear()
+    tool_map.update({t.name: t for t in tools})
+    return tool_map
+
+def render_direct_answer(name: str, query: str, tool_result) -> Optional[str]:
+    """Render a tool's user-ready output with its local template, if it has one."""
+    renderer = direct_answers.get(name) if DIRECT_ANSWERS_ENABLED else None
+    if renderer is None or not isinstance(tool_result, str):
+        return None
+    try:
+        return renderer(query, tool_result)
+    except Exception:
+        logger.warning(
+            f"Direct answer for {name} failed; summarizing instead", exc_info=True
+        )
+        return None
+
 def wrap_tool(name):
     tool = tool_map[name]
-    def run(state: AgentState):
-        logger.debug(f"[TOOL NODE] Running tool: {name} with input: {state.get('input')}")
-        result = tool.invoke(state["input"])
-        logger.debug(f"[DEBUG] Tool '{name}' result type: {type(result)} value: {result}")
-        logger.debug(f"[DEBUG] Tool.invoke for '{name}': {getattr(tool, 'invoke', None)}, type: {type(getattr(tool, 'invoke', None))}")
+    async def run(state: AgentState, config: Optional[RunnableConfig] = None):
+        if (
+            state.get("speculated_tool") == name
+            and state.get("tool_result") is not None
+        ):
+            logger.debug(f"[TOOL NODE] Using speculative result for {name}")
+            result = state["tool_result"]
+        else:
+            logger.debug(
+                f"[TOOL NODE] Running tool: {name} with input: {state.get('input')}"
+            )
+            # Tools are synchronous (requests, Tavily, Qdrant, SentenceTransformer),
+            # so run them in the bounded tool executor instead of on the event loop
+            # them in the bounded tool executor instead of on the event loop
+            if state.get("tool_args") and name in structured_tools:
+                # The router already extracted this tool's arguments; reuse them
+                structured = structured_tools[name]
+                if asyncio.iscoroutinefunction(structured):
+                    result = await structured(state["input"], state["tool_args"])
+                else:
+                    result = await run_blocking(
+                        structured, state["input"], state["tool_args"]
+                    )
+            else:
+                result = await run_blocking(tool.invoke, state["input"], config)
+            logger.debug(
+                f"[DEBUG] Tool '{name}' result type: {type(result)} value: {result}"
+            )
+
+        answer = render_direct_answer(name, state["input"], result)
+        if answer is not None:
+            logger.debug(f"[TOOL NODE] {name} answered directly; skipping the summary")
+            return AgentState(
+                {**state, "tool_result": result, "final_response": answer}
+            )
         return AgentState({**state, "tool_result": result})
-    return RunnableLambda(run)
+    return RunnableLambda(timed_node(name, run))
+
+# Context compression node: keep only the parts of the tool result relevant to the query
+async def compress_context(state: AgentState):
+    try:
+        compressed = await run_blocking(
+            context_compressor.compress,
+            state["input"],
+            state["tool_result"],
+            state.get("next"),
+        )
+    except Exception:
+        logger.warning(
+            "Context compression failed; summarizing the full tool result",
+            exc_info=True,
+        )
+        return {}
+    return {"tool_result": compressed}
 
 # Summary node
-def summarize_result(state: AgentState):
+async def summarize_result(state: AgentState, config: Optional[RunnableConfig] = None):
     logger.debug(f"[SUMMARY NODE] Received tool result: {state.get('tool_result')}")
-    summary = get_llm().invoke([
+    # Passing the run config through lets astream_events surface the summary tokens
+    summary = await get_llm("summarize").ainvoke([
         HumanMessage(content=f'''You are a golf research assistant. Here is the tool result:
 
 {state["tool_result"]}
 
 Please summarize the answer as a helpful response to the user query: "{state["input"]}"''')
-    ])
+    ], config=config)
     return {"final_response": summary.content}
 
 def create_graph():
     workflow = StateGraph(AgentState)
 
     # Add nodes
-    workflow.add_node("router", route_with_llm)
+    workflow.add_node("router", timed_node("router", route_with_llm))
     for tool_name in tool_map:
-        logger.debug(f"[DEBUG] Adding node: {tool_name} with {wrap_tool(tool_name)}")
         workflow.add_node(tool_name, wrap_tool(tool_name))
-    workflow.add_node("summarize", RunnableLambda(summarize_result))
+    workflow.add_node(
+        "summarize", RunnableLambda(timed_node("summarize", summarize_result))
+    )
+    if CONTEXT_COMPRESSION_ENABLED:
+        workflow.add_node(
+            "compress", RunnableLambda(timed_node("compress", compress_context))
+        )
+        workflow.add_edge("compress", "summarize")
 
     # Add edges
     workflow.add_conditional_edges("router", lambda state: state["next"])
+    after_tool = "compress" if CONTEXT_COMPRESSION_ENABLED else "summarize"
     for tool_name in tool_map:
-        workflow.add_edge(tool_name, "summarize")
+        if tool_name in direct_answers:
+            # Directly answered results are final; everything else is summarized
+            workflow.add_conditional_edges(
+                tool_name,
+                lambda state: END if state.get("final_response") else after_tool,
+                [after_tool, END],
+            )
+        else:
+            workflow.add_edge(tool_name, after_tool)
     workflow.add_edge("summarize", END)
 
-    # debug info:
     logger.debug(f"[DEBUG] All nodes in workflow: {list(workflow.nodes.keys())}")
-    for name, node in workflow.nodes.items():
-        logger.debug(f"[DEBUG] Node '{name}' is of type {type(node)} and value: {node}")
-    
+
     # Set entry point
     workflow.set_entry_point("router")
 
     return workflow.compile()
 
-# Create the graph instance
-graph = create_graph()
+async def arun_batch(
+    queries: Iterable[str],
+    concurrency: int = AGENT_BATCH_CONCURRENCY,
+    graph=None,
+    invoke: Optional[Callable[[str], Awaitable[str]]] = None,
+):
+    """
+    Answer many queries with at most ``concurrency`` graph runs in flight.
+
+    Parameters
+    ----------
+    queries : iterable of str
+        The queries to answer; consumed lazily, so it may be a generator.
+    concurrency : int
+        Maximum number of queries processed at once.
+    graph : CompiledGraph, optional
+        The compiled graph to run (defaults to ``create_graph()``).
+    invoke : callable, optional
+        Coroutine function mapping a query to its final response; overrides
+        ``graph`` (the API uses this to go through the answer cache).
+
+    Yields
+    ------
+    dict
+        ``{"index", "query", "response"}`` or ``{"index", "query", "error"}`` per
+        query, in completion order.
+    """
+    if invoke is None:
+        graph = graph or create_graph()
+
+        async def invoke(query):
+            result = await graph.ainvoke({"input": query})
+            return result["final_response"]
+
+    pending = iter(enumerate(queries))
+    results = asyncio.Queue()
+    worker_finished = object()
+
+    async def worker():
+        try:
+            for index, query in pending:
+                try:
+                    result = {
+                        "index": index,
+                        "query": query,
+                        "response": await invoke(query),
+                    }
+                except Exception as e:
+                    logger.error(f"[BATCH] Query {index} failed: {e}")
+                    result = {"index": index, "query": query, "error": str(e)}
+                await results.put(result)
+        finally:
+            results.put_nowait(worker_finished)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(max(1, concurrency))]
+    finished = 0
+    try:
+        while finished < len(workers):
+            result = await results.get()
+            if result is worker_finished:
+                finished += 1
+            else:
+                yield result
+    finally:
+        for task in workers:
+            task.cancel()
+
+async def astream_agent_events(graph, query: str):
+    """
+    Run the graph and yield progress and token events as they happen.
+
+    Parameters
+    ----------
+    graph : CompiledGraph
+        The compiled agent graph.
+    query : str
+        The user query.
+
+    Yields
+    ------
+    dict
+        ``{"type": "progress", "node": ..., "status": "start" | "end", ...}`` when a
+        graph node starts or finishes, ``{"type": "token", "content": ...}`` for each
+        summary token, and a final ``{"type": "done", "response": ..., "route": ...}``.
+    """
+    nodes = {"router", "compress", "summarize", *tool_map}
+    final_state = {}
+    streamed_tokens = False
+
+    async for event in graph.astream_events({"input": query}, version="v2"):
+        kind = event["event"]
+        name = event.get("name")
+        node = event.get("metadata", {}).get("langgraph_node")
+
+        if kind == "on_chain_start" and name in nodes and node == name:
+            yield {"type": "progress", "node": name, "status": "start"}
+        elif kind == "on_chain_end" and name in nodes and node == name:
+            progress = {"type": "progress", "node": name, "status": "end"}
+            output = event.get("data", {}).get("output")
+            if name == "router" and isinstance(output, dict):
+                progress["route"] = output.get("next")
+            yield progress
+        elif kind == "on_chat_model_stream" and node == "summarize":
+            content = getattr(event["data"]["chunk"], "content", "")
+            if content:
+                streamed_tokens = True
+                yield {"type": "token", "content": content}
+        elif kind == "on_chain_end" and not event.get("parent_ids"):
+            output = event.get("data", {}).get("output")
+            if isinstance(output, dict):
+                final_state = output
+
+    response = final_state.get("final_response", "")
+    if response and not streamed_tokens:
+        # Nodes that answer without the summary LLM still produce one text chunk
+        yield {"type": "token", "content": response}
+    yield {"type": "done", "response": response, "route": final_state.get("next")}
 
 # Optional standalone test
 if __name__ == "__main__":
@@ -107,5 +382,5 @@ if __name__ == "__main__":
     from pprint import pprint
 
     logger.info("🚀 Running standalone agent test...")
-    result = asyncio.run(graph.ainvoke({"input": "How do I hit a flop shot?"}))
+    result = asyncio.run(create_graph().ainvoke({"input": "How do I hit a flop shot?"}))
     pprint(result)
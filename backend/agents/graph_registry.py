@@ -0,0 +1,83 @@
+"""
+Process-wide registry for the compiled golf agent graph.
+
+Compiling the LangGraph workflow wraps every registered tool and builds the
+state machine, so it is done once at application startup (see the FastAPI
+lifespan in ``backend/main.py``) and shared by every request. Call
+``graph_registry.rebuild()`` after changing ``backend.tools.registry.tools``
+to pick up the new tool set.
+"""
+
+import threading
+
+from backend.agents.golf_langgraph import create_graph, refresh_tool_map
+from backend.core.logging_config import logger
+
+
+class GraphRegistry:
+    """
+    Holds the compiled agent graph and rebuilds it on demand.
+
+    Attributes
+    ----------
+    version : int
+        Incremented on every (re)build so callers can detect a swap.
+    """
+
+    def __init__(self):
+        self._graph = None
+        self._lock = threading.Lock()
+        self.version = 0
+
+    def build(self):
+        """
+        Compile the graph if it has not been compiled yet.
+
+        Returns
+        -------
+        CompiledGraph
+            The shared compiled graph.
+        """
+        if self._graph is None:
+            with self._lock:
+                if self._graph is None:
+                    self._compile()
+        return self._graph
+
+    def rebuild(self):
+        """
+        Re-read the tool registry and recompile the graph.
+
+        In-flight requests keep the graph they started with; new requests
+        get the rebuilt one.
+
+        Returns
+        -------
+        CompiledGraph
+            The newly compiled graph.
+        """
+        with self._lock:
+            refresh_tool_map()
+            self._compile()
+        return self._graph
+
+    def get(self):
+        """Return the compiled graph, compiling it lazily if startup did not."""
+        return self._graph if self._graph is not None else self.build()
+
+    def clear(self):
+        """Drop the compiled graph (used on application shutdown)."""
+        with self._lock:
+            self._graph = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self._graph is not None
+
+    def _compile(self):
+        self._graph = create_graph()
+        self.version += 1
+        logger.info(f"[GRAPH REGISTRY] Compiled agent graph (version {self.version})")
+
+
+graph_registry = GraphRegistry()
@@ -0,0 +1,175 @@
+"""
+Local embedding-based router that answers most routing decisions without an LLM call.
+
+Each route has a handful of labeled example queries. At warm-up the examples are
+embedded once with the local SentenceTransformer; classifying a query is then one
+encode plus a small matrix product. When the best route is not confident enough,
+the caller falls back to the LLM router.
+
+Configuration
+-------------
+LOCAL_ROUTER_ENABLED : bool
+    Set to "false" to always use the LLM router (default "true").
+LOCAL_ROUTER_THRESHOLD : float
+    Minimum confidence required to skip the LLM router (default 0.7).
+LOCAL_ROUTER_TEMPERATURE : float
+    Softmax temperature applied to per-route similarities (default 0.02).
+"""
+
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+from backend.core.local_embeddings import encode_texts
+from backend.core.logging_config import logger
+
+load_dotenv()
+
+LOCAL_ROUTER_ENABLED = os.getenv("LOCAL_ROUTER_ENABLED", "true").lower() == "true"
+LOCAL_ROUTER_THRESHOLD = float(os.getenv("LOCAL_ROUTER_THRESHOLD", "0.7"))
+LOCAL_ROUTER_TEMPERATURE = float(os.getenv("LOCAL_ROUTER_TEMPERATURE", "0.02"))
+
+ROUTE_EXAMPLES: Dict[str, List[str]] = {
+    "get_pro_stats": [
+        "Compare Scottie Scheffler and Rory McIlroy in putting",
+        "What is Jon Rahm's driving distance?",
+        "Who is the better putter, Bryson DeChambeau or Rory McIlroy?",
+        "Show me strokes gained putting for Scottie Scheffler",
+        "How far does Bryson DeChambeau drive the ball on average?",
+        "Compare driving distance between Jon Rahm and Scottie Scheffler",
+        "What are Rory McIlroy's stats this season?",
+        "Which pro has the best driving accuracy?",
+    ],
+    "course_insights": [
+        "What is the course layout at Pine Valley?",
+        "Tell me about Pebble Beach Golf Links",
+        "What is the slope rating at Torrey Pines South?",
+        "How long is the championship course at Bethpage Black?",
+        "What is the par at Augusta National?",
+        "Give me the course rating and yardage for TPC Sawgrass",
+        "Where is Whistling Straits located?",
+        "What tees are available at Pinehurst No. 2?",
+    ],
+    "get_shot_recommendations": [
+        "What club should I use from 150 yards?",
+        "How do I avoid a slice with my driver?",
+        "What club should I hit from 145 yards if I want to avoid a slice?",
+        "I keep hooking my 7 iron, what should I do?",
+        "Which club gives me a draw from 170 yards?",
+        "How should I play a 120-yard approach shot?",
+        "Recommend a club for a 200 yard shot into the wind",
+        "How can I hit my 5 iron higher?",
+    ],
+    "search_golfpedia": [
+        "What is the history of golf?",
+        "What does a handicap mean in golf?",
+        "What is the rule for an unplayable lie?",
+        "What is an eagle in golf?",
+        "How does match play scoring work?",
+        "Who invented the golf ball?",
+        "What is the difference between a links course and a parkland course?",
+        "How do I hit a flop shot?",
+    ],
+}
+
+
+class LocalRouter:
+    """
+    Nearest-example classifier over embedded route examples.
+
+    Parameters
+    ----------
+    examples : dict of str to list of str
+        Labeled example queries per route name.
+    threshold : float
+        Minimum confidence for a local decision.
+    temperature : float
+        Softmax temperature over per-route best similarities.
+    encode : callable, optional
+        Function mapping a list of texts to normalized vectors (defaults to the
+        shared local SentenceTransformer).
+    """
+
+    def __init__(
+        self,
+        examples: Dict[str, List[str]] = ROUTE_EXAMPLES,
+        threshold: float = LOCAL_ROUTER_THRESHOLD,
+        temperature: float = LOCAL_ROUTER_TEMPERATURE,
+        encode: Optional[Callable] = None,
+    ):
+        self.examples = examples
+        self.threshold = threshold
+        self.temperature = temperature
+        self._encode = encode or encode_texts
+        self._routes = list(examples)
+        self._matrix = None
+        self._labels = None
+        self._stats_lock = threading.Lock()
+        self.stats = {"local": 0, "fallback": 0}
+
+    def warm_up(self) -> None:
+        """Embed the labeled examples so ``classify`` only encodes the query."""
+        texts, labels = [], []
+        for label_index, route in enumerate(self._routes):
+            texts.extend(self.examples[route])
+            labels.extend([label_index] * len(self.examples[route]))
+        self._matrix = np.asarray(self._encode(texts), dtype=np.float32)
+        self._labels = np.asarray(labels)
+        logger.info(
+            f"[LOCAL ROUTER] Embedded {len(texts)} examples "
+            f"for {len(self._routes)} routes"
+        )
+
+    @property
+    def is_ready(self) -> bool:
+        return self._matrix is not None
+
+    def classify(self, query: str) -> Tuple[str, float]:
+        """
+        Pick the most similar route for a query.
+
+        Parameters
+        ----------
+        query : str
+            The user query.
+
+        Returns
+        -------
+        tuple of (str, float)
+            The route name and a softmax confidence in [0, 1].
+        """
+        if not self.is_ready:
+            raise ValueError("Local router has not been warmed up.")
+        query_vector = np.asarray(self._encode([query]), dtype=np.float32)[0]
+        similarities = self._matrix @ query_vector
+
+        # Best example similarity per route, then a tempered softmax across routes
+        route_scores = np.full(len(self._routes), -1.0, dtype=np.float32)
+        np.maximum.at(route_scores, self._labels, similarities)
+        logits = (route_scores - route_scores.max()) / self.temperature
+        probabilities = np.exp(logits) / np.exp(logits).sum()
+
+        best = int(np.argmax(probabilities))
+        return self._routes[best], float(probabilities[best])
+
+    def route(self, query: str) -> Optional[str]:
+        """
+        Return a route when the local decision is confident, otherwise None.
+
+        Updates the ``local`` / ``fallback`` counters either way.
+        """
+        tool_name, confidence = self.classify(query)
+        confident = confidence >= self.threshold
+        with self._stats_lock:
+            self.stats["local" if confident else "fallback"] += 1
+        logger.debug(
+            f"[LOCAL ROUTER] '{query}' → {tool_name} (confidence {confidence:.3f}, "
+            f"{'local' if confident else 'LLM fallback'})"
+        )
+        return tool_name if confident else None
+
+
+local_router = LocalRouter()
@@ -0,0 +1,188 @@
+"""
+Speculative tool execution while the LLM router decides.
+
+When the router has to fall back to the LLM, a cheap keyword heuristic guesses the
+likely tool and, if that tool is cheap and side-effect free, starts it
+concurrently with the router call. If the router agrees, the tool result is
+already available (or nearly so) and the tool node is skipped; otherwise the
+speculative work is cancelled and counted as waste.
+
+Configuration
+-------------
+SPECULATIVE_EXECUTION_ENABLED : bool
+    Turn speculation on (default "false").
+SPECULATIVE_TOOLS : str
+    Comma-separated tools that may be started speculatively (default "get_pro_stats").
+SPECULATIVE_MAX_TOOLS : int
+    Maximum number of tools started per query (default 1).
+"""
+
+import asyncio
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from backend.core.executors import run_blocking
+from backend.core.logging_config import logger
+from backend.tools.get_pro_stats_tool import MOCK_STATS_DB
+
+load_dotenv()
+
+SPECULATIVE_EXECUTION_ENABLED = (
+    os.getenv("SPECULATIVE_EXECUTION_ENABLED", "false").lower() == "true"
+)
+SPECULATIVE_TOOLS = [
+    name.strip()
+    for name in os.getenv("SPECULATIVE_TOOLS", "get_pro_stats").split(",")
+    if name.strip()
+]
+SPECULATIVE_MAX_TOOLS = int(os.getenv("SPECULATIVE_MAX_TOOLS", "1"))
+
+PRO_STAT_KEYWORDS = (
+    "putting",
+    "distance",
+    "accuracy",
+    "driving",
+    "stats",
+    "strokes gained",
+)
+PLAYER_NAME_PARTS = {
+    part for name in MOCK_STATS_DB for part in name.lower().split() if len(part) > 2
+}
+GOLFPEDIA_PATTERN = re.compile(
+    r"^(what is|what are|what does|who (won|invented)|why|when)\b"
+    r"|\b(rule|rules|history|meaning)\b"
+)
+SHOT_PATTERN = re.compile(
+    r"\b(\d{2,3}\s*(yards?|yds?)|iron|wedge|driver|hybrid|slice|hook|fade|draw)\b"
+)
+
+
+def guess_tools(query: str) -> List[str]:
+    """
+    Rank likely tools for a query with keyword rules (no model calls).
+
+    Parameters
+    ----------
+    query : str
+        The user query.
+
+    Returns
+    -------
+    list of str
+        Tool names, most likely first.
+    """
+    text = query.lower()
+    words = set(re.findall(r"[a-z]+", text))
+    guesses = []
+    if words & PLAYER_NAME_PARTS and any(
+        keyword in text for keyword in PRO_STAT_KEYWORDS
+    ):
+        guesses.append("get_pro_stats")
+    if SHOT_PATTERN.search(text):
+        guesses.append("get_shot_recommendations")
+    if GOLFPEDIA_PATTERN.search(text):
+        guesses.append("search_golfpedia")
+    return guesses
+
+
+class SpeculationStats:
+    """Thread-safe counters for speculation hit rate and wasted work."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {
+            "started": 0,
+            "hits": 0,
+            "misses": 0,
+            "failed": 0,
+            "wasted_seconds": 0.0,
+        }
+
+    def record(self, outcome: str, wasted_seconds: float = 0.0) -> None:
+        with self._lock:
+            self.counts[outcome] += 1
+            self.counts["wasted_seconds"] += wasted_seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            resolved = self.counts["hits"] + self.counts["misses"]
+            return {
+                **self.counts,
+                "hit_rate": self.counts["hits"] / resolved if resolved else 0.0,
+            }
+
+
+speculation_stats = SpeculationStats()
+
+
+def start_speculation(
+    query: str, tool_map: dict
+) -> Dict[str, Tuple[asyncio.Task, float]]:
+    """
+    Start the likely, speculation-safe tools for a query.
+
+    Returns
+    -------
+    dict of str to (asyncio.Task, float)
+        The running tool tasks and their start times, keyed by tool name.
+    """
+    candidates = [
+        name
+        for name in guess_tools(query)
+        if name in SPECULATIVE_TOOLS and name in tool_map
+    ][:SPECULATIVE_MAX_TOOLS]
+    started = {}
+    for name in candidates:
+        task = asyncio.ensure_future(run_blocking(tool_map[name].invoke, query))
+        started[name] = (task, time.perf_counter())
+        speculation_stats.record("started")
+        logger.debug(f"[SPECULATION] Started {name} for '{query}'")
+    return started
+
+
+def cancel_speculation(started: Dict[str, Tuple[asyncio.Task, float]]) -> None:
+    """Cancel every speculative task (e.g. when the router call fails)."""
+    for task, _ in started.values():
+        task.cancel()
+
+
+async def resolve_speculation(
+    started: Dict[str, Tuple[asyncio.Task, float]], chosen: str
+) -> Optional[str]:
+    """
+    Keep the speculative result for the router's choice and cancel the rest.
+
+    Parameters
+    ----------
+    started : dict
+        Output of ``start_speculation``.
+    chosen : str
+        The tool picked by the router.
+
+    Returns
+    -------
+    str or None
+        The tool result when the chosen tool was speculated and succeeded,
+        otherwise None (the tool node then runs normally).
+    """
+    result = None
+    for name, (task, started_at) in started.items():
+        if name != chosen:
+            task.cancel()
+            # The worker thread cannot be interrupted, so count its time so far as waste
+            speculation_stats.record("misses", time.perf_counter() - started_at)
+            continue
+        try:
+            result = await task
+            speculation_stats.record("hits")
+        except Exception as e:
+            logger.warning(
+                f"[SPECULATION] Speculative {name} failed, rerunning in tool node: {e}"
+            )
+            speculation_stats.record("failed")
+    return result
@@ -1,21 +1,176 @@
+from typing import List, Optional
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from backend.agents.golf_langgraph import create_graph
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from backend.agents.golf_langgraph import (
+    arun_batch,
+    astream_agent_events,
+    AGENT_BATCH_CONCURRENCY,
+)
+from backend.agents.graph_registry import graph_registry
+from backend.core.executors import run_blocking
+from backend.core.metrics import track_request
+from backend.core.semantic_cache import (
+    semantic_cache,
+    normalize_query,
+    SEMANTIC_CACHE_ENABLED,
+)
+from backend.core.single_flight import SingleFlight
 from backend.core.logging_config import logger
+import json
+import os
 import traceback
 
 router = APIRouter()
+# Identical concurrent queries share one graph execution
+agent_flights = SingleFlight()
+
+AGENT_BATCH_MAX_CONCURRENCY = int(os.getenv("AGENT_BATCH_MAX_CONCURRENCY", "32"))
+AGENT_BATCH_MAX_QUERIES = int(os.getenv("AGENT_BATCH_MAX_QUERIES", "10000"))
 
 class QueryRequest(BaseModel):
     query: str
 
+class BatchQueryRequest(BaseModel):
+    queries: List[str] = Field(..., min_length=1)
+    concurrency: Optional[int] = Field(None, ge=1)
+
+def format_sse(event: dict) -> str:
+    """Serialize an agent event as a Server-Sent Events frame."""
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+async def lookup_cached_answer(query: str):
+    """
+    Check the semantic cache for a query.
+
+    Returns
+    -------
+    tuple of (str or None, numpy.ndarray or None)
+        The cached response (None on a miss) and the query embedding to reuse
+        when storing the fresh answer.
+    """
+    if not SEMANTIC_CACHE_ENABLED:
+        return None, None
+    try:
+        # Encoding the query is CPU work, so keep it off the event loop
+        return await run_blocking(semantic_cache.lookup, query)
+    except Exception:
+        logger.warning("Semantic cache lookup failed; running the agent", exc_info=True)
+        return None, None
+
+async def store_cached_answer(query: str, response: str, route, vector) -> None:
+    if not SEMANTIC_CACHE_ENABLED:
+        return
+    try:
+        await run_blocking(semantic_cache.put, query, response, route, vector)
+    except Exception:
+        logger.warning("Semantic cache store failed", exc_info=True)
+
+async def run_agent(query: str, vector=None) -> dict:
+    """Run the compiled graph for a query and cache the final response."""
+    graph = graph_registry.get()
+    result = await graph.ainvoke({"input": query})
+    await store_cached_answer(
+        query, result["final_response"], result.get("next"), vector
+    )
+    return result
+
+async def stream_agent(query: str, vector=None):
+    """Stream agent events for a query and cache the final response."""
+    graph = graph_registry.get()
+    async for event in astream_agent_events(graph, query):
+        if event["type"] == "done":
+            await store_cached_answer(
+                query, event["response"], event.get("route"), vector
+            )
+        yield event
+
+async def answer_query(query: str) -> str:
+    """Answer one query through the semantic cache and single-flight coalescing."""
+    cached, vector = await lookup_cached_answer(query)
+    if cached is not None:
+        return cached
+    result = await agent_flights.do(
+        normalize_query(query), lambda: run_agent(query, vector)
+    )
+    return result["final_response"]
+
 @router.post("/query")
 async def query_agent(request: QueryRequest):
     try:
-        graph = create_graph()
-        result = await graph.ainvoke({"input": request.query})
-        return {"response": result["final_response"]}
+        with track_request("query"):
+            return {"response": await answer_query(request.query)}
     except Exception as e:
         logger.error("Exception in /query endpoint:", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/query/stream")
+async def stream_query_agent(request: QueryRequest):
+    """
+    Stream the agent run as Server-Sent Events.
+
+    Emits ``progress`` events as the router and tool nodes run, ``token`` events
+    for each summary token, then a ``done`` event carrying the full response.
+    Semantic cache hits are sent as a single token followed by ``done``, and
+    identical concurrent requests share one stream.
+    """
+    async def event_stream():
+        with track_request("query_stream"):
+            try:
+                cached, vector = await lookup_cached_answer(request.query)
+                if cached is not None:
+                    yield format_sse({"type": "token", "content": cached})
+                    yield format_sse(
+                        {"type": "done", "response": cached, "cached": True}
+                    )
+                    return
+
+                events = agent_flights.stream(
+                    normalize_query(request.query),
+                    lambda: stream_agent(request.query, vector),
+                )
+                async for event in events:
+                    yield format_sse(event)
+            except Exception as e:
+                logger.error("Exception in /query/stream endpoint:", exc_info=True)
+                yield format_sse({"type": "error", "detail": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.post("/query/batch")
+async def batch_query_agent(request: BatchQueryRequest):
+    """
+    Answer a list of queries with bounded concurrency.
+
+    Streams newline-delimited JSON, one object per query as it completes:
+    ``{"index", "query", "response"}`` or ``{"index", "query", "error"}``.
+    """
+    if len(request.queries) > AGENT_BATCH_MAX_QUERIES:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Batch too large: {len(request.queries)} queries "
+                f"(max {AGENT_BATCH_MAX_QUERIES})."
+            ),
+        )
+    concurrency = min(
+        request.concurrency or AGENT_BATCH_CONCURRENCY, AGENT_BATCH_MAX_CONCURRENCY
+    )
+
+    async def result_stream():
+        with track_request("query_batch"):
+            async for result in arun_batch(
+                request.queries, concurrency=concurrency, invoke=answer_query
+            ):
+                yield json.dumps(result) + "\n"
+
+    return StreamingResponse(result_stream(), media_type="application/x-ndjson")
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Semantic answer cache hit/miss counters and size."""
+    return semantic_cache.snapshot()
@@ -0,0 +1,46 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from backend.agents.graph_registry import graph_registry
+from backend.agents.local_router import local_router
+from backend.core.local_embeddings import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_MODEL,
+    EMBEDDING_PRELOAD,
+    is_sentence_model_ready,
+)
+from backend.core.shot_index import SHOT_INDEX_BACKEND, is_local_shot_index_loaded
+
+router = APIRouter()
+
+@router.get("/health")
+async def health():
+    """
+    Readiness of the agent: the compiled graph, the shared embedding model (when
+    preloading is on) and the local shot index (when it is the configured
+    backend). Returns 503 until all of them are ready.
+    """
+    embedding_ready = is_sentence_model_ready()
+    local_index = SHOT_INDEX_BACKEND == "local"
+    ready = (
+        graph_registry.is_ready
+        and (embedding_ready or not EMBEDDING_PRELOAD)
+        and (is_local_shot_index_loaded() or not local_index)
+    )
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ok" if ready else "starting",
+            "graph": graph_registry.is_ready,
+            "embedding_model": {
+                "name": EMBEDDING_MODEL,
+                "backend": EMBEDDING_BACKEND,
+                "ready": embedding_ready,
+            },
+            "local_router": local_router.is_ready,
+            "shot_index": {
+                "backend": SHOT_INDEX_BACKEND,
+                "loaded": is_local_shot_index_loaded() if local_index else None,
+            },
+        },
+    )
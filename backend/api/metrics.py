@@ -0,0 +1,120 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from backend.agents.context_compression import context_compressor
+from backend.agents.local_router import local_router
+from backend.agents.speculation import speculation_stats
+from backend.api.agent import agent_flights
+from backend.core.embedding_cache import embedding_cache
+from backend.core.local_embeddings import embedding_batcher
+from backend.core.semantic_cache import semantic_cache
+
+router = APIRouter()
+
+class AgentStatsCollector:
+    """
+    Publishes the counters kept by the caches, router, speculation, context
+    compression and single-flight components at scrape time, so they need no
+    extra bookkeeping.
+    """
+
+    def collect(self):
+        cache = semantic_cache.snapshot()
+        lookups = CounterMetricFamily(
+            "golf_agent_semantic_cache_lookups",
+            "Semantic cache lookups by result",
+            labels=["result"],
+        )
+        lookups.add_metric(["hit"], cache["hits"])
+        lookups.add_metric(["miss"], cache["misses"])
+        yield lookups
+        removals = CounterMetricFamily(
+            "golf_agent_semantic_cache_removals",
+            "Semantic cache entries removed",
+            labels=["reason"],
+        )
+        removals.add_metric(["eviction"], cache["evictions"])
+        removals.add_metric(["expiration"], cache["expirations"])
+        yield removals
+        yield GaugeMetricFamily(
+            "golf_agent_semantic_cache_entries",
+            "Live semantic cache entries",
+            value=cache["entries"],
+        )
+        yield GaugeMetricFamily(
+            "golf_agent_semantic_cache_bytes",
+            "Approximate semantic cache size",
+            value=cache["size_bytes"],
+        )
+        yield GaugeMetricFamily(
+            "golf_agent_semantic_cache_hit_ratio",
+            "Semantic cache hit ratio",
+            value=cache["hit_rate"],
+        )
+
+        embeddings = embedding_cache.snapshot()
+        embedding_lookups = CounterMetricFamily(
+            "golf_agent_embedding_cache_lookups",
+            "Embedding cache lookups by result",
+            labels=["result"],
+        )
+        embedding_lookups.add_metric(["memory_hit"], embeddings["hits"])
+        embedding_lookups.add_metric(["disk_hit"], embeddings["disk_hits"])
+        embedding_lookups.add_metric(["miss"], embeddings["misses"])
+        yield embedding_lookups
+        batching = CounterMetricFamily(
+            "golf_agent_embedding_batcher",
+            "Micro-batched encode requests, texts and model calls",
+            labels=["kind"],
+        )
+        for kind in ("requests", "texts", "batches"):
+            batching.add_metric([kind], embedding_batcher.stats[kind])
+        yield batching
+
+        routing = CounterMetricFamily(
+            "golf_agent_router_decisions", "Router decisions by path", labels=["path"]
+        )
+        routing.add_metric(["local"], local_router.stats["local"])
+        routing.add_metric(["llm_fallback"], local_router.stats["fallback"])
+        yield routing
+
+        speculation = speculation_stats.snapshot()
+        outcomes = CounterMetricFamily(
+            "golf_agent_speculation",
+            "Speculative tool runs by outcome",
+            labels=["outcome"],
+        )
+        for outcome in ("started", "hits", "misses", "failed"):
+            outcomes.add_metric([outcome], speculation[outcome])
+        yield outcomes
+        yield CounterMetricFamily(
+            "golf_agent_speculation_wasted_seconds",
+            "Time spent on discarded speculative runs",
+            value=speculation["wasted_seconds"],
+        )
+
+        compression = CounterMetricFamily(
+            "golf_agent_context_tokens",
+            "Estimated tool-result tokens before and after compression",
+            labels=["stage"],
+        )
+        compression.add_metric(["before"], context_compressor.stats["tokens_in"])
+        compression.add_metric(["after"], context_compressor.stats["tokens_out"])
+        yield compression
+
+        coalescing = CounterMetricFamily(
+            "golf_agent_single_flight",
+            "Agent executions and coalesced duplicate requests",
+            labels=["kind"],
+        )
+        coalescing.add_metric(["execution"], agent_flights.stats["executions"])
+        coalescing.add_metric(["coalesced"], agent_flights.stats["coalesced"])
+        yield coalescing
+
+REGISTRY.register(AgentStatsCollector())
+
+@router.get("/metrics")
+async def get_metrics():
+    """Prometheus metrics for graph nodes, upstream calls, tokens and caches."""
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Form
 from fastapi.responses import StreamingResponse, JSONResponse
 from dotenv import load_dotenv
-from langchain_community.chat_models import ChatOpenAI
+from ..core.llm_clients import get_chat_llm
 from ..core.vector_store import VectorStore
 from ..prompts.prompt_manager import PromptManager
 
@@ -9,7 +9,7 @@ from ..prompts.prompt_manager import PromptManager
 load_dotenv()
 
 router = APIRouter()
-llm = ChatOpenAI(model_name="gpt-4o-mini")  # Using LangChain's ChatOpenAI
+llm = get_chat_llm("ask")  # Pooled LangChain ChatOpenAI
 vector_store = VectorStore()
 prompt_manager = PromptManager()
 
@@ -0,0 +1,344 @@
+"""
+Hermetic end-to-end benchmark for the agent graph and API.
+
+Drives ``create_graph()`` (``--mode graph``) or the FastAPI app over an
+in-process ASGI transport (``--mode api``) with every upstream replaced by the
+fakes in ``backend/benchmarks/fakes.py``. For each tool route it reports
+throughput, p50/p95/p99 latency and the mean time spent in each graph node.
+Runs offline on a CPU-only box.
+
+Usage
+-----
+    python -m backend.benchmarks.agent_benchmark --requests 200 --concurrency 16
+    python -m backend.benchmarks.agent_benchmark --mode api --json results.json
+    python -m backend.benchmarks.agent_benchmark --max-p95-ms 400   # regression gate
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+from dataclasses import fields
+from typing import Dict, List, Optional
+from unittest.mock import patch
+
+import numpy as np
+
+from backend.benchmarks.fakes import UpstreamProfile, patch_upstreams
+
+# Representative queries for each tool route (the fake router maps them back)
+ROUTE_QUERIES = {
+    "get_pro_stats": [
+        "Compare putting between Scottie Scheffler and Rory McIlroy",
+        "How does Jon Rahm's driving distance compare to Scheffler?",
+    ],
+    "course_insights": [
+        "Tell me about the course at Pine Valley",
+        "What is the slope rating of the Augusta National course?",
+    ],
+    "get_shot_recommendations": [
+        "What club should I use from 150 yards to avoid a slice?",
+        "How do I avoid hooking my 7 iron from 160 yards?",
+    ],
+    "search_golfpedia": [
+        "What is the history of golf?",
+        "Explain the rules for an unplayable lie",
+    ],
+}
+
+
+class NodeTimings:
+    """Stand-in for ``NODE_LATENCY`` that keeps every observation for the report."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def labels(self, node: str):
+        samples = self.samples[node]
+        class _Child:
+            def observe(self, value: float) -> None:
+                samples.append(value)
+        return _Child()
+
+    def reset(self) -> None:
+        self.samples.clear()
+
+
+def summarize_latencies(
+    latencies: List[float], wall_seconds: float, errors: int
+) -> dict:
+    """Throughput and latency percentiles (milliseconds) for one benchmark run."""
+    values = np.asarray(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / wall_seconds, 2)
+        if wall_seconds
+        else 0.0,
+        "p50_ms": round(float(np.percentile(values, 50)), 2),
+        "p95_ms": round(float(np.percentile(values, 95)), 2),
+        "p99_ms": round(float(np.percentile(values, 99)), 2),
+        "mean_ms": round(float(values.mean()), 2),
+    }
+
+
+async def run_load(invoke, queries: List[str], requests: int, concurrency: int):
+    """
+    Send ``requests`` queries (cycling through ``queries``) with bounded concurrency.
+
+    Returns
+    -------
+    tuple of (list of float, int, float)
+        Per-request latencies in seconds, the error count and the wall time.
+    """
+    pending = iter(range(requests))
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        for index in pending:
+            start = time.perf_counter()
+            try:
+                await invoke(queries[index % len(queries)])
+            except Exception as e:
+                errors += 1
+                print(f"[BENCHMARK] request failed: {e}", file=sys.stderr)
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    return latencies, errors, time.perf_counter() - start
+
+
+def graph_invoker(stream: bool):
+    from backend.agents.golf_langgraph import astream_agent_events, create_graph
+
+    graph = create_graph()
+
+    async def invoke(query: str):
+        if stream:
+            response = None
+            async for event in astream_agent_events(graph, query):
+                if event["type"] == "done":
+                    response = event["response"]
+            return response
+        result = await graph.ainvoke({"input": query})
+        return result["final_response"]
+    return invoke
+
+
+def api_invoker(client, stream: bool):
+    async def invoke(query: str):
+        if stream:
+            async with client.stream(
+                "POST", "/api/query/stream", json={"query": query}
+            ) as response:
+                response.raise_for_status()
+                async for _ in response.aiter_bytes():
+                    pass
+            return None
+        response = await client.post("/api/query", json={"query": query})
+        response.raise_for_status()
+        return response.json()["response"]
+    return invoke
+
+
+async def run_benchmark(
+    mode: str = "graph",
+    requests: int = 100,
+    concurrency: int = 8,
+    routes: Optional[List[str]] = None,
+    stream: bool = False,
+    with_cache: bool = False,
+    profile: Optional[UpstreamProfile] = None,
+) -> dict:
+    """
+    Benchmark each tool route in turn against the fake upstreams.
+
+    Parameters
+    ----------
+    mode : {"graph", "api"}
+        Drive the compiled graph directly or the FastAPI app in-process.
+    requests : int
+        Requests per route.
+    concurrency : int
+        Requests in flight at once.
+    routes : list of str, optional
+        Routes to benchmark (defaults to all of ``ROUTE_QUERIES``).
+    stream : bool
+        Use the streaming path (``astream_agent_events`` / ``/api/query/stream``).
+    with_cache : bool
+        Keep the semantic cache and single-flight coalescing on in API mode
+        (off by default, so every request runs the graph).
+    profile : UpstreamProfile, optional
+        Injected upstream latencies and payload sizes.
+
+    Returns
+    -------
+    dict
+        ``{"config": ..., "routes": {route: {...stats, "nodes": {node: mean_ms}}}}``
+    """
+    profile = profile or UpstreamProfile()
+    node_timings = NodeTimings()
+    report = {
+        "config": {
+            "mode": mode, "requests": requests, "concurrency": concurrency,
+            "stream": stream, "with_cache": with_cache,
+            "profile": {f.name: getattr(profile, f.name) for f in fields(profile)},
+        },
+        "routes": {},
+    }
+
+    with ExitStack() as stack:
+        stack.enter_context(patch_upstreams(profile))
+        stack.enter_context(patch("backend.core.metrics.NODE_LATENCY", node_timings))
+        client = None
+        if mode == "api":
+            import httpx
+
+            from backend.agents.graph_registry import graph_registry
+            from backend.api.agent import SingleFlight
+            from backend.main import app
+
+            if not with_cache:
+                stack.enter_context(
+                    patch("backend.api.agent.SEMANTIC_CACHE_ENABLED", False)
+                )
+                # A fresh key per request keeps single-flight from merging the repeats
+                counter = iter(range(sys.maxsize))
+                stack.enter_context(
+                    patch(
+                        "backend.api.agent.normalize_query",
+                        lambda query: f"{query}#{next(counter)}",
+                    )
+                )
+            stack.enter_context(
+                patch("backend.api.agent.agent_flights", SingleFlight())
+            )
+            # ASGITransport does not run the lifespan, so build the graph here
+            graph_registry.build()
+            stack.callback(graph_registry.clear)
+            client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://benchmark"
+            )
+            invoke = api_invoker(client, stream)
+        else:
+            invoke = graph_invoker(stream)
+
+        try:
+            for route in routes or list(ROUTE_QUERIES):
+                # Warm up once so lazy imports and first-call setup are not measured
+                await invoke(ROUTE_QUERIES[route][0])
+                node_timings.reset()
+                latencies, errors, wall = await run_load(
+                    invoke, ROUTE_QUERIES[route], requests, concurrency
+                )
+                stats = summarize_latencies(latencies, wall, errors)
+                stats["nodes"] = {
+                    node: round(float(np.mean(samples)) * 1000, 2)
+                    for node, samples in node_timings.samples.items()
+                }
+                report["routes"][route] = stats
+        finally:
+            if client is not None:
+                await client.aclose()
+    return report
+
+
+def format_report(report: dict) -> str:
+    config = report["config"]
+    lines = [
+        f"mode={config['mode']} requests/route={config['requests']} "
+        f"concurrency={config['concurrency']} "
+        f"stream={config['stream']} cache={config['with_cache']}",
+        f"{'route':<26}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        f"{'errors':>8}  per-node mean ms",
+    ]
+    for route, stats in report["routes"].items():
+        nodes = ", ".join(f"{node}={ms}" for node, ms in stats["nodes"].items())
+        lines.append(
+            f"{route:<26}{stats['throughput_rps']:>9}{stats['p50_ms']:>10}{stats['p95_ms']:>10}"
+            f"{stats['p99_ms']:>10}{stats['errors']:>8}  {nodes}"
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Hermetic end-to-end benchmark for the golf agent"
+    )
+    parser.add_argument("--mode", choices=["graph", "api"], default="graph")
+    parser.add_argument("--requests", type=int, default=100, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--routes", nargs="+", choices=list(ROUTE_QUERIES), help="routes to benchmark"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="use the streaming endpoint / event stream",
+    )
+    parser.add_argument(
+        "--with-cache",
+        action="store_true",
+        help="keep the semantic cache and coalescing on (api mode)",
+    )
+    parser.add_argument(
+        "--json", dest="json_path", help="also write the report as JSON to this path"
+    )
+    parser.add_argument(
+        "--max-p95-ms", type=float, help="exit non-zero if any route's p95 exceeds this"
+    )
+    defaults = UpstreamProfile()
+    for field in fields(UpstreamProfile):
+        parser.add_argument(
+            f"--{field.name.replace('_', '-')}",
+            type=type(getattr(defaults, field.name)),
+            default=getattr(defaults, field.name),
+            help=f"fake upstream {field.name} (default %(default)s)",
+        )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    profile = UpstreamProfile(
+        **{f.name: getattr(args, f.name) for f in fields(UpstreamProfile)}
+    )
+    report = asyncio.run(
+        run_benchmark(
+            mode=args.mode,
+            requests=args.requests,
+            concurrency=args.concurrency,
+            routes=args.routes,
+            stream=args.stream,
+            with_cache=args.with_cache,
+            profile=profile,
+        )
+    )
+    print(format_report(report))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.max_p95_ms is not None:
+        slow = {
+            route: s["p95_ms"]
+            for route, s in report["routes"].items()
+            if s["p95_ms"] > args.max_p95_ms
+        }
+        if slow:
+            print(
+                f"p95 regression (limit {args.max_p95_ms} ms): {slow}", file=sys.stderr
+            )
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+Latency and memory benchmark for the local embedding backends.
+
+Runs each backend ("torch", the int8 "onnx" export and optionally the fp32
+"onnx-fp32" export) in its own subprocess, so the reported RSS covers only
+that backend's imports and weights, and reports:
+
+- load time and peak RSS after loading and encoding
+- single-query encode latency (p50/p95), the shot tool's hot path
+- batch throughput in texts per second
+- cosine similarity of each backend's embeddings to the torch embeddings
+
+Usage
+-----
+    python -m backend.core.onnx_embeddings export        # once, writes the ONNX model
+    python -m backend.benchmarks.embedding_benchmark --queries 200
+    python -m backend.benchmarks.embedding_benchmark --backends torch onnx onnx-fp32 \
+        --json embeddings.json
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+
+# Kept free of the agent imports so the measured RSS is the embedding backend's alone
+from backend.core.onnx_embeddings import PARITY_TEXTS
+
+BACKENDS = ["torch", "onnx", "onnx-fp32"]
+BATCH_SIZE = 32
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def load_backend(backend: str, model_name: str):
+    if backend == "torch":
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(model_name, device="cpu")
+    from backend.core.onnx_embeddings import OnnxSentenceEncoder, onnx_model_dir
+    return OnnxSentenceEncoder(onnx_model_dir(model_name), quantized=backend == "onnx")
+
+
+def run_worker(backend: str, model_name: str, queries: int) -> dict:
+    """Measure one backend in the current process (called in a fresh subprocess)."""
+    start = time.perf_counter()
+    model = load_backend(backend, model_name)
+    load_seconds = time.perf_counter() - start
+    rss_after_load = peak_rss_mb()
+
+    texts = PARITY_TEXTS
+    model.encode(texts[:1], normalize_embeddings=True)  # warm up
+
+    latencies = []
+    for i in range(queries):
+        t0 = time.perf_counter()
+        model.encode([texts[i % len(texts)]], normalize_embeddings=True)
+        latencies.append(time.perf_counter() - t0)
+    latencies_ms = np.asarray(latencies) * 1000
+
+    batch = (texts * (BATCH_SIZE // len(texts) + 1))[:BATCH_SIZE]
+    start = time.perf_counter()
+    rounds = max(1, queries // BATCH_SIZE)
+    for _ in range(rounds):
+        model.encode(batch, normalize_embeddings=True)
+    batch_seconds = time.perf_counter() - start
+
+    parity = np.asarray(
+        model.encode(PARITY_TEXTS, normalize_embeddings=True), dtype=np.float32
+    )
+    return {
+        "backend": backend,
+        "load_s": round(load_seconds, 2),
+        "rss_after_load_mb": rss_after_load,
+        "peak_rss_mb": peak_rss_mb(),
+        "single_p50_ms": round(float(np.percentile(latencies_ms, 50)), 2),
+        "single_p95_ms": round(float(np.percentile(latencies_ms, 95)), 2),
+        "batch_texts_per_s": round(rounds * BATCH_SIZE / batch_seconds, 1),
+        "parity_embeddings": parity.tolist(),
+    }
+
+
+def run_benchmark(
+    backends: List[str], model_name: str, queries: int
+) -> Dict[str, dict]:
+    """Run every backend in its own subprocess and compare embeddings to torch's."""
+    results = {}
+    for backend in backends:
+        completed = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "backend.benchmarks.embedding_benchmark",
+                "--worker",
+                backend,
+                "--model",
+                model_name,
+                "--queries",
+                str(queries),
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        results[backend] = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    embeddings = {
+        backend: np.asarray(r.pop("parity_embeddings"), dtype=np.float32)
+        for backend, r in results.items()
+    }
+    if "torch" in embeddings:
+        for backend, result in results.items():
+            similarities = np.sum(embeddings["torch"] * embeddings[backend], axis=1)
+            result["min_cosine_vs_torch"] = round(float(similarities.min()), 5)
+    return results
+
+
+def format_report(results: Dict[str, dict], model_name: str) -> str:
+    lines = [
+        f"model={model_name}",
+        f"{'backend':<12}{'load s':>8}{'rss MiB':>10}{'peak MiB':>10}"
+        f"{'p50 ms':>9}{'p95 ms':>9}"
+        f"{'batch/s':>10}{'cos vs torch':>14}",
+    ]
+    for backend, r in results.items():
+        lines.append(
+            f"{backend:<12}{r['load_s']:>8}{r['rss_after_load_mb']:>10}{r['peak_rss_mb']:>10}"
+            f"{r['single_p50_ms']:>9}{r['single_p95_ms']:>9}{r['batch_texts_per_s']:>10}"
+            f"{r.get('min_cosine_vs_torch', '-'):>14}"
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    from backend.core.local_embeddings import EMBEDDING_MODEL
+
+    parser = argparse.ArgumentParser(
+        description="Compare torch and ONNX embedding backends"
+    )
+    parser.add_argument(
+        "--backends", nargs="+", choices=BACKENDS, default=["torch", "onnx"]
+    )
+    parser.add_argument(
+        "--model", default=EMBEDDING_MODEL, help="SentenceTransformer model name"
+    )
+    parser.add_argument(
+        "--queries", type=int, default=200, help="single-query encodes per backend"
+    )
+    parser.add_argument(
+        "--json", dest="json_path", help="also write the report as JSON to this path"
+    )
+    parser.add_argument("--worker", choices=BACKENDS, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.model, args.queries)))
+        return 0
+    results = run_benchmark(args.backends, args.model, args.queries)
+    print(format_report(results, args.model))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"model": args.model, "backends": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+"""
+Local stand-ins for the agent's upstream services, used by the benchmarks.
+
+Each fake has configurable injected latency and payload size so the agent's own
+overhead can be measured offline (no OpenAI, Tavily, GolfCourseAPI, Qdrant or
+model downloads). ``patch_upstreams`` installs all of them at once.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Iterator, List, Optional
+from unittest.mock import patch
+
+import numpy as np
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from backend.agents.speculation import guess_tools
+from backend.core.shot_bm25 import ShotLexicalIndex
+
+
+@dataclass
+class UpstreamProfile:
+    """
+    Injected latencies (seconds) and payload sizes for the fake upstreams.
+
+    Attributes
+    ----------
+    llm_latency : float
+        Time to first token for every chat completion.
+    llm_token_delay : float
+        Delay between streamed summary tokens.
+    summary_tokens : int
+        Number of tokens in each summary response.
+    tavily_latency, golfcourse_latency, qdrant_latency, encode_latency : float
+        Per-call latency of each upstream.
+    search_results : int
+        Number of Tavily results returned (each ``result_chars`` long).
+    result_chars : int
+        Size of each search result / shot payload text.
+    embedding_dim : int
+        Dimension of the fake embeddings.
+    """
+    llm_latency: float = 0.05
+    llm_token_delay: float = 0.002
+    summary_tokens: int = 60
+    tavily_latency: float = 0.03
+    golfcourse_latency: float = 0.02
+    qdrant_latency: float = 0.01
+    encode_latency: float = 0.005
+    search_results: int = 5
+    result_chars: int = 400
+    embedding_dim: int = 384
+
+
+SHOT_INTENT = {"distance": 150, "intent": "avoid", "shape": "slice", "club": "7 iron"}
+
+
+def route_for(query: str) -> str:
+    """Deterministic routing decision used by the fake router LLM."""
+    if "course" in query.lower():
+        return "course_insights"
+    guesses = guess_tools(query)
+    return guesses[0] if guesses else "search_golfpedia"
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model answering router prompts with a route, others with filler tokens."""
+
+    profile: UpstreamProfile = UpstreamProfile()
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-benchmark-chat"
+
+    def _respond(self, messages) -> str:
+        prompt = messages[-1].content
+        if "Classify this golf-related query" in prompt:
+            match = re.search(r'Query: "(.*)"', prompt, re.S)
+            route = route_for(match.group(1) if match else prompt)
+            args = SHOT_INTENT if route == "get_shot_recommendations" else {}
+            return json.dumps({"tool": route, "args": args})
+        return " ".join(["birdie"] * self.profile.summary_tokens)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self.profile.llm_latency)
+        return ChatResult(
+            generations=[
+                ChatGeneration(message=AIMessage(content=self._respond(messages)))
+            ]
+        )
+
+    async def _agenerate(
+        self, messages, stop=None, run_manager=None, **kwargs
+    ) -> ChatResult:
+        await asyncio.sleep(self.profile.llm_latency)
+        return ChatResult(
+            generations=[
+                ChatGeneration(message=AIMessage(content=self._respond(messages)))
+            ]
+        )
+
+    async def _astream(
+        self, messages, stop=None, run_manager=None, **kwargs
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self.profile.llm_latency)
+        for index, token in enumerate(self._respond(messages).split(" ")):
+            if index:
+                await asyncio.sleep(self.profile.llm_token_delay)
+            # BaseChatModel forwards each chunk to the callbacks (astream_events)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token + " "))
+
+
+class FakeTavilyClient:
+    def __init__(self, profile: UpstreamProfile):
+        self.profile = profile
+
+    def search(self, query: str, **kwargs) -> dict:
+        time.sleep(self.profile.tavily_latency)
+        return {
+            "results": [
+                {
+                    "title": f"Golf article {i}",
+                    "content": ("The golfer should commit to the shot. " * 20)[
+                        : self.profile.result_chars
+                    ],
+                    "url": f"https://example.com/golf/{i}",
+                }
+                for i in range(self.profile.search_results)
+            ]
+        }
+
+
+class FakeResponse:
+    def __init__(self, payload: dict):
+        self._payload = payload
+
+    def json(self) -> dict:
+        return self._payload
+
+    def raise_for_status(self) -> None:
+        return None
+
+
+def fake_golfcourse_get(profile: UpstreamProfile):
+    def get(url: str, headers=None, params=None, **kwargs) -> FakeResponse:
+        time.sleep(profile.golfcourse_latency)
+        if url.endswith("/search"):
+            return FakeResponse(
+                {
+                    "courses": [
+                        {
+                            "id": 1,
+                            "course_name": "Championship",
+                            "club_name": "Pine Valley",
+                        }
+                    ]
+                }
+            )
+        return FakeResponse(
+            {
+                "course": {
+                    "location": {"address": "1 Golf Lane"},
+                    "tees": {
+                        "male": [
+                            {
+                                "course_rating": 74.1,
+                                "slope_rating": 155,
+                                "total_yards": 7280,
+                                "par_total": 72,
+                            }
+                        ]
+                    },
+                }
+            }
+        )
+    return get
+
+
+def fake_embedding(text: str, dim: int) -> np.ndarray:
+    """Deterministic unit vector derived from a hash of the text."""
+    seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:4], "little")
+    vector = np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+class FakeSentenceModel:
+    def __init__(self, profile: UpstreamProfile):
+        self.profile = profile
+
+    def encode(self, texts, normalize_embeddings: bool = False, **kwargs):
+        time.sleep(self.profile.encode_latency)
+        if isinstance(texts, str):
+            return fake_embedding(texts, self.profile.embedding_dim)
+        return np.stack(
+            [fake_embedding(text, self.profile.embedding_dim) for text in texts]
+        )
+
+
+def fake_shot_payload(i: int, profile: UpstreamProfile) -> dict:
+    text = (
+        f"Shot {i}: "
+        + "On 2024-05-01, the golfer hit a shot 150 yards using a 7 Iron. " * 10
+    )
+    return {"text": text[: profile.result_chars]}
+
+
+class FakeQdrantClient:
+    def __init__(self, profile: UpstreamProfile):
+        self.profile = profile
+
+    def _result(self, limit: int):
+        points = [
+            SimpleNamespace(
+                score=0.9 - i * 0.01, payload=fake_shot_payload(i, self.profile)
+            )
+            for i in range(limit)
+        ]
+        return SimpleNamespace(points=points)
+
+    def query_points(self, collection_name: str, query, limit: int = 5, **kwargs):
+        time.sleep(self.profile.qdrant_latency)
+        return self._result(limit)
+
+
+class FakeAsyncQdrantClient(FakeQdrantClient):
+    async def query_points(self, collection_name: str, query, limit: int = 5, **kwargs):
+        await asyncio.sleep(self.profile.qdrant_latency)
+        return self._result(limit)
+
+
+class FakeOpenAIClient:
+    """OpenAI SDK stand-in for the shot-intent extraction call."""
+
+    def __init__(self, profile: UpstreamProfile):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self.profile = profile
+
+    def _create(self, **kwargs):
+        time.sleep(self.profile.llm_latency)
+        content = json.dumps(SHOT_INTENT)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=80, completion_tokens=20),
+        )
+
+
+@contextmanager
+def patch_upstreams(
+    profile: Optional[UpstreamProfile] = None,
+) -> Iterator[UpstreamProfile]:
+    """
+    Replace every external dependency of the agent with an in-process fake.
+
+    Parameters
+    ----------
+    profile : UpstreamProfile, optional
+        Latency and payload settings (defaults to ``UpstreamProfile()``).
+    """
+    profile = profile or UpstreamProfile()
+    chat_model = FakeChatModel(profile=profile)
+    sentence_model = FakeSentenceModel(profile)
+    lexical_index = ShotLexicalIndex([fake_shot_payload(i, profile) for i in range(50)])
+
+    def encode_texts(texts: List[str]) -> np.ndarray:
+        return np.asarray(sentence_model.encode(list(texts)), dtype=np.float32)
+
+    targets: List[Any] = [
+        ("backend.agents.golf_langgraph.get_llm", lambda node="summarize": chat_model),
+        (
+            "backend.tools.search_golfpedia_tool.get_tavily_client",
+            lambda: FakeTavilyClient(profile),
+        ),
+        (
+            "backend.tools.course_insights_tool.requests.get",
+            fake_golfcourse_get(profile),
+        ),
+        (
+            "backend.tools.golf_shot_recommendations_tool.get_openai_client",
+            lambda: FakeOpenAIClient(profile),
+        ),
+        (
+            "backend.tools.golf_shot_recommendations_tool.get_qdrant_client",
+            lambda: FakeQdrantClient(profile),
+        ),
+        (
+            "backend.tools.golf_shot_recommendations_tool.get_async_qdrant_client",
+            lambda: FakeAsyncQdrantClient(profile),
+        ),
+        (
+            "backend.tools.golf_shot_recommendations_tool.get_shot_lexical_index",
+            lambda: lexical_index,
+        ),
+        ("backend.core.local_embeddings.get_sentence_model", lambda: sentence_model),
+    ]
+    with ExitStack() as stack:
+        for target, replacement in targets:
+            stack.enter_context(patch(target, replacement))
+        from backend.core.semantic_cache import semantic_cache
+        stack.enter_context(patch.object(semantic_cache, "_encode", encode_texts))
+        yield profile
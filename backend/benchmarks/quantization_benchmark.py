@@ -0,0 +1,192 @@
+"""
+Memory, latency and recall of quantized shot search.
+
+Embeds the golden shot questions (``data/raw/golden_shot_dataset.json``, the
+RAGAS evaluation set of notebook 03) and searches the local shot index with each
+quantization mode and oversampling factor. Recall@k is measured against
+exact float32 search. With ``--qdrant`` the same queries also go to the Qdrant
+collection, comparing quantized search (using the collection's quantization)
+against ``exact=True`` search.
+
+Usage
+-----
+    python -m backend.core.shot_index                      # build the local index first
+    python -m backend.benchmarks.quantization_benchmark --limit 5 --oversampling 1 2 4
+    python -m backend.benchmarks.quantization_benchmark --synthetic 1000 --qdrant \
+        --json quantization.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+from qdrant_client import models
+
+from backend.core.local_embeddings import encode_texts, query_text
+from backend.core.shot_index import (
+    SHOT_INDEX_PATH,
+    LocalShotIndex,
+    qdrant_search_params,
+)
+
+GOLDEN_DATASET = "data/raw/golden_shot_dataset.json"
+
+
+def load_queries(
+    path: str, synthetic: int, index: LocalShotIndex, seed: int = 0
+) -> np.ndarray:
+    """Golden question embeddings plus ``synthetic`` noisy copies of shot vectors."""
+    with open(path) as f:
+        questions = [entry["query"] for entry in json.load(f)]
+    queries = [encode_texts([query_text(q) for q in questions])] if questions else []
+    if synthetic:
+        rng = np.random.default_rng(seed)
+        vectors = index.load()._vectors
+        picked = np.asarray(
+            vectors[rng.choice(len(vectors), size=synthetic)], dtype=np.float32
+        )
+        queries.append(
+            picked + rng.normal(scale=0.05, size=picked.shape).astype(np.float32)
+        )
+    return np.concatenate(queries)
+
+
+def measure(search, queries: np.ndarray, truth: List[List[str]], limit: int) -> dict:
+    """Latency percentiles and recall@limit of ``search(query) -> ids``."""
+    latencies, recalls = [], []
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        ids = search(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+        recalls.append(len(set(ids) & set(expected)) / max(len(expected), 1))
+    return {
+        "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+        f"recall@{limit}": round(float(np.mean(recalls)), 4),
+    }
+
+
+def local_benchmark(
+    path: str, queries: np.ndarray, limit: int, oversampling: List[float]
+) -> Dict[str, dict]:
+    exact = LocalShotIndex(path, quantization="none").load()
+    truth = [[hit.payload["text"] for hit in exact.search(q, limit)] for q in queries]
+    results = {
+        "none": {
+            "memory_mb": round(exact.memory_bytes() / 2**20, 3),
+            **measure(
+                lambda q: [h.payload["text"] for h in exact.search(q, limit)],
+                queries,
+                truth,
+                limit,
+            ),
+        }
+    }
+    for mode in ("scalar", "binary"):
+        for factor in oversampling:
+            index = LocalShotIndex(
+                path, quantization=mode, oversampling=factor, rescore=True
+            ).load()
+            results[f"{mode} x{factor:g}"] = {
+                "memory_mb": round(index.memory_bytes() / 2**20, 3),
+                **measure(
+                    lambda q, index=index: [
+                        h.payload["text"] for h in index.search(q, limit)
+                    ],
+                    queries,
+                    truth,
+                    limit,
+                ),
+            }
+    return results
+
+
+def qdrant_benchmark(
+    queries: np.ndarray, limit: int, oversampling: List[float]
+) -> Dict[str, dict]:
+    from backend.core.qdrant import SHOT_COLLECTION_NAME, get_qdrant_client
+
+    client = get_qdrant_client()
+
+    def search(params):
+        def run(query):
+            points = client.query_points(
+                collection_name=SHOT_COLLECTION_NAME,
+                query=query.tolist(),
+                limit=limit,
+                search_params=params,
+            ).points
+            return [str(point.id) for point in points]
+        return run
+
+    exact = search(models.SearchParams(exact=True))
+    truth = [exact(q) for q in queries]
+    results = {"exact": measure(exact, queries, truth, limit)}
+    # The collection's own quantization is used; "scalar" only selects rescoring params
+    for factor in oversampling:
+        results[f"quantized x{factor:g}"] = measure(
+            search(qdrant_search_params("scalar", oversampling=factor, rescore=True)),
+            queries,
+            truth,
+            limit,
+        )
+    return results
+
+
+def format_report(results: Dict[str, dict]) -> str:
+    lines = []
+    for backend, rows in results.items():
+        lines.append(f"[{backend}]")
+        for name, row in rows.items():
+            lines.append(
+                f"  {name:<14}"
+                + "  ".join(f"{key}={value}" for key, value in row.items())
+            )
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Quantized shot search: memory, latency and recall"
+    )
+    parser.add_argument(
+        "--index", default=SHOT_INDEX_PATH, help="local shot index directory"
+    )
+    parser.add_argument(
+        "--golden", default=GOLDEN_DATASET, help="golden shot dataset JSON"
+    )
+    parser.add_argument(
+        "--synthetic", type=int, default=0, help="extra queries near stored shots"
+    )
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument(
+        "--oversampling", type=float, nargs="+", default=[1.0, 2.0, 3.0, 4.0]
+    )
+    parser.add_argument(
+        "--qdrant", action="store_true", help="also benchmark the Qdrant collection"
+    )
+    parser.add_argument(
+        "--json", dest="json_path", help="also write the report as JSON to this path"
+    )
+    args = parser.parse_args(argv)
+
+    queries = load_queries(
+        args.golden, args.synthetic, LocalShotIndex(args.index, quantization="none")
+    )
+    results = {
+        "local": local_benchmark(args.index, queries, args.limit, args.oversampling)
+    }
+    if args.qdrant:
+        results["qdrant"] = qdrant_benchmark(queries, args.limit, args.oversampling)
+    print(format_report(results))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,8 +7,11 @@ Includes:
 """
 
 import os
-import openai
-from langchain_openai import ChatOpenAI
+from backend.core.llm_clients import (
+    get_async_openai_client,
+    get_chat_llm,
+    get_openai_client,
+)
 
 class ChatModel:
     """
@@ -19,42 +22,34 @@ class ChatModel:
 
     def __init__(self, model_name: str = None):
         self.model_name = model_name or os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
-        self.api_key = os.getenv("OPENAI_API_KEY")
 
     def run(self, prompt: str) -> str:
         """
         Synchronously run a prompt against the chat model.
         """
-        openai.api_key = self.api_key
-        response = openai.ChatCompletion.create(
+        response = get_openai_client().chat.completions.create(
             model=self.model_name,
             messages=[{"role": "user", "content": prompt}],
             temperature=0
         )
-        return response.choices[0].message["content"]
+        return response.choices[0].message.content
 
     async def astream(self, prompt: str):
         """
         Asynchronously stream response chunks for a given prompt.
         """
-        openai.api_key = self.api_key
-        response = await openai.ChatCompletion.acreate(
+        response = await get_async_openai_client().chat.completions.create(
             model=self.model_name,
             messages=[{"role": "user", "content": prompt}],
             temperature=0,
             stream=True
         )
-        for chunk in response:
-            if chunk.choices[0].delta.get("content"):
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
                 yield chunk.choices[0].delta.content
 
 def get_chat_model():
     """
     Returns a LangChain-compatible chat model for use with tools or agents.
     """
-    return ChatOpenAI(
-        model=os.getenv("OPENAI_MODEL", "gpt-3.5-turbo"),
-        temperature=0,
-        streaming=True,
-        api_key=os.getenv("OPENAI_API_KEY")
-    )
+    return get_chat_llm("chat", streaming=True)
@@ -0,0 +1,152 @@
+"""
+Micro-batching of concurrent embedding requests.
+
+Each shot query embeds a single sentence, and the shared model serializes
+encodes, so under concurrency the requests queue up and each pays for a
+one-row forward pass. ``EmbeddingBatcher`` collects the texts of concurrent
+callers for a short window (or until a batch is full), runs one batched encode
+on a dedicated thread and hands every caller its own rows back. The window
+bounds the latency a request can add by waiting for company.
+
+Configuration
+-------------
+EMBEDDING_BATCHING_ENABLED : bool
+    Route cache-miss encodes through the batcher (default "true").
+EMBEDDING_BATCH_MAX_SIZE : int
+    Maximum texts per batched encode (default 32).
+EMBEDDING_BATCH_WINDOW_MS : float
+    How long the first request of a batch waits for others (default 5).
+"""
+
+import asyncio
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Sequence
+
+import numpy as np
+from dotenv import load_dotenv
+
+from backend.core.logging_config import logger
+
+load_dotenv()
+
+EMBEDDING_BATCHING_ENABLED = (
+    os.getenv("EMBEDDING_BATCHING_ENABLED", "true").lower() == "true"
+)
+EMBEDDING_BATCH_MAX_SIZE = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "32"))
+EMBEDDING_BATCH_WINDOW_MS = float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "5"))
+
+_STOP = object()
+
+
+class EmbeddingBatcher:
+    """
+    Merge concurrent encode requests into batched calls to ``encode``.
+
+    Parameters
+    ----------
+    encode : callable
+        ``encode(texts) -> array`` returning one unnormalized float32 row per
+        text; rows are normalized per request afterwards.
+    max_batch_size : int
+        Texts per batch; a full batch is encoded without waiting for the window.
+    window_ms : float
+        Maximum time the oldest queued request waits before its batch runs.
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[List[str]], np.ndarray],
+        max_batch_size: int = EMBEDDING_BATCH_MAX_SIZE,
+        window_ms: float = EMBEDDING_BATCH_WINDOW_MS,
+    ):
+        self._encode = encode
+        self.max_batch_size = max_batch_size
+        self.window = window_ms / 1000
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "texts": 0, "batches": 0}
+
+    def submit(self, texts: Sequence[str], normalize: bool = True) -> Future:
+        """Queue ``texts`` for the next batch; resolves to their embeddings."""
+        future = Future()
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="embedding-batcher", daemon=True
+                )
+                self._thread.start()
+        self._queue.put((list(texts), normalize, future))
+        return future
+
+    def encode(self, texts: Sequence[str], normalize: bool = True) -> np.ndarray:
+        """Blocking encode through the batcher (for worker threads)."""
+        return self.submit(texts, normalize).result()
+
+    async def aencode(self, texts: Sequence[str], normalize: bool = True) -> np.ndarray:
+        """Encode through the batcher without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(texts, normalize))
+
+    def close(self) -> None:
+        """Stop the batching thread after it flushes the queued requests."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch, size, stop = [first], len(first[0]), False
+            deadline = time.monotonic() + self.window
+            while size < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    # Past the window, still take whatever is already queued
+                    item = (
+                        self._queue.get(timeout=remaining)
+                        if remaining > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+                size += len(item[0])
+            self._flush(batch)
+            if stop:
+                return
+
+    def _flush(self, batch) -> None:
+        # Callers that gave up (e.g. a cancelled request) are dropped from the batch
+        batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        texts = [text for item in batch for text in item[0]]
+        try:
+            vectors = np.asarray(self._encode(texts), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Batched encode of {len(texts)} texts failed: {e}")
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+        self.stats["requests"] += len(batch)
+        self.stats["texts"] += len(texts)
+        self.stats["batches"] += 1
+        start = 0
+        for request_texts, normalize, future in batch:
+            rows = vectors[start:start + len(request_texts)]
+            start += len(request_texts)
+            if normalize:
+                norms = np.linalg.norm(rows, axis=1, keepdims=True)
+                rows = rows / np.where(norms == 0, 1, norms)
+            future.set_result(rows)
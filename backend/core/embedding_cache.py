@@ -0,0 +1,140 @@
+"""
+Cache of local text embeddings.
+
+Embeddings are keyed by (model name, normalization flag, whitespace-normalized
+text). A bounded in-memory LRU tier serves repeat queries without touching the
+model; an optional SQLite tier keeps embeddings across restarts. Used by
+``backend.core.local_embeddings.encode_texts``, so every local-embedding caller
+(shot search, local router, semantic cache, context compression) benefits.
+
+Configuration
+-------------
+EMBEDDING_CACHE_ENABLED : bool
+    Set to "false" to always run the model (default "true").
+EMBEDDING_CACHE_MAX_ENTRIES : int
+    Size of the in-memory LRU tier (default 10000).
+EMBEDDING_CACHE_PATH : str
+    SQLite file for the on-disk tier; empty (default) keeps the cache in memory only.
+"""
+
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+from backend.core.logging_config import logger
+
+load_dotenv()
+
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "10000"))
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "")
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace; case is kept because it can change the embedding."""
+    return " ".join(text.split())
+
+
+class EmbeddingCache:
+    """
+    Two-tier (memory LRU, optional SQLite) embedding cache.
+
+    Parameters
+    ----------
+    max_entries : int
+        Maximum number of vectors kept in memory.
+    path : str, optional
+        SQLite file for the persistent tier; None or "" disables it.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES,
+        path: Optional[str] = EMBEDDING_CACHE_PATH,
+    ):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, bool, str], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, normalized INTEGER NOT NULL, "
+                "text TEXT NOT NULL, vector BLOB NOT NULL, "
+                "PRIMARY KEY (model, normalized, text))"
+            )
+            self._db.commit()
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+
+    def get(
+        self, model: str, text: str, normalized: bool = True
+    ) -> Optional[np.ndarray]:
+        """Return the cached embedding of ``text`` under ``model``, or None."""
+        key = (model, normalized, normalize_text(text))
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return vector
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT vector FROM embeddings "
+                    "WHERE model = ? AND normalized = ? AND text = ?",
+                    (model, int(normalized), key[2]),
+                ).fetchone()
+                if row is not None:
+                    vector = np.frombuffer(row[0], dtype=np.float32)
+                    self._remember(key, vector)
+                    self.stats["disk_hits"] += 1
+                    return vector
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, model: str, text: str, vector, normalized: bool = True) -> None:
+        """Store an embedding in memory and, when enabled, on disk."""
+        key = (model, normalized, normalize_text(text))
+        vector = np.array(vector, dtype=np.float32)
+        vector.flags.writeable = False
+        with self._lock:
+            self._remember(key, vector)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO embeddings "
+                        "(model, normalized, text, vector) VALUES (?, ?, ?, ?)",
+                        (model, int(normalized), key[2], vector.tobytes()),
+                    )
+                    self._db.commit()
+                except sqlite3.Error:
+                    logger.warning(
+                        "Could not persist embedding to the disk cache", exc_info=True
+                    )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM embeddings")
+                self._db.commit()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {**self.stats, "entries": len(self._entries)}
+
+    def _remember(self, key, vector: np.ndarray) -> None:
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+embedding_cache = EmbeddingCache()
@@ -0,0 +1,83 @@
+"""
+Bounded thread pool for running blocking tool code off the event loop.
+
+Tools such as course_insights, search_golfpedia and get_shot_recommendations use
+synchronous clients (requests, Tavily, Qdrant, SentenceTransformer). Running them
+through ``run_blocking`` keeps the uvicorn event loop free to serve other
+conversations while a tool waits on I/O.
+
+Configuration
+-------------
+TOOL_EXECUTOR_MAX_WORKERS : int
+    Maximum number of tool calls executing at once per process (default 16).
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TOOL_EXECUTOR_MAX_WORKERS = int(os.getenv("TOOL_EXECUTOR_MAX_WORKERS", "16"))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_tool_executor() -> ThreadPoolExecutor:
+    """
+    Return the shared tool executor, creating it on first use.
+
+    Returns
+    -------
+    ThreadPoolExecutor
+        A pool bounded by ``TOOL_EXECUTOR_MAX_WORKERS``.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=TOOL_EXECUTOR_MAX_WORKERS,
+                    thread_name_prefix="golf-tool",
+                )
+    return _executor
+
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Run a blocking callable in the tool executor and await its result.
+
+    The caller's context variables (logging, tracing callbacks) are copied into
+    the worker thread.
+
+    Parameters
+    ----------
+    func : callable
+        The synchronous function to run.
+    *args, **kwargs
+        Arguments forwarded to ``func``.
+
+    Returns
+    -------
+    Any
+        Whatever ``func`` returns.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_tool_executor(), call)
+
+
+def shutdown_tool_executor(wait: bool = True) -> None:
+    """Shut the shared executor down (used on application shutdown)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
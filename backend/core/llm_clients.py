@@ -0,0 +1,172 @@
+"""
+Central factory for pooled LLM clients.
+
+Every LLM caller (graph nodes, tools, the RAG endpoint, the LangChain agent)
+gets its client here. All clients share one sync and one async HTTP connection
+pool, so requests reuse keep-alive connections instead of paying a new TCP/TLS
+handshake per call. Model, temperature and timeout are configured per node.
+
+Configuration
+-------------
+LLM_<NODE>_MODEL, LLM_<NODE>_TEMPERATURE, LLM_<NODE>_TIMEOUT
+    Per-node overrides, e.g. ``LLM_ROUTER_MODEL=gpt-4o-mini``.
+LLM_TIMEOUT : float
+    Default request timeout in seconds (default 60).
+LLM_MAX_CONNECTIONS / LLM_MAX_KEEPALIVE_CONNECTIONS : int
+    Connection pool limits shared by all clients (default 100 / 20).
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+
+import httpx
+from dotenv import load_dotenv
+from langchain_openai import ChatOpenAI
+from openai import AsyncOpenAI, OpenAI
+
+from backend.core.metrics import LLMMetricsCallback
+
+load_dotenv()
+
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+
+# Default model settings per calling node
+NODE_DEFAULTS = {
+    "router": {"model": "gpt-4", "temperature": 0.3},
+    "summarize": {"model": "gpt-4", "temperature": 0.3},
+    "shot_intent": {"model": "gpt-4", "temperature": 0.0},
+    "ask": {"model": "gpt-4o-mini", "temperature": 0.7},
+    "agent": {"model": "gpt-4o-mini", "temperature": 0.7},
+    "chat": {"model": os.getenv("OPENAI_MODEL", "gpt-3.5-turbo"), "temperature": 0.0},
+}
+
+
+@dataclass(frozen=True)
+class LLMSettings:
+    model: str
+    temperature: float
+    timeout: float
+
+
+def get_node_settings(node: str) -> LLMSettings:
+    """
+    Resolve the model settings for a calling node, applying env overrides.
+
+    Parameters
+    ----------
+    node : str
+        Node name, e.g. "router", "summarize" or "shot_intent".
+
+    Returns
+    -------
+    LLMSettings
+        The model, temperature and timeout to use.
+    """
+    defaults = NODE_DEFAULTS.get(node, NODE_DEFAULTS["chat"])
+    prefix = f"LLM_{node.upper()}_"
+    return LLMSettings(
+        model=os.getenv(prefix + "MODEL", defaults["model"]),
+        temperature=float(os.getenv(prefix + "TEMPERATURE", defaults["temperature"])),
+        timeout=float(os.getenv(prefix + "TIMEOUT", LLM_TIMEOUT)),
+    )
+
+
+def _pool_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_http_client() -> httpx.Client:
+    """Shared synchronous keep-alive connection pool."""
+    return httpx.Client(limits=_pool_limits(), timeout=LLM_TIMEOUT)
+
+
+@lru_cache(maxsize=None)
+def get_async_http_client() -> httpx.AsyncClient:
+    """Shared asynchronous keep-alive connection pool."""
+    return httpx.AsyncClient(limits=_pool_limits(), timeout=LLM_TIMEOUT)
+
+
+@lru_cache(maxsize=None)
+def get_openai_client() -> OpenAI:
+    """Shared OpenAI SDK client over the pooled sync connections."""
+    return OpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        http_client=get_http_client(),
+        timeout=LLM_TIMEOUT,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_async_openai_client() -> AsyncOpenAI:
+    """Shared async OpenAI SDK client over the pooled async connections."""
+    return AsyncOpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        http_client=get_async_http_client(),
+        timeout=LLM_TIMEOUT,
+    )
+
+
+_chat_models = {}
+_chat_models_lock = threading.Lock()
+
+
+def get_chat_llm(node: str, streaming: bool = False) -> ChatOpenAI:
+    """
+    Return the LangChain chat model for a node, built once and reused.
+
+    Parameters
+    ----------
+    node : str
+        The calling node (selects model, temperature and timeout).
+    streaming : bool, optional
+        Whether the model streams by default (astream works either way).
+
+    Returns
+    -------
+    ChatOpenAI
+        A chat model sharing the process-wide connection pools.
+    """
+    settings = get_node_settings(node)
+    key = (node, settings, streaming)
+    model = _chat_models.get(key)
+    if model is None:
+        with _chat_models_lock:
+            model = _chat_models.get(key)
+            if model is None:
+                model = ChatOpenAI(
+                    model=settings.model,
+                    temperature=settings.temperature,
+                    timeout=settings.timeout,
+                    streaming=streaming,
+                    stream_usage=True,
+                    callbacks=[LLMMetricsCallback(node, settings.model)],
+                    api_key=os.getenv("OPENAI_API_KEY"),
+                    http_client=get_http_client(),
+                    http_async_client=get_async_http_client(),
+                )
+                _chat_models[key] = model
+    return model
+
+
+async def aclose_llm_clients() -> None:
+    """Close the shared connection pools (used on application shutdown)."""
+    if get_async_http_client.cache_info().currsize:
+        await get_async_http_client().aclose()
+    if get_http_client.cache_info().currsize:
+        get_http_client().close()
+    for factory in (
+        get_http_client,
+        get_async_http_client,
+        get_openai_client,
+        get_async_openai_client,
+    ):
+        factory.cache_clear()
+    _chat_models.clear()
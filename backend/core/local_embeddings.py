@@ -0,0 +1,167 @@
+"""
+Shared in-process SentenceTransformer model for local embedding work.
+
+Used by every component that embeds text locally: the shot recommendation
+tool, the local router, the semantic cache and context compression. The model
+is the configured ``EMBEDDING_MODEL``, loaded once per process and warmed up at
+application startup (see the FastAPI lifespan in ``backend/main.py``) so the
+first request does not pay for loading weights.
+
+Cache misses from concurrent callers are merged into batched encodes by
+``embedding_batcher`` (see ``backend/core/embedding_batcher.py``).
+
+With ``EMBEDDING_BACKEND=onnx`` the same model runs as an int8-quantized ONNX
+export (see ``backend/core/onnx_embeddings.py``) instead of fp32 PyTorch.
+
+Configuration
+-------------
+EMBEDDING_MODEL : str
+    SentenceTransformer model name or path (default "thenlper/gte-small").
+EMBEDDING_PRELOAD : bool
+    Load and warm up the model at startup (default "true").
+EMBEDDING_BACKEND : str
+    "torch" (default) runs the SentenceTransformer; "onnx" runs the quantized
+    ONNX export.
+"""
+
+import os
+import threading
+
+import numpy as np
+from dotenv import load_dotenv
+
+from backend.core.embedding_batcher import EMBEDDING_BATCHING_ENABLED, EmbeddingBatcher
+from backend.core.embedding_cache import EMBEDDING_CACHE_ENABLED, embedding_cache
+from backend.core.logging_config import logger
+from backend.core.metrics import observe_upstream
+from backend.core.onnx_embeddings import OnnxSentenceEncoder, onnx_model_dir
+
+load_dotenv()
+
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "thenlper/gte-small")
+EMBEDDING_PRELOAD = os.getenv("EMBEDDING_PRELOAD", "true").lower() == "true"
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch").lower()
+# Quantized vectors differ slightly from fp32 ones, so they are cached under
+# their own key
+EMBEDDING_CACHE_KEY = (
+    EMBEDDING_MODEL if EMBEDDING_BACKEND == "torch" else f"{EMBEDDING_MODEL}@onnx-int8"
+)
+
+WARM_UP_TEXT = "What club should I hit from 150 yards?"
+
+
+def document_text(text: str, model_name: str = EMBEDDING_MODEL) -> str:
+    """The text to embed for a stored document; e5 expects a "passage: " prefix."""
+    return f"passage: {text}" if "e5" in model_name.lower() else text
+
+
+def query_text(text: str, model_name: str = EMBEDDING_MODEL) -> str:
+    """The text to embed for a search query ("query: " for e5 models)."""
+    return f"query: {text}" if "e5" in model_name.lower() else text
+
+_model = None
+_model_lock = threading.Lock()
+# Fast tokenizers raise "Already borrowed" when one instance is used from several
+# threads at once, so encode calls on the shared model are serialized
+_encode_lock = threading.Lock()
+_ready = threading.Event()
+
+
+def get_sentence_model():
+    """
+    Return the process-wide embedding model, loading it on first use.
+
+    Returns
+    -------
+    SentenceTransformer or OnnxSentenceEncoder
+        The loaded ``EMBEDDING_MODEL`` for the configured ``EMBEDDING_BACKEND``.
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                with observe_upstream("sentence_transformer", "load"):
+                    if EMBEDDING_BACKEND == "onnx":
+                        _model = OnnxSentenceEncoder(onnx_model_dir(EMBEDDING_MODEL))
+                    else:
+    # Imported here so modules that only route or cache do not pay for torch
+                        from sentence_transformers import SentenceTransformer
+                        _model = SentenceTransformer(EMBEDDING_MODEL)
+    return _model
+
+
+def encode_texts(texts, normalize: bool = True, use_cache: bool = True):
+    """
+    Embed a list of texts with the shared model.
+
+    Parameters
+    ----------
+    texts : list of str
+        The texts to embed.
+    normalize : bool, optional
+        L2-normalize the vectors so dot products are cosine similarities (default True).
+    use_cache : bool, optional
+        Serve repeat texts from the embedding cache and only encode the rest
+        (default True).
+
+    Returns
+    -------
+    numpy.ndarray
+        float32 array of shape ``(len(texts), dim)``.
+    """
+    texts = list(texts)
+    cache = embedding_cache if use_cache and EMBEDDING_CACHE_ENABLED else None
+    vectors = [
+        cache.get(EMBEDDING_CACHE_KEY, text, normalize) if cache else None
+        for text in texts
+    ]
+    missing = [i for i, vector in enumerate(vectors) if vector is None]
+    if not missing and texts:
+        return np.stack(vectors)
+
+    missing_texts = [texts[i] for i in missing]
+    if (
+        EMBEDDING_BATCHING_ENABLED
+        and 0 < len(missing_texts) < embedding_batcher.max_batch_size
+    ):
+        encoded = embedding_batcher.encode(missing_texts, normalize)
+    else:
+        encoded = encode_with_model(missing_texts, normalize)
+    encoded = np.asarray(encoded, dtype=np.float32)
+    if not texts:
+        return encoded
+    for i, vector in zip(missing, encoded):
+        vectors[i] = vector
+        if cache:
+            cache.put(EMBEDDING_CACHE_KEY, texts[i], vector, normalize)
+    return np.stack(vectors)
+
+
+def encode_with_model(texts, normalize: bool = False):
+    """One encode call on the shared model (no cache, no batching)."""
+    model = get_sentence_model()
+    with _encode_lock, observe_upstream("sentence_transformer", "encode"):
+        encoded = model.encode(texts, normalize_embeddings=normalize)
+    _ready.set()
+    return encoded
+
+
+        # Requests are encoded unnormalized and normalized per caller, so one
+        # batch can serve both kinds
+embedding_batcher = EmbeddingBatcher(lambda texts: encode_with_model(texts))
+
+
+def warm_up_sentence_model() -> None:
+    """
+    Load the model and run one encode so lazy initialization (weights, tokenizer,
+    first-call kernel setup) happens before the first request.
+    """
+    encode_texts([WARM_UP_TEXT], use_cache=False)
+    logger.info(
+        f"Embedding model {EMBEDDING_MODEL} ({EMBEDDING_BACKEND}) loaded and warmed up"
+    )
+
+
+def is_sentence_model_ready() -> bool:
+    """True once the model has been loaded and has encoded successfully."""
+    return _ready.is_set()
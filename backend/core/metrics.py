@@ -0,0 +1,168 @@
+"""
+Prometheus metrics for the golf agent.
+
+Defines the shared metric objects plus small helpers to time graph nodes and
+upstream calls. Metrics are exposed on ``GET /api/metrics`` (see
+``backend/api/metrics.py``), which also publishes cache, router and
+speculation counters.
+"""
+
+import functools
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from prometheus_client import Counter, Gauge, Histogram
+
+# Buckets from 5 ms (local work) up to 60 s (slow GPT-4 calls)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+NODE_LATENCY = Histogram(
+    "golf_agent_node_latency_seconds",
+    "Latency of each agent graph node",
+    ["node"],
+    buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_LATENCY = Histogram(
+    "golf_agent_upstream_latency_seconds",
+    "Latency of calls to upstream services and local models",
+    ["service", "operation"],
+    buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_ERRORS = Counter(
+    "golf_agent_upstream_errors_total",
+    "Failed calls to upstream services and local models",
+    ["service", "operation"],
+)
+LLM_TOKENS = Counter(
+    "golf_agent_llm_tokens_total",
+    "LLM tokens used per calling node",
+    ["node", "model", "kind"],
+)
+REQUEST_LATENCY = Histogram(
+    "golf_agent_request_latency_seconds",
+    "End-to-end latency of agent API requests",
+    ["endpoint"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "golf_agent_requests_in_flight",
+    "Agent API requests currently being processed",
+    ["endpoint"],
+)
+
+
+@contextmanager
+def observe_upstream(service: str, operation: str):
+    """
+    Time a call to an upstream service (OpenAI, Tavily, GolfCourseAPI, Qdrant)
+    or a local model, counting it as an error if it raises.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        UPSTREAM_ERRORS.labels(service, operation).inc()
+        raise
+    finally:
+        UPSTREAM_LATENCY.labels(service, operation).observe(time.perf_counter() - start)
+
+
+@contextmanager
+def track_request(endpoint: str):
+    """Count an agent API request as in flight and time it."""
+    gauge = REQUESTS_IN_FLIGHT.labels(endpoint)
+    gauge.inc()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        gauge.dec()
+        REQUEST_LATENCY.labels(endpoint).observe(time.perf_counter() - start)
+
+
+def record_token_usage(
+    node: str,
+    model: str,
+    prompt_tokens: Optional[int],
+    completion_tokens: Optional[int],
+) -> None:
+    if prompt_tokens:
+        LLM_TOKENS.labels(node, model, "prompt").inc(prompt_tokens)
+    if completion_tokens:
+        LLM_TOKENS.labels(node, model, "completion").inc(completion_tokens)
+
+
+def timed_node(name: str, func):
+    """
+    Wrap an async graph node so every run is recorded in ``NODE_LATENCY``.
+
+    The wrapper keeps the wrapped signature, so LangGraph still passes ``config``
+    to nodes that accept it.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            NODE_LATENCY.labels(name).observe(time.perf_counter() - start)
+    return wrapper
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """
+    LangChain callback recording OpenAI latency and token usage for one node.
+
+    Attached to every chat model built by ``backend.core.llm_clients``.
+    """
+
+    def __init__(self, node: str, model: str):
+        self.node = node
+        self.model = model
+        self._started: Dict[UUID, float] = {}
+
+    def on_chat_model_start(
+        self, serialized, messages, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any) -> None:
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            UPSTREAM_LATENCY.labels("openai", self.node).observe(
+                time.perf_counter() - started
+            )
+
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt_tokens = usage.get("prompt_tokens")
+        completion_tokens = usage.get("completion_tokens")
+        if not usage:
+            # Streaming responses report usage on the message instead of llm_output
+            for generations in response.generations:
+                for generation in generations:
+                    metadata = (
+                        getattr(
+                            getattr(generation, "message", None), "usage_metadata", None
+                        )
+                        or {}
+                    )
+                    prompt_tokens = (prompt_tokens or 0) + metadata.get(
+                        "input_tokens", 0
+                    )
+                    completion_tokens = (completion_tokens or 0) + metadata.get(
+                        "output_tokens", 0
+                    )
+        record_token_usage(self.node, self.model, prompt_tokens, completion_tokens)
+
+    def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        started = self._started.pop(run_id, None)
+        UPSTREAM_ERRORS.labels("openai", self.node).inc()
+        if started is not None:
+            UPSTREAM_LATENCY.labels("openai", self.node).observe(
+                time.perf_counter() - started
+            )
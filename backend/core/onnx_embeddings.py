@@ -0,0 +1,282 @@
+"""
+Int8-quantized ONNX Runtime encoder for the configured ``EMBEDDING_MODEL``.
+
+An alternative to running the SentenceTransformer in fp32 PyTorch on CPU-only
+hosts: the transformer is exported to ONNX once, its weights are dynamically
+quantized to int8, and queries are encoded with ONNX Runtime and the Rust
+``tokenizers`` library, so serving never imports torch. Pooling (mean or CLS)
+and the maximum sequence length are read from the SentenceTransformer at export
+time, so gte-small, bge-base and e5 models all embed the same way they do
+under PyTorch.
+
+Export (needs the ``onnx`` extra and torch, i.e. a build machine), then verify::
+
+    python -m backend.core.onnx_embeddings export
+    python -m backend.core.onnx_embeddings parity
+
+Configuration
+-------------
+ONNX_MODEL_DIR : str
+    Exported model directory (default "data/processed/onnx/<EMBEDDING_MODEL>").
+ONNX_NUM_THREADS : int
+    ONNX Runtime intra-op threads; 0 (default) lets the runtime decide.
+ONNX_PARITY_THRESHOLD : float
+    Minimum cosine similarity to the torch embeddings for the parity check
+    (default 0.99).
+"""
+
+import argparse
+import json
+import os
+from typing import List, Optional, Sequence
+
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", "")
+ONNX_NUM_THREADS = int(os.getenv("ONNX_NUM_THREADS", "0"))
+ONNX_PARITY_THRESHOLD = float(os.getenv("ONNX_PARITY_THRESHOLD", "0.99"))
+
+MODEL_FILE = "model.onnx"
+QUANTIZED_MODEL_FILE = "model_quantized.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+META_FILE = "onnx_meta.json"
+
+# Representative shot-tool queries for the parity check
+PARITY_TEXTS = [
+    "What club should I hit from 150 yards?",
+    "How do I avoid a slice with my driver?",
+    "Hit a draw with a 7 iron from 160 yards",
+    "On 2024-05-01, the golfer hit a shot 152 yards with a carry of 140 yards "
+    "using a 7 Iron (7i). "
+    "The shot was classified as Slice.",
+    "What's my average carry with a pitching wedge?",
+]
+
+
+def onnx_model_dir(model_name: str) -> str:
+    """``ONNX_MODEL_DIR``, or a per-model directory under data/processed/onnx."""
+    return ONNX_MODEL_DIR or os.path.join(
+        "data", "processed", "onnx", model_name.replace("/", "__")
+    )
+
+
+def pool_embeddings(
+    hidden_states: np.ndarray, attention_mask: np.ndarray, mode: str = "mean"
+) -> np.ndarray:
+    """
+    Pool token embeddings into sentence embeddings the way SentenceTransformers does.
+
+    Parameters
+    ----------
+    hidden_states : numpy.ndarray
+        ``(batch, tokens, dim)`` last hidden state.
+    attention_mask : numpy.ndarray
+        ``(batch, tokens)`` mask of real (non-padding) tokens.
+    mode : str
+        "mean" (average of real tokens) or "cls" (first token).
+    """
+    if mode == "cls":
+        return hidden_states[:, 0]
+    if mode != "mean":
+        raise ValueError(f"Unsupported pooling mode: {mode}")
+    mask = attention_mask[..., None].astype(hidden_states.dtype)
+    return (hidden_states * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+
+class OnnxSentenceEncoder:
+    """
+    Drop-in replacement for ``SentenceTransformer.encode`` backed by ONNX Runtime.
+
+    Parameters
+    ----------
+    model_dir : str
+        Directory written by ``export_onnx_model``.
+    quantized : bool, optional
+        Load the int8 model (default) rather than the fp32 export.
+    num_threads : int, optional
+        ONNX Runtime intra-op threads; 0 lets the runtime decide.
+    """
+
+    def __init__(
+        self,
+        model_dir: str,
+        quantized: bool = True,
+        num_threads: int = ONNX_NUM_THREADS,
+    ):
+        # Imported here so the torch backend does not need the onnx extra installed
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        with open(os.path.join(model_dir, META_FILE)) as f:
+            self.meta = json.load(f)
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = (
+            onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        )
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        model_file = QUANTIZED_MODEL_FILE if quantized else MODEL_FILE
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(model_dir, model_file),
+            options,
+            providers=["CPUExecutionProvider"],
+        )
+        self.input_names = {
+            model_input.name for model_input in self.session.get_inputs()
+        }
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=self.meta["max_seq_length"])
+        self.tokenizer.enable_padding(pad_id=self.meta.get("pad_token_id", 0))
+
+    def encode(
+        self,
+        sentences: Sequence[str],
+        normalize_embeddings: bool = False,
+        batch_size: int = 32,
+    ) -> np.ndarray:
+        """
+        Embed sentences; same signature and output as ``SentenceTransformer.encode``.
+
+        Returns
+        -------
+        numpy.ndarray
+            float32 array of shape ``(len(sentences), dim)``.
+        """
+        batches = []
+        for start in range(0, len(sentences), batch_size):
+            encodings = self.tokenizer.encode_batch(
+                list(sentences[start : start + batch_size])
+            )
+            inputs = {
+                "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+                "attention_mask": np.array(
+                    [e.attention_mask for e in encodings], dtype=np.int64
+                ),
+            }
+            if "token_type_ids" in self.input_names:
+                inputs["token_type_ids"] = np.array(
+                    [e.type_ids for e in encodings], dtype=np.int64
+                )
+            hidden_states = self.session.run(None, inputs)[0]
+            batches.append(
+                pool_embeddings(
+                    hidden_states, inputs["attention_mask"], self.meta["pooling"]
+                )
+            )
+        if not batches:
+            return np.zeros((0, self.meta["dim"]), dtype=np.float32)
+        embeddings = np.concatenate(batches).astype(np.float32)
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.where(norms == 0, 1, norms)
+        return embeddings
+
+
+def export_onnx_model(model_name: str, out_dir: str, quantize: bool = True) -> str:
+    """
+    Export a SentenceTransformer's transformer to ONNX and quantize it to int8.
+
+    Parameters
+    ----------
+    model_name : str
+        SentenceTransformer model name or path.
+    out_dir : str
+        Directory to write ``model.onnx``, ``model_quantized.onnx``, the
+        tokenizer and metadata.
+    quantize : bool, optional
+        Also write the dynamically quantized int8 model (default True).
+
+    Returns
+    -------
+    str
+        ``out_dir``.
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from optimum.onnxruntime import ORTModelForFeatureExtraction
+    from sentence_transformers import SentenceTransformer
+
+    sentence_model = SentenceTransformer(model_name, device="cpu")
+    pooling = sentence_model[1].get_pooling_mode_str()
+    if pooling not in ("mean", "cls"):
+        raise ValueError(
+            f"{model_name} uses {pooling} pooling, "
+            "which the ONNX encoder does not support"
+        )
+    transformer = sentence_model[0]
+
+    os.makedirs(out_dir, exist_ok=True)
+    ORTModelForFeatureExtraction.from_pretrained(
+        model_name, export=True
+    ).save_pretrained(out_dir)
+    transformer.tokenizer.save_pretrained(out_dir)
+    if quantize:
+        quantize_dynamic(
+            os.path.join(out_dir, MODEL_FILE),
+            os.path.join(out_dir, QUANTIZED_MODEL_FILE),
+            weight_type=QuantType.QInt8,
+        )
+    with open(os.path.join(out_dir, META_FILE), "w") as f:
+        json.dump({
+            "model": model_name,
+            "pooling": pooling,
+            "dim": sentence_model.get_sentence_embedding_dimension(),
+            "max_seq_length": sentence_model.max_seq_length,
+            "pad_token_id": transformer.tokenizer.pad_token_id or 0,
+            "quantized": quantize,
+        }, f)
+    return out_dir
+
+
+def parity_check(
+    model_name: str,
+    encoder: OnnxSentenceEncoder,
+    texts: Optional[List[str]] = None,
+    threshold: float = ONNX_PARITY_THRESHOLD,
+) -> dict:
+    """
+    Compare ONNX embeddings with the PyTorch SentenceTransformer's.
+
+    Returns the minimum and mean cosine similarity per text and whether the
+    minimum reaches ``threshold``.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    texts = texts or PARITY_TEXTS
+    reference = SentenceTransformer(model_name, device="cpu").encode(
+        texts, normalize_embeddings=True
+    )
+    candidate = encoder.encode(texts, normalize_embeddings=True)
+    similarities = np.sum(np.asarray(reference, dtype=np.float32) * candidate, axis=1)
+    return {
+        "min_cosine": round(float(similarities.min()), 5),
+        "mean_cosine": round(float(similarities.mean()), 5),
+        "threshold": threshold,
+        "passed": bool(similarities.min() >= threshold),
+    }
+
+
+if __name__ == "__main__":
+    from backend.core.local_embeddings import EMBEDDING_MODEL
+
+    parser = argparse.ArgumentParser(
+        description="Export and verify the ONNX embedding model"
+    )
+    parser.add_argument("command", choices=["export", "parity"])
+    parser.add_argument(
+        "--model", default=EMBEDDING_MODEL, help="SentenceTransformer model name"
+    )
+    parser.add_argument("--out", default=None, help="exported model directory")
+    parser.add_argument("--no-quantize", action="store_true", help="export fp32 only")
+    args = parser.parse_args()
+    args.out = args.out or onnx_model_dir(args.model)
+    if args.command == "export":
+        export_onnx_model(args.model, args.out, quantize=not args.no_quantize)
+        print(f"Exported {args.model} to {args.out}")
+    encoder = OnnxSentenceEncoder(args.out, quantized=not args.no_quantize)
+    report = parity_check(args.model, encoder)
+    print(json.dumps(report, indent=2))
+    if not report["passed"]:
+        raise SystemExit(1)
@@ -0,0 +1,100 @@
+"""
+Shared Qdrant clients for shot retrieval.
+
+Creating a ``QdrantClient`` opens a new connection pool (and TLS session) to
+the cluster, so one sync and one async client are created lazily and reused
+for every query in the process.
+
+Configuration
+-------------
+QDRANT_URL : str
+    Cluster URL (defaults to the project's cloud cluster).
+QDRANT_API_KEY : str
+    API key; required for https URLs.
+QDRANT_TIMEOUT : int
+    Request timeout in seconds (default 10).
+QDRANT_PREFER_GRPC : bool
+    Use the gRPC transport instead of REST (default "false").
+QDRANT_GRPC_PORT : int
+    gRPC port when ``QDRANT_PREFER_GRPC`` is on (default 6334).
+QDRANT_COLLECTION_NAME : str
+    Shot collection searched by the shot tool and written by ingestion
+    (default "golf_shot_vectors").
+"""
+
+import os
+from functools import lru_cache
+
+from dotenv import load_dotenv
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
+
+load_dotenv()
+
+QDRANT_URL = os.getenv(
+    "QDRANT_URL",
+    "https://6f592f43-f667-4234-ad3a-4f15ed5882ef.us-west-2-0.aws.cloud.qdrant.io:6333",
+)
+QDRANT_TIMEOUT = int(os.getenv("QDRANT_TIMEOUT", "10"))
+QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true"
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+SHOT_COLLECTION_NAME = os.getenv("QDRANT_COLLECTION_NAME", "golf_shot_vectors")
+
+# Payload fields the shot search filters on (see ShotFilter in shot_index.py)
+SHOT_PAYLOAD_INDEXES = {
+    "club": models.PayloadSchemaType.KEYWORD,
+    "shape": models.PayloadSchemaType.KEYWORD,
+    "shape_family": models.PayloadSchemaType.KEYWORD,
+    "total_distance": models.PayloadSchemaType.FLOAT,
+    "carry_distance": models.PayloadSchemaType.FLOAT,
+}
+
+
+def _client_settings() -> dict:
+    qdrant_api_key = os.getenv("QDRANT_API_KEY")
+    if not qdrant_api_key and not QDRANT_URL.startswith("http://"):
+        raise ValueError("QDRANT_API_KEY environment variable is not set")
+    return {
+        "url": QDRANT_URL,
+        "api_key": qdrant_api_key,
+        "timeout": QDRANT_TIMEOUT,
+        "prefer_grpc": QDRANT_PREFER_GRPC,
+        "grpc_port": QDRANT_GRPC_PORT,
+    }
+
+
+@lru_cache(maxsize=None)
+def get_qdrant_client() -> QdrantClient:
+    """Shared synchronous Qdrant client (REST or gRPC per ``QDRANT_PREFER_GRPC``)."""
+    return QdrantClient(**_client_settings())
+
+
+@lru_cache(maxsize=None)
+def get_async_qdrant_client() -> AsyncQdrantClient:
+    """Shared asynchronous Qdrant client for code running on the event loop."""
+    return AsyncQdrantClient(**_client_settings())
+
+
+def ensure_shot_payload_indexes(
+    collection_name: str, client: QdrantClient = None
+) -> None:
+    """
+    Create the payload indexes used by filtered shot searches.
+
+    Without them Qdrant has to scan every payload to apply a filter. Creating
+    an index that already exists is a no-op.
+    """
+    client = client or get_qdrant_client()
+    for field_name, schema in SHOT_PAYLOAD_INDEXES.items():
+        client.create_payload_index(
+            collection_name=collection_name, field_name=field_name, field_schema=schema
+        )
+
+
+async def aclose_qdrant_clients() -> None:
+    """Close the shared clients (used on application shutdown)."""
+    if get_async_qdrant_client.cache_info().currsize:
+        await get_async_qdrant_client().close()
+    if get_qdrant_client.cache_info().currsize:
+        get_qdrant_client().close()
+    get_qdrant_client.cache_clear()
+    get_async_qdrant_client.cache_clear()
@@ -0,0 +1,326 @@
+"""
+Semantic answer cache for the golf agent.
+
+Answers are keyed by the L2-normalized embedding of the user query. A lookup
+first tries an exact match on the normalized query text, then a cosine
+similarity search over all live entries; anything above the similarity
+threshold of the entry's route is a hit. Pro stats and shot answers depend on
+the exact player or distance in the query, which near-identical phrasings can
+differ on, so by default they only hit on an exact match. Entries expire with
+a per-route TTL (course data and pro stats change rarely, web search results
+go stale quickly) and are evicted in LRU order once the cache exceeds its
+memory budget.
+
+Vectors live in a preallocated matrix with one slot per entry. Writes fill a
+free slot (the matrix doubles when full), so they cost O(1) amortized instead
+of restacking every entry.
+
+Configuration
+-------------
+SEMANTIC_CACHE_ENABLED : bool
+    Set to "false" to bypass the cache (default "true").
+SEMANTIC_CACHE_THRESHOLD : float
+    Minimum cosine similarity for a semantic hit (default 0.92).
+SEMANTIC_CACHE_THRESHOLDS : JSON object
+    Per-route threshold overrides, e.g. '{"course_insights": 0.95}'. A threshold
+    of null allows only exact matches for that route.
+SEMANTIC_CACHE_MAX_BYTES : int
+    Approximate memory budget for cached entries (default 64 MiB).
+SEMANTIC_CACHE_TTLS : JSON object
+    Per-route TTL overrides in seconds, e.g. '{"search_golfpedia": 300}'.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from dotenv import load_dotenv
+
+from backend.core.local_embeddings import encode_texts
+from backend.core.logging_config import logger
+
+load_dotenv()
+
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+SEMANTIC_CACHE_MAX_BYTES = int(
+    os.getenv("SEMANTIC_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+)
+
+DEFAULT_TTL_SECONDS = 3600
+ROUTE_TTL_SECONDS = {
+    "get_pro_stats": 24 * 3600,
+    "course_insights": 7 * 24 * 3600,
+    "get_shot_recommendations": 6 * 3600,
+    "search_golfpedia": 15 * 60,
+    **json.loads(os.getenv("SEMANTIC_CACHE_TTLS", "{}")),
+}
+
+# Answers that hinge on a name or number in the query only match exactly
+ROUTE_THRESHOLDS = {
+    "get_pro_stats": None,
+    "get_shot_recommendations": None,
+    "course_insights": 0.97,
+    **json.loads(os.getenv("SEMANTIC_CACHE_THRESHOLDS", "{}")),
+}
+
+# Rough per-entry bookkeeping cost on top of the vector and strings
+ENTRY_OVERHEAD_BYTES = 256
+INITIAL_CAPACITY = 64
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace so trivially different queries share a key."""
+    return " ".join(query.lower().split())
+
+
+@dataclass
+class CacheEntry:
+    query: str
+    vector: np.ndarray
+    response: str
+    route: Optional[str]
+    expires_at: float
+    size_bytes: int
+    slot: int = -1
+
+
+class SemanticCache:
+    """
+    Embedding-keyed LRU cache of final agent responses.
+
+    Parameters
+    ----------
+    threshold : float
+        Minimum cosine similarity for a semantic hit.
+    route_thresholds : dict of str to float or None, optional
+        Threshold per route name; None allows only exact matches for that route.
+    max_bytes : int
+        Approximate memory budget; least recently used entries are evicted above it.
+    route_ttls : dict of str to float, optional
+        TTL in seconds per route name; unknown routes use ``default_ttl``.
+    default_ttl : float
+        TTL for routes without an explicit entry.
+    encode : callable, optional
+        Function mapping a list of texts to normalized vectors.
+    clock : callable, optional
+        Monotonic time source (injectable for tests).
+    """
+
+    def __init__(
+        self,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        route_thresholds: Optional[Dict[str, Optional[float]]] = None,
+        max_bytes: int = SEMANTIC_CACHE_MAX_BYTES,
+        route_ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = DEFAULT_TTL_SECONDS,
+        encode: Optional[Callable] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.threshold = threshold
+        self.route_thresholds = (
+            ROUTE_THRESHOLDS if route_thresholds is None else route_thresholds
+        )
+        self.max_bytes = max_bytes
+        self.route_ttls = ROUTE_TTL_SECONDS if route_ttls is None else route_ttls
+        self.default_ttl = default_ttl
+        self._encode = encode or encode_texts
+        self._clock = clock
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._size_bytes = 0
+        # One row per slot; free slots have an infinite threshold so they never match
+        self._vectors: Optional[np.ndarray] = None
+        self._thresholds = np.zeros(0, dtype=np.float32)
+        self._slot_keys: List[Optional[str]] = []
+        self._free_slots: List[int] = []
+        self.stats = {
+            "hits": 0,
+            "exact_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+
+    def embed(self, query: str) -> np.ndarray:
+        """Embed a query with the cache's encoder."""
+        return np.asarray(self._encode([normalize_query(query)]), dtype=np.float32)[0]
+
+    def get(self, query: str, vector: Optional[np.ndarray] = None) -> Optional[str]:
+        """
+        Look up a cached response for a query.
+
+        Parameters
+        ----------
+        query : str
+            The user query.
+        vector : numpy.ndarray, optional
+            The query embedding; computed with ``embed`` when a semantic search
+            is needed.
+
+        Returns
+        -------
+        str or None
+            The cached response, or None on a miss.
+        """
+        return self.lookup(query, vector)[0]
+
+    def lookup(self, query: str, vector: Optional[np.ndarray] = None):
+        """
+        Like ``get``, but also return the query embedding.
+
+        A miss can then be stored with ``put(..., vector=vector)`` without encoding
+        the query twice. The embedding is None when an exact match short-circuits.
+
+        Returns
+        -------
+        tuple of (str or None, numpy.ndarray or None)
+        """
+        key = normalize_query(query)
+        with self._lock:
+            entry = self._live_entry(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                self.stats["exact_hits"] += 1
+                return entry.response, vector
+            if not self._entries:
+                self.stats["misses"] += 1
+                return None, vector
+
+        if vector is None:
+            vector = self.embed(query)
+
+        with self._lock:
+            if self._vectors is not None:
+                slots = len(self._slot_keys)
+                similarities = self._vectors[:slots] @ vector
+                candidates = np.flatnonzero(similarities >= self._thresholds[:slots])
+                for index in candidates[np.argsort(-similarities[candidates])]:
+                    key = self._slot_keys[index]
+                    entry = self._live_entry(key)
+                    if entry is not None:
+                        self._entries.move_to_end(key)
+                        self.stats["hits"] += 1
+                        logger.debug(
+                            f"[SEMANTIC CACHE] '{query}' matched '{entry.query}' "
+                            f"(similarity {similarities[index]:.3f})"
+                        )
+                        return entry.response, vector
+            self.stats["misses"] += 1
+            return None, vector
+
+    def put(
+        self,
+        query: str,
+        response: str,
+        route: Optional[str] = None,
+        vector: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Store a response under the query's embedding.
+
+        Parameters
+        ----------
+        query : str
+            The user query.
+        response : str
+            The final agent response.
+        route : str, optional
+            The tool route that produced the response (selects the TTL).
+        vector : numpy.ndarray, optional
+            The query embedding, if already computed.
+        """
+        if not response:
+            return
+        if vector is None:
+            vector = self.embed(query)
+        key = normalize_query(query)
+        ttl = self.route_ttls.get(route, self.default_ttl)
+        size = (
+            vector.nbytes
+            + len(key.encode())
+            + len(response.encode())
+            + ENTRY_OVERHEAD_BYTES
+        )
+        entry = CacheEntry(key, vector, response, route, self._clock() + ttl, size)
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size_bytes -= previous.size_bytes
+                self._release_slot(previous)
+            self._entries[key] = entry
+            self._size_bytes += size
+            self._assign_slot(entry)
+            while self._size_bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._size_bytes -= evicted.size_bytes
+                self._release_slot(evicted)
+                self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+            self._vectors = None
+            self._thresholds = np.zeros(0, dtype=np.float32)
+            self._slot_keys = []
+            self._free_slots = []
+
+    def snapshot(self) -> dict:
+        """Return counters plus current size, for metrics and debugging."""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "size_bytes": self._size_bytes,
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            }
+
+    def _live_entry(self, key: str) -> Optional[CacheEntry]:
+        # Caller holds the lock
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= self._clock():
+            del self._entries[key]
+            self._size_bytes -= entry.size_bytes
+            self.stats["expirations"] += 1
+            self._release_slot(entry)
+            return None
+        return entry
+
+    def _assign_slot(self, entry: CacheEntry) -> None:
+        # Caller holds the lock
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            slot = len(self._slot_keys)
+            self._slot_keys.append(None)
+            if self._vectors is None or slot >= len(self._vectors):
+                capacity = max(INITIAL_CAPACITY, 2 * slot)
+                vectors = np.zeros((capacity, entry.vector.shape[0]), dtype=np.float32)
+                thresholds = np.full(capacity, np.inf, dtype=np.float32)
+                if self._vectors is not None:
+                    vectors[:slot] = self._vectors[:slot]
+                    thresholds[:slot] = self._thresholds[:slot]
+                self._vectors, self._thresholds = vectors, thresholds
+        threshold = self.route_thresholds.get(entry.route, self.threshold)
+        self._vectors[slot] = entry.vector
+        self._thresholds[slot] = np.inf if threshold is None else threshold
+        self._slot_keys[slot] = entry.query
+        entry.slot = slot
+
+    def _release_slot(self, entry: CacheEntry) -> None:
+        # Caller holds the lock
+        self._thresholds[entry.slot] = np.inf
+        self._slot_keys[entry.slot] = None
+        self._free_slots.append(entry.slot)
+
+
+semantic_cache = SemanticCache()
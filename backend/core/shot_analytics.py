@@ -0,0 +1,344 @@
+"""
+Columnar analytics over the golfer's shot history.
+
+Aggregate questions ("what's my average carry with a 7 iron", "how often do I
+slice my driver") are answered exactly from every recorded shot, not by having
+an LLM guess from five retrieved ones. The cleaned shot CSV is converted once
+to one ``.npy`` file per column (club and shape as integer codes, measurements
+as float32). Later processes memory-map those files, and each aggregate is a
+few vectorized NumPy operations over a boolean mask.
+
+Build or refresh the column files explicitly with::
+
+    python -m backend.core.shot_analytics --csv data/raw/cleaned_shot_data.csv
+
+(``get_shot_analytics`` also rebuilds them when the CSV is newer.)
+
+Configuration
+-------------
+SHOT_ANALYTICS_ENABLED : bool
+    Answer aggregate shot questions from the analytics columns (default "true").
+SHOT_ANALYTICS_PATH : str
+    Directory of the column files (default "data/processed/shot_analytics").
+"""
+
+import argparse
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+from backend.core.logging_config import logger
+from backend.core.shot_data import (
+    SHOT_DATA_CSV,
+    load_shot_data,
+    normalize_club,
+    normalize_shape,
+    shape_family,
+)
+
+load_dotenv()
+
+SHOT_ANALYTICS_ENABLED = os.getenv("SHOT_ANALYTICS_ENABLED", "true").lower() == "true"
+SHOT_ANALYTICS_PATH = os.getenv("SHOT_ANALYTICS_PATH", "data/processed/shot_analytics")
+
+# Analytics column -> CSV column
+MEASUREMENTS = {
+    "carry_distance": "Carry Distance",
+    "total_distance": "Total Distance",
+    "ball_speed": "Ball Speed",
+    "club_speed": "Club Speed",
+    "spin_rate": "Spin Rate",
+    "attack_angle": "Attack Angle",
+    "descent_angle": "Descent Angle",
+}
+UNITS = {
+    "carry_distance": "yd",
+    "total_distance": "yd",
+    "ball_speed": "mph",
+    "club_speed": "mph",
+    "spin_rate": "rpm",
+    "attack_angle": "deg",
+    "descent_angle": "deg",
+}
+PERCENTILES = (10, 50, 90)
+META_FILE = "meta.json"
+
+
+def metric_stats(values: np.ndarray) -> Optional[dict]:
+    """Count, mean, standard deviation (dispersion) and percentiles of the values."""
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return None
+    p10, p50, p90 = np.percentile(values, PERCENTILES)
+    return {
+        "count": int(len(values)),
+        "mean": round(float(values.mean()), 1),
+        "std": round(float(values.std()), 1),
+        "p10": round(float(p10), 1),
+        "p50": round(float(p50), 1),
+        "p90": round(float(p90), 1),
+    }
+
+
+class ShotAnalytics:
+    """
+    Shot measurements as NumPy columns, with club and shape as category codes.
+
+    Parameters
+    ----------
+    columns : dict
+        ``club`` and ``shape`` int16 code arrays (-1 for unknown) plus one
+        float32 array per entry of ``MEASUREMENTS``.
+    clubs, shapes : list of str
+        Category names, indexed by code.
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, np.ndarray],
+        clubs: Sequence[str],
+        shapes: Sequence[str],
+    ):
+        self.columns = columns
+        self.clubs = list(clubs)
+        self.shapes = list(shapes)
+
+    def __len__(self) -> int:
+        return len(self.columns["club"])
+
+    @classmethod
+    def from_frame(cls, shot_data: pd.DataFrame) -> "ShotAnalytics":
+        """Columnize a cleaned shot DataFrame."""
+        columns, categories = {}, {}
+        for name, source, normalize in (
+            ("club", "Club Type", normalize_club),
+            ("shape", "Shot Classification", normalize_shape),
+        ):
+            values = np.array(
+                [normalize(value) or "" for value in shot_data[source]], dtype=str
+            )
+            names, codes = np.unique(values, return_inverse=True)
+            names = names.tolist()
+    # Unknown values ("") sort first; shifted to -1 they never match a category
+            offset = 1 if names and names[0] == "" else 0
+            columns[name] = (codes.reshape(-1) - offset).astype(np.int16)
+            categories[name] = names[offset:]
+        for name, source in MEASUREMENTS.items():
+            if source in shot_data:
+                columns[name] = pd.to_numeric(
+                    shot_data[source], errors="coerce"
+                ).to_numpy(dtype=np.float32)
+            else:
+                columns[name] = np.full(len(shot_data), np.nan, dtype=np.float32)
+        return cls(columns, categories["club"], categories["shape"])
+
+    def save(self, path: str, source_mtime: float = 0.0) -> None:
+        os.makedirs(path, exist_ok=True)
+        for name, values in self.columns.items():
+            np.save(os.path.join(path, f"{name}.npy"), values)
+        with open(os.path.join(path, META_FILE), "w") as f:
+            json.dump(
+                {
+                    "clubs": self.clubs,
+                    "shapes": self.shapes,
+                    "rows": len(self),
+                    "source_mtime": source_mtime,
+                },
+                f,
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "ShotAnalytics":
+        """Memory-map the column files written by ``save``."""
+        with open(os.path.join(path, META_FILE)) as f:
+            meta = json.load(f)
+        names = ["club", "shape", *MEASUREMENTS]
+        columns = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+            for name in names
+        }
+        return cls(columns, meta["clubs"], meta["shapes"])
+
+    def mask(
+        self, club: Optional[str] = None, shape: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Shots hit with ``club`` and/or of the ``shape`` family (names as
+        normalized by ``shot_data``; "slice" also matches "push slice").
+        """
+        keep = np.ones(len(self), dtype=bool)
+        if club:
+            code = self.clubs.index(club) if club in self.clubs else -2
+            keep &= np.asarray(self.columns["club"]) == code
+        if shape:
+            family = shape_family(shape)
+            codes = [
+                i for i, name in enumerate(self.shapes) if shape_family(name) == family
+            ]
+            keep &= np.isin(np.asarray(self.columns["shape"]), codes)
+        return keep
+
+    def summarize(
+        self,
+        club: Optional[str] = None,
+        shape: Optional[str] = None,
+        metrics: Sequence[str] = ("carry_distance", "total_distance"),
+    ) -> dict:
+        """
+        Exact statistics for one club (or every shot).
+
+        Returns
+        -------
+        dict
+            ``shots`` hit with the club, ``shapes`` (count and share of those
+            shots per classification, most frequent first), and ``matching``
+            shots with per-metric ``metric_stats`` restricted to the ``shape``
+            family.
+        """
+        with_club = self.mask(club=club)
+        keep = with_club & self.mask(shape=shape) if shape else with_club
+        shots = int(with_club.sum())
+        shape_codes = np.asarray(self.columns["shape"])[with_club]
+        counts = np.bincount(shape_codes[shape_codes >= 0], minlength=len(self.shapes))
+        order = np.argsort(-counts, kind="stable")
+        return {
+            "club": club,
+            "shape": shape,
+            "shots": shots,
+            "shapes": {
+                self.shapes[i]: {
+                    "count": int(counts[i]),
+                    "share": round(float(counts[i]) / shots, 3),
+                }
+                for i in order
+                if counts[i]
+            },
+            "matching": int(keep.sum()),
+            "metrics": {
+                m: metric_stats(np.asarray(self.columns[m])[keep]) for m in metrics
+            },
+        }
+
+    def by_club(self, metric: str = "carry_distance") -> List[dict]:
+        """
+        ``metric_stats`` of ``metric`` for every club in one vectorized pass,
+        ordered by median (longest club first).
+        """
+        codes = np.asarray(self.columns["club"])
+        values = np.asarray(self.columns[metric])
+        valid = (codes >= 0) & ~np.isnan(values)
+        codes, values = codes[valid], values[valid].astype(np.float64)
+        if not len(codes):
+            return []
+        # Sort by club, then value: each club's values form one sorted run
+        order = np.lexsort((values, codes))
+        codes, values = codes[order], values[order]
+        groups, starts, counts = np.unique(codes, return_index=True, return_counts=True)
+        sums = np.add.reduceat(values, starts)
+        means = sums / counts
+        variances = np.add.reduceat(values**2, starts) / counts - means**2
+        stats = {
+            "count": counts,
+            "mean": means,
+            "std": np.sqrt(np.clip(variances, 0, None)),
+        }
+        for p in PERCENTILES:
+            # Linear interpolation between the order statistics, as np.percentile does
+            position = starts + (counts - 1) * p / 100
+            low = np.floor(position).astype(int)
+            high = np.minimum(low + 1, starts + counts - 1)
+            stats[f"p{p}"] = values[low] + (values[high] - values[low]) * (
+                position - low
+            )
+        rows = [
+            {
+                "club": self.clubs[code],
+                "count": int(stats["count"][i]),
+                **{
+                    key: round(float(stats[key][i]), 1)
+                    for key in ("mean", "std", "p10", "p50", "p90")
+                },
+            }
+            for i, code in enumerate(groups)
+        ]
+        return sorted(rows, key=lambda row: -row["p50"])
+
+
+_analytics: Optional[ShotAnalytics] = None
+_analytics_error: Optional[Exception] = None
+_analytics_lock = threading.Lock()
+
+
+def build_shot_analytics(
+    csv_path: str = SHOT_DATA_CSV, path: str = SHOT_ANALYTICS_PATH
+) -> ShotAnalytics:
+    """Columnize the CSV and write the column files."""
+    analytics = ShotAnalytics.from_frame(load_shot_data(csv_path))
+    try:
+        analytics.save(path, source_mtime=os.path.getmtime(csv_path))
+    except OSError:
+        logger.warning(
+            f"Could not write shot analytics columns to {path}; keeping them in memory",
+            exc_info=True,
+        )
+    return analytics
+
+
+def get_shot_analytics() -> ShotAnalytics:
+    """
+    The process-wide analytics columns: memory-mapped from ``SHOT_ANALYTICS_PATH``,
+    or (re)built from ``SHOT_DATA_CSV`` when missing or older than the CSV.
+
+    A failed load (e.g. no shot data) is remembered: later calls raise
+    ``RuntimeError`` without touching the disk again until the process restarts.
+    """
+    global _analytics, _analytics_error
+    if _analytics is None:
+        with _analytics_lock:
+            if _analytics_error is not None:
+                raise RuntimeError(f"Shot analytics unavailable: {_analytics_error}")
+            if _analytics is None:
+                try:
+                    meta_path = os.path.join(SHOT_ANALYTICS_PATH, META_FILE)
+                    fresh = False
+                    if os.path.exists(meta_path):
+                        with open(meta_path) as f:
+                            built_from = json.load(f).get("source_mtime", 0)
+                        fresh = (
+                            not os.path.exists(SHOT_DATA_CSV)
+                            or os.path.getmtime(SHOT_DATA_CSV) <= built_from
+                        )
+                    _analytics = (
+                        ShotAnalytics.load(SHOT_ANALYTICS_PATH)
+                        if fresh
+                        else build_shot_analytics()
+                    )
+                except Exception as e:
+                    _analytics_error = e
+                    raise
+                logger.info(
+                    f"Loaded shot analytics ({len(_analytics)} shots, "
+                    f"{len(_analytics.clubs)} clubs)"
+                )
+    return _analytics
+
+
+def is_shot_analytics_unavailable() -> bool:
+    """True once loading the analytics has failed (see ``get_shot_analytics``)."""
+    return _analytics_error is not None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Build the columnar shot analytics files"
+    )
+    parser.add_argument("--csv", default=SHOT_DATA_CSV, help="cleaned shot data CSV")
+    parser.add_argument("--out", default=SHOT_ANALYTICS_PATH, help="directory to write")
+    args = parser.parse_args()
+    analytics = build_shot_analytics(args.csv, args.out)
+    print(f"Wrote {len(analytics)} shots ({len(analytics.clubs)} clubs) to {args.out}")
@@ -0,0 +1,198 @@
+"""
+BM25 lexical index over the shot texts, fused with dense search results.
+
+Shot texts are templated ("using a 7 Iron (7i) ... classified as Slice ... Spin
+rate ..."), so exact tokens such as club names and shot classifications carry
+a lot of signal that dense embeddings blur. ``BM25Index`` is a NumPy inverted
+index: every term's postings store precomputed BM25 weights, so scoring a query
+adds up the postings of its terms. ``reciprocal_rank_fusion``
+merges the lexical and dense rankings.
+
+The corpus is the local shot index's payloads when ``SHOT_INDEX_BACKEND=local``,
+otherwise the shot CSV (``SHOT_DATA_CSV``, same texts as the Qdrant collection).
+
+Configuration
+-------------
+SHOT_HYBRID_SEARCH : bool
+    Fuse BM25 with dense results in the shot tool (default "true").
+SHOT_HYBRID_CANDIDATES : int
+    Results taken from each ranking before fusion (default 20).
+SHOT_RRF_K : int
+    Reciprocal rank fusion constant (default 60).
+"""
+
+import os
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from dotenv import load_dotenv
+
+from backend.core.logging_config import logger
+from backend.core.shot_data import SHOT_DATA_CSV, load_shot_data, shot_payloads
+from backend.core.shot_index import (
+    SHOT_INDEX_BACKEND,
+    ShotFilter,
+    ShotHit,
+    get_local_shot_index,
+    payload_columns,
+    top_k,
+)
+
+load_dotenv()
+
+SHOT_HYBRID_SEARCH = os.getenv("SHOT_HYBRID_SEARCH", "true").lower() == "true"
+SHOT_HYBRID_CANDIDATES = int(os.getenv("SHOT_HYBRID_CANDIDATES", "20"))
+SHOT_RRF_K = int(os.getenv("SHOT_RRF_K", "60"))
+
+# Letters or digit runs, so "7 Iron (7i)" -> 7, iron, 7, i and "150.3" -> 150, 3
+TOKEN = re.compile(r"[a-z]+|\d+")
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN.findall(text.lower())
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a fixed list of texts.
+
+    Parameters
+    ----------
+    texts : sequence of str
+        The documents, indexed by position.
+    k1, b : float
+        BM25 term-frequency saturation and length normalization.
+    """
+
+    def __init__(self, texts: Sequence[str], k1: float = 1.2, b: float = 0.75):
+        self.size = len(texts)
+        postings: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        lengths = np.zeros(self.size, dtype=np.float32)
+        for doc, text in enumerate(texts):
+            tokens = tokenize(text)
+            lengths[doc] = len(tokens)
+            for token in tokens:
+                postings[token][doc] += 1
+        average = lengths.mean() if self.size else 1.0
+        norm = k1 * (1 - b + b * lengths / (average or 1.0))
+
+        # term -> (doc ids, BM25 weights); the weights do not depend on the query
+        self._postings = {}
+        for term, counts in postings.items():
+            docs = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+            tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+            idf = np.log(1 + (self.size - len(docs) + 0.5) / (len(docs) + 0.5))
+            self._postings[term] = (
+                docs,
+                (idf * tf * (k1 + 1) / (tf + norm[docs])).astype(np.float32),
+            )
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every document for ``query``."""
+        scores = np.zeros(self.size, dtype=np.float32)
+        for term in tokenize(query):
+            if term in self._postings:
+                docs, weights = self._postings[term]
+            # Each document appears once per posting list, so a fancy-index add
+            # is safe
+                scores[docs] += weights
+        return scores
+
+    def search(
+        self, query: str, limit: int, mask: Optional[np.ndarray] = None
+    ) -> List[tuple]:
+        """``(doc, score)`` pairs of the best positive-scoring matches, best first."""
+        scores = self.scores(query)
+        if mask is not None:
+            scores[~mask] = 0
+        matching = int(np.count_nonzero(scores > 0))
+        if not matching:
+            return []
+        return [
+            (int(doc), float(scores[doc]))
+            for doc in top_k(scores, min(limit, matching))
+        ]
+
+
+class ShotLexicalIndex:
+    """BM25 over shot texts, pre-filtered by ``ShotFilter`` like dense search."""
+
+    def __init__(self, payloads: Sequence[dict]):
+        self.payloads = list(payloads)
+        self.bm25 = BM25Index([payload["text"] for payload in self.payloads])
+        self._columns = payload_columns(self.payloads)
+
+    def __len__(self) -> int:
+        return len(self.payloads)
+
+    def search(
+        self, query: str, limit: int, shot_filter: Optional[ShotFilter] = None
+    ) -> List[ShotHit]:
+        mask = shot_filter.mask(self._columns) if shot_filter is not None else None
+        return [
+            ShotHit(score=score, payload=self.payloads[doc])
+            for doc, score in self.bm25.search(query, limit, mask)
+        ]
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence], limit: int, k: int = SHOT_RRF_K
+) -> List[ShotHit]:
+    """
+    Merge ranked result lists by reciprocal rank: score = sum of 1 / (k + rank).
+
+    Results are matched on their payload text; the fused score replaces the
+    per-ranking scores.
+    """
+    fused: Dict[str, float] = defaultdict(float)
+    payloads = {}
+    for ranking in rankings:
+        for rank, hit in enumerate(ranking, start=1):
+            text = hit.payload["text"]
+            fused[text] += 1 / (k + rank)
+            payloads.setdefault(text, hit.payload)
+    best = sorted(fused, key=fused.get, reverse=True)[:limit]
+    return [ShotHit(score=fused[text], payload=payloads[text]) for text in best]
+
+
+_index: Optional[ShotLexicalIndex] = None
+_index_error: Optional[Exception] = None
+_index_lock = threading.Lock()
+
+
+def get_shot_lexical_index() -> ShotLexicalIndex:
+    """
+    The process-wide BM25 index over the configured shot corpus, built on first use.
+
+    A failed build (e.g. no shot data) is remembered: later calls raise
+    ``RuntimeError`` without reading the corpus again until the process restarts.
+    """
+    global _index, _index_error
+    if _index is None:
+        with _index_lock:
+            if _index_error is not None:
+                raise RuntimeError(f"BM25 shot index unavailable: {_index_error}")
+            if _index is None:
+                try:
+                    if SHOT_INDEX_BACKEND == "local":
+                        payloads = get_local_shot_index().payloads
+                    else:
+                        payloads = shot_payloads(load_shot_data(SHOT_DATA_CSV))
+                    _index = ShotLexicalIndex(payloads)
+                except Exception as e:
+                    _index_error = e
+                    raise
+                logger.info(f"Built BM25 shot index ({len(_index)} shots)")
+    return _index
+
+
+def is_shot_lexical_index_loaded() -> bool:
+    return _index is not None
+
+
+def is_shot_lexical_index_unavailable() -> bool:
+    """True once building the BM25 index has failed (see ``get_shot_lexical_index``)."""
+    return _index_error is not None
@@ -0,0 +1,113 @@
+"""
+Loading and text formatting for the golfer's shot data.
+
+``create_embedding_text`` is the same formatting used by
+``notebooks/01_Embed_and_Store_Shots_MultiModel.ipynb``, so vectors built here
+match the ones stored in Qdrant. ``shot_payload`` adds the normalized club,
+shape, shape family and distances next to the text so searches can filter on them.
+"""
+
+import math
+import os
+import re
+from typing import List, Optional
+
+import pandas as pd
+
+SHOT_DATA_CSV = os.getenv("SHOT_DATA_CSV", "data/raw/cleaned_shot_data.csv")
+
+
+def create_embedding_text(row) -> str:
+    return (
+        f"On {row['Date']}, the golfer hit a shot {row['Total Distance']} yards "
+        f"with a carry of {row['Carry Distance']} yards "
+        f"using a {row['Club Type']} ({row['Club Description']}). "
+        f"The shot was classified as {row['Shot Classification']}. "
+        f"The known contributing factors to this result were: "
+        f"Ball speed: {row['Ball Speed']} mph. "
+        f"Club speed: {row['Club Speed']} mph. "
+        f"Spin rate: {row['Spin Rate']} rpm. "
+        f"Attack angle: {row['Attack Angle']} degrees. "
+        f"Descent angle: {row['Descent Angle']} degrees."
+    )
+
+
+def load_shot_data(csv_path: str = SHOT_DATA_CSV) -> pd.DataFrame:
+    """Read the cleaned shot CSV."""
+    return pd.read_csv(csv_path)
+
+
+def shot_texts(shot_data: pd.DataFrame) -> List[str]:
+    """The embedding text of every shot, in row order."""
+    return shot_data.apply(create_embedding_text, axis=1).tolist()
+
+
+CLUB_ABBREVIATIONS = {
+    "dr": "driver",
+    "pw": "pitching wedge",
+    "gw": "gap wedge",
+    "aw": "approach wedge",
+    "sw": "sand wedge",
+    "lw": "lob wedge",
+}
+CLUB_PATTERNS = [
+    (re.compile(r"^(\d+)\s*i(ron)?$"), r"\1 iron"),
+    (re.compile(r"^(\d+)\s*w(ood)?$"), r"\1 wood"),
+    (re.compile(r"^(\d+)\s*h(ybrid)?$"), r"\1 hybrid"),
+]
+UNKNOWN_VALUES = {"", "unknown", "none", "n/a", "nan"}
+
+
+def normalize_club(value) -> Optional[str]:
+    """Canonical club name ("7 iron", "pitching wedge"), or None if unknown."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    club = " ".join(str(value).lower().replace("-", " ").split())
+    if club in UNKNOWN_VALUES:
+        return None
+    club = CLUB_ABBREVIATIONS.get(club, club)
+    for pattern, replacement in CLUB_PATTERNS:
+        club = pattern.sub(replacement, club)
+    return club
+
+
+def normalize_shape(value) -> Optional[str]:
+    """Lowercase shot shape ("slice", "draw"), or None if unknown."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    shape = " ".join(str(value).lower().split())
+    return None if shape in UNKNOWN_VALUES else shape
+
+
+def shape_family(value) -> Optional[str]:
+    """
+    The base shape of a classification: its shape word, so "Push Slice" and
+    "Pull Slice" are both "slice". None if unknown.
+    """
+    shape = normalize_shape(value)
+    return shape.split()[-1] if shape else None
+
+
+def parse_distance(value) -> Optional[float]:
+    """Yards from a number or text such as "150" or "150 yards"; None if absent."""
+    if isinstance(value, (int, float)):
+        return None if isinstance(value, float) and math.isnan(value) else float(value)
+    match = re.search(r"\d+(\.\d+)?", str(value or ""))
+    return float(match.group(0)) if match else None
+
+
+def shot_payload(row) -> dict:
+    """Stored payload for one shot: its embedding text plus the filterable fields."""
+    return {
+        "text": create_embedding_text(row),
+        "club": normalize_club(row["Club Type"]),
+        "shape": normalize_shape(row["Shot Classification"]),
+        "shape_family": shape_family(row["Shot Classification"]),
+        "total_distance": parse_distance(row["Total Distance"]),
+        "carry_distance": parse_distance(row["Carry Distance"]),
+    }
+
+
+def shot_payloads(shot_data: pd.DataFrame) -> List[dict]:
+    """The payload of every shot, in row order."""
+    return [shot_payload(row) for _, row in shot_data.iterrows()]
@@ -0,0 +1,534 @@
+"""
+In-process vector index for the shot corpus.
+
+The shot corpus is small (one CSV of range sessions), so instead of a network
+round trip to Qdrant the vectors can be kept on local disk and searched with a
+single NumPy matrix-vector product. An index directory holds:
+
+- ``embeddings.npy``: float32 L2-normalized vectors, memory-mapped on load
+- ``payloads.jsonl``: one JSON payload per vector (``text`` plus the filterable
+  ``club``, ``shape``, ``shape_family``, ``total_distance`` and
+  ``carry_distance``), same order
+- ``meta.json``: the embedding model, dimension and count the index was built with
+- ``embeddings_int8.npy`` / ``int8_scales.npy`` and ``embeddings_binary.npy``:
+  scalar (int8) and binary quantized copies of the vectors
+
+With ``SHOT_QUANTIZATION`` set, only the quantized copy is read into memory and
+scanned; the best ``limit * SHOT_QUANTIZATION_OVERSAMPLING`` candidates are then
+rescored with their original float32 vectors, read from the memory map. The
+same setting switches the Qdrant collection to quantized search with rescoring.
+
+Build one from the cleaned CSV with::
+
+    python -m backend.core.shot_index --csv data/raw/cleaned_shot_data.csv
+
+Configuration
+-------------
+SHOT_INDEX_BACKEND : str
+    "qdrant" (default) searches the remote collection; "local" uses this index.
+SHOT_INDEX_PATH : str
+    Index directory (default "data/processed/shot_index").
+SHOT_DISTANCE_TOLERANCE : float
+    Half-width in yards of the distance range filter (default 15).
+SHOT_QUANTIZATION : str
+    "none" (default), "scalar" (int8) or "binary" vector quantization.
+SHOT_QUANTIZATION_OVERSAMPLING : float
+    Candidates scored with the quantized vectors per result (default 3.0).
+SHOT_QUANTIZATION_RESCORE : bool
+    Rescore the candidates with the original vectors (default "true").
+"""
+
+import argparse
+import json
+import math
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+import numpy as np
+from dotenv import load_dotenv
+from qdrant_client import models
+
+from backend.core.local_embeddings import EMBEDDING_MODEL, document_text, encode_texts
+from backend.core.logging_config import logger
+from backend.core.shot_data import (
+    SHOT_DATA_CSV,
+    load_shot_data,
+    normalize_club,
+    parse_distance,
+    shape_family,
+    shot_payloads,
+)
+
+load_dotenv()
+
+SHOT_INDEX_BACKEND = os.getenv("SHOT_INDEX_BACKEND", "qdrant").lower()
+SHOT_INDEX_PATH = os.getenv("SHOT_INDEX_PATH", "data/processed/shot_index")
+SHOT_DISTANCE_TOLERANCE = float(os.getenv("SHOT_DISTANCE_TOLERANCE", "15"))
+SHOT_QUANTIZATION = os.getenv("SHOT_QUANTIZATION", "none").lower()
+SHOT_QUANTIZATION_OVERSAMPLING = float(
+    os.getenv("SHOT_QUANTIZATION_OVERSAMPLING", "3.0")
+)
+SHOT_QUANTIZATION_RESCORE = (
+    os.getenv("SHOT_QUANTIZATION_RESCORE", "true").lower() == "true"
+)
+
+QUANTIZATION_MODES = ("none", "scalar", "binary")
+# Values beyond this quantile of each dimension are clipped before int8 scaling
+INT8_QUANTILE = 0.99
+
+EMBEDDINGS_FILE = "embeddings.npy"
+PAYLOADS_FILE = "payloads.jsonl"
+META_FILE = "meta.json"
+INT8_FILE = "embeddings_int8.npy"
+INT8_SCALES_FILE = "int8_scales.npy"
+BINARY_FILE = "embeddings_binary.npy"
+
+# Number of set bits in every byte value, for Hamming distances over packed bits
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+@dataclass
+class ShotHit:
+    """A search result shaped like a Qdrant ``ScoredPoint`` (``score``, ``payload``)."""
+    score: float
+    payload: dict = field(default_factory=dict)
+
+
+@dataclass
+class ShotFilter:
+    """
+    Payload conditions applied before the vector search.
+
+    Attributes
+    ----------
+    club : str, optional
+        Only shots hit with this (normalized) club.
+    min_distance, max_distance : float, optional
+        Inclusive range on ``total_distance`` in yards.
+    shape : str, optional
+        Only shots of this shape family ("slice" matches "push slice" too).
+    exclude_shape : str, optional
+        Skip shots of this shape family.
+    """
+    club: Optional[str] = None
+    min_distance: Optional[float] = None
+    max_distance: Optional[float] = None
+    shape: Optional[str] = None
+    exclude_shape: Optional[str] = None
+
+    @classmethod
+    def from_intent(
+        cls, intent: dict, tolerance: float = SHOT_DISTANCE_TOLERANCE
+    ) -> Optional["ShotFilter"]:
+        """
+        Build a filter from a shot intent (distance, intent, shape, club).
+
+        Shots with the club are kept within ``tolerance`` yards of the distance.
+        An "achieve" intent keeps only shots of that shape family; an "avoid"
+        intent drops them, so avoiding a slice also drops push and pull slices.
+        Returns None when the intent has nothing to filter on.
+        """
+        distance = parse_distance(intent.get("distance"))
+        shape = shape_family(intent.get("shape"))
+        avoid = str(intent.get("intent", "")).lower() == "avoid"
+        shot_filter = cls(
+            club=normalize_club(intent.get("club")),
+            min_distance=None if distance is None else distance - tolerance,
+            max_distance=None if distance is None else distance + tolerance,
+            shape=None if avoid else shape,
+            exclude_shape=shape if avoid else None,
+        )
+        return None if shot_filter.is_empty else shot_filter
+
+    @property
+    def is_empty(self) -> bool:
+        return all(value is None for value in vars(self).values())
+
+    def to_qdrant(self) -> models.Filter:
+        """The equivalent Qdrant filter (served by the payload indexes)."""
+        must, must_not = [], []
+        if self.club:
+            must.append(
+                models.FieldCondition(
+                    key="club", match=models.MatchValue(value=self.club)
+                )
+            )
+        if self.min_distance is not None or self.max_distance is not None:
+            must.append(
+                models.FieldCondition(
+                    key="total_distance",
+                    range=models.Range(gte=self.min_distance, lte=self.max_distance),
+                )
+            )
+        if self.shape:
+            must.append(models.FieldCondition(
+                key="shape_family", match=models.MatchValue(value=self.shape)
+            ))
+        if self.exclude_shape:
+            must_not.append(models.FieldCondition(
+                key="shape_family", match=models.MatchValue(value=self.exclude_shape)
+            ))
+        return models.Filter(must=must or None, must_not=must_not or None)
+
+    def mask(self, columns: dict) -> np.ndarray:
+        """Boolean mask over a local index's payload columns."""
+        keep = np.ones(len(columns["club"]), dtype=bool)
+        if self.club:
+            keep &= columns["club"] == self.club
+        if self.min_distance is not None:
+            keep &= columns["total_distance"] >= self.min_distance
+        if self.max_distance is not None:
+            keep &= columns["total_distance"] <= self.max_distance
+        if self.shape:
+            keep &= columns["shape_family"] == self.shape
+        if self.exclude_shape:
+            keep &= columns["shape_family"] != self.exclude_shape
+        return keep
+
+
+def quantize_int8(vectors: np.ndarray, quantile: float = INT8_QUANTILE):
+    """
+    Scalar-quantize vectors to int8 with one scale per dimension.
+
+    Returns
+    -------
+    codes : numpy.ndarray
+        int8 array, same shape as ``vectors``.
+    scales : numpy.ndarray
+        float32 per-dimension scales; ``codes * scales`` approximates ``vectors``.
+    """
+    bound = (
+        np.quantile(np.abs(vectors), quantile, axis=0)
+        if len(vectors)
+        else np.ones(vectors.shape[1])
+    )
+    bound = np.where(bound == 0, 1, bound).astype(np.float32)
+    codes = np.clip(np.round(vectors / bound * 127), -127, 127).astype(np.int8)
+    return codes, bound / 127
+
+
+def quantize_binary(vectors: np.ndarray) -> np.ndarray:
+    """One bit per dimension (positive or not), packed into uint8."""
+    return np.packbits(vectors > 0, axis=1)
+
+
+def qdrant_quantization_config(
+    mode: str = SHOT_QUANTIZATION,
+) -> Optional[models.QuantizationConfig]:
+    """The collection quantization config for ``mode`` (None for "none")."""
+    if mode == "scalar":
+        return models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8, quantile=INT8_QUANTILE, always_ram=True
+            )
+        )
+    if mode == "binary":
+        return models.BinaryQuantization(
+            binary=models.BinaryQuantizationConfig(always_ram=True)
+        )
+    if mode != "none":
+        raise ValueError(
+            f"Unknown SHOT_QUANTIZATION {mode!r}; expected one of {QUANTIZATION_MODES}"
+        )
+    return None
+
+
+def qdrant_search_params(
+    mode: str = SHOT_QUANTIZATION,
+    oversampling: float = SHOT_QUANTIZATION_OVERSAMPLING,
+    rescore: bool = SHOT_QUANTIZATION_RESCORE,
+) -> Optional[models.SearchParams]:
+    """Search params that oversample the quantized vectors and rescore exactly."""
+    if mode == "none":
+        return None
+    return models.SearchParams(
+        quantization=models.QuantizationSearchParams(
+            rescore=rescore, oversampling=oversampling
+        )
+    )
+
+
+class LocalShotIndex:
+    """
+    Memory-mapped exact nearest-neighbour index over normalized shot vectors.
+
+    Parameters
+    ----------
+    path : str
+        Index directory written by ``LocalShotIndex.build``.
+    quantization : str, optional
+        "none", "scalar" or "binary" (default ``SHOT_QUANTIZATION``).
+    oversampling : float, optional
+        Quantized candidates per result when rescoring.
+    rescore : bool, optional
+        Rescore quantized candidates with the original vectors.
+    """
+
+    def __init__(
+        self,
+        path: str = SHOT_INDEX_PATH,
+        quantization: str = SHOT_QUANTIZATION,
+        oversampling: float = SHOT_QUANTIZATION_OVERSAMPLING,
+        rescore: bool = SHOT_QUANTIZATION_RESCORE,
+    ):
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(
+                f"Unknown quantization {quantization!r}; "
+                f"expected one of {QUANTIZATION_MODES}"
+            )
+        self.path = path
+        self.quantization = quantization
+        self.oversampling = oversampling
+        self.rescore = rescore
+        self.meta = {}
+        self._vectors = None
+        self._codes = None
+        self._scales = None
+        self._payloads: List[dict] = []
+        self._columns = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(
+        cls, path: str, vectors, payloads: Sequence[dict], model: str
+    ) -> "LocalShotIndex":
+        """
+        Write an index directory and return the loaded index.
+
+        Parameters
+        ----------
+        path : str
+            Directory to write (created if missing).
+        vectors : array-like
+            One embedding per payload; normalized before writing.
+        payloads : sequence of dict
+            Payload for each vector, e.g. ``{"text": ...}``.
+        model : str
+            Name of the embedding model that produced the vectors.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(vectors) != len(payloads):
+            raise ValueError(f"Got {len(vectors)} vectors for {len(payloads)} payloads")
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, EMBEDDINGS_FILE), vectors)
+        codes, scales = quantize_int8(vectors)
+        np.save(os.path.join(path, INT8_FILE), codes)
+        np.save(os.path.join(path, INT8_SCALES_FILE), scales)
+        np.save(os.path.join(path, BINARY_FILE), quantize_binary(vectors))
+        with open(os.path.join(path, PAYLOADS_FILE), "w") as f:
+            for payload in payloads:
+                f.write(json.dumps(payload) + "\n")
+        with open(os.path.join(path, META_FILE), "w") as f:
+            json.dump(
+                {
+                    "model": model,
+                    "dim": int(vectors.shape[1]),
+                    "count": int(len(vectors)),
+                },
+                f,
+            )
+        index = cls(path)
+        index.load()
+        return index
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    @property
+    def payloads(self) -> List[dict]:
+        return self.load()._payloads
+
+    def load(self) -> "LocalShotIndex":
+        """Memory-map the vectors and read the payloads (once; later calls no-op)."""
+        if self._vectors is None:
+            with self._lock:
+                if self._vectors is None:
+                    with open(os.path.join(self.path, META_FILE)) as f:
+                        self.meta = json.load(f)
+                    with open(os.path.join(self.path, PAYLOADS_FILE)) as f:
+                        self._payloads = [
+                            json.loads(line) for line in f if line.strip()
+                        ]
+                    vectors = np.load(
+                        os.path.join(self.path, EMBEDDINGS_FILE), mmap_mode="r"
+                    )
+                    if len(vectors) != len(self._payloads):
+                        raise ValueError(
+                            f"Shot index at {self.path} is inconsistent: "
+                            f"{len(vectors)} vectors, {len(self._payloads)} payloads"
+                        )
+                    self._columns = payload_columns(self._payloads)
+                    self._load_quantized(vectors)
+                    self._vectors = vectors
+                    logger.info(
+                        f"Loaded local shot index from {self.path} "
+                        f"({len(vectors)} shots)"
+                    )
+        return self
+
+    def _load_quantized(self, vectors: np.ndarray) -> None:
+        """Read the quantized copy into memory (computed for older indexes)."""
+        if self.quantization == "scalar":
+            if os.path.exists(os.path.join(self.path, INT8_FILE)):
+                self._codes = np.load(os.path.join(self.path, INT8_FILE))
+                self._scales = np.load(os.path.join(self.path, INT8_SCALES_FILE))
+            else:
+                self._codes, self._scales = quantize_int8(np.asarray(vectors))
+        elif self.quantization == "binary":
+            binary_path = os.path.join(self.path, BINARY_FILE)
+            self._codes = (
+                np.load(binary_path)
+                if os.path.exists(binary_path)
+                else quantize_binary(np.asarray(vectors))
+            )
+
+    def memory_bytes(self) -> int:
+        """Bytes of vector data scanned per search (quantized copy or float32)."""
+        vectors = self.load()._vectors
+        return int(self._codes.nbytes if self._codes is not None else vectors.nbytes)
+
+    def check_model(self, model: str) -> None:
+        """Raise if the index was built with another embedding model than ``model``."""
+        built_with = self.load().meta.get("model")
+        if built_with != model:
+            raise ValueError(
+                f"Shot index at {self.path} was built with {built_with}, "
+                f"but EMBEDDING_MODEL is {model}. "
+                f"Rebuild it with `python -m backend.core.shot_index`."
+            )
+
+    def search(
+        self, query_vector, limit: int = 5, shot_filter: Optional[ShotFilter] = None
+    ) -> List[ShotHit]:
+        """
+        Return the ``limit`` shots with the highest cosine similarity to the query.
+
+        Parameters
+        ----------
+        query_vector : array-like
+            The query embedding (normalized here if it is not already).
+        limit : int
+            Number of results.
+        shot_filter : ShotFilter, optional
+            Payload conditions; only matching shots are scored.
+        """
+        vectors = self.load()._vectors
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+        # Pre-filter on the payload columns so only candidates are scored
+        rows = (
+            np.flatnonzero(shot_filter.mask(self._columns))
+            if shot_filter is not None
+            else None
+        )
+        limit = min(limit, len(vectors) if rows is None else len(rows))
+        if limit <= 0:
+            return []
+
+        if self.quantization == "none":
+            scores = vectors @ query if rows is None else vectors[rows] @ query
+        else:
+            scores = self._quantized_scores(query, rows)
+            if self.rescore:
+            # Oversample with the cheap scores, then rescore those candidates
+                candidates = top_k(
+                    scores, min(len(scores), math.ceil(limit * self.oversampling))
+                )
+                rows = candidates if rows is None else rows[candidates]
+                scores = vectors[rows] @ query
+        top = top_k(scores, limit)
+        rows = top if rows is None else rows[top]
+        return [
+            ShotHit(score=float(scores[i]), payload=self._payloads[row])
+            for i, row in zip(top, rows)
+        ]
+
+    def _quantized_scores(
+        self, query: np.ndarray, rows: Optional[np.ndarray]
+    ) -> np.ndarray:
+        """Approximate cosine similarities from the quantized vectors."""
+        codes = self._codes if rows is None else self._codes[rows]
+        if self.quantization == "scalar":
+            # (codes * scales) @ query == codes @ (scales * query)
+            return codes @ (self._scales * query)
+        # Binary: the fraction of matching sign bits, mapped to [-1, 1]
+        dim = len(query)
+        mismatches = POPCOUNT[
+            np.bitwise_xor(codes, quantize_binary(query[None, :]))
+        ].sum(axis=1, dtype=np.int32)
+        return 1 - 2 * mismatches / dim
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` highest scores, best first."""
+    # argpartition finds the top-k in O(n); only those k are sorted
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def payload_columns(payloads: Sequence[dict]) -> dict:
+    """Columnar copies of the filterable payload fields for vectorized filtering."""
+    return {
+        "club": np.array([p.get("club") or "" for p in payloads], dtype=str),
+        "shape": np.array([p.get("shape") or "" for p in payloads], dtype=str),
+        # Indexes built before shape_family was stored derive it from the shape
+        "shape_family": np.array(
+            [
+                p.get("shape_family") or shape_family(p.get("shape")) or ""
+                for p in payloads
+            ],
+            dtype=str,
+        ),
+        "total_distance": np.array(
+            [
+                np.nan if p.get("total_distance") is None else p["total_distance"]
+                for p in payloads
+            ],
+            dtype=np.float32,
+        ),
+    }
+
+
+_index: Optional[LocalShotIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_local_shot_index() -> LocalShotIndex:
+    """Return the process-wide local index at ``SHOT_INDEX_PATH`` (loaded once)."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = LocalShotIndex(SHOT_INDEX_PATH).load()
+    return _index
+
+
+def is_local_shot_index_loaded() -> bool:
+    return _index is not None
+
+
+def build_local_index(csv_path: str, path: str = SHOT_INDEX_PATH) -> LocalShotIndex:
+    """Embed every shot in the cleaned CSV and write a local index."""
+    payloads = shot_payloads(load_shot_data(csv_path))
+    vectors = encode_texts(
+        [document_text(payload["text"]) for payload in payloads], use_cache=False
+    )
+    return LocalShotIndex.build(path, vectors, payloads, EMBEDDING_MODEL)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the local shot vector index")
+    parser.add_argument("--csv", default=SHOT_DATA_CSV, help="cleaned shot data CSV")
+    parser.add_argument(
+        "--out", default=SHOT_INDEX_PATH, help="index directory to write"
+    )
+    args = parser.parse_args()
+    index = build_local_index(args.csv, args.out)
+    print(f"Wrote {len(index)} shots to {args.out}")
@@ -0,0 +1,439 @@
+"""
+Streaming, resumable ingestion of shot data into Qdrant.
+
+Replaces the load step of ``notebooks/01_Embed_and_Store_Shots_MultiModel.ipynb``
+for large launch-monitor exports:
+
+- the CSV is read in chunks, so memory use is bounded by ``--chunk-size`` rows
+- every shot's point ID is derived from its CSV row number, and its payload
+  stores a hash of the embedding model and text; a re-run compares the hashes
+  and only embeds rows that are new, edited, or embedded with another model.
+  Edited rows overwrite their point, and points of rows past the end of a
+  shortened CSV are deleted, so no stale shots are left behind (inserting rows
+  mid-file shifts the rows after them, which are then re-embedded)
+- encoding runs in batches, optionally across worker processes
+- points are upserted in parallel batches while the next chunk is encoded
+- after each chunk is stored, the CSV row offset is written to a checkpoint
+  file, and an interrupted run resumes from that offset
+
+Payloads carry the filterable fields from ``shot_payload`` and the collection
+gets the matching payload indexes.
+
+Usage::
+
+    python -m backend.core.shot_ingest --csv data/raw/cleaned_shot_data.csv
+    python -m backend.core.shot_ingest --workers 4 --upsert-workers 8 --chunk-size 50000
+    python -m backend.core.shot_ingest --recreate   # drop the collection first
+    python -m backend.core.shot_ingest --quantization scalar
+
+Configuration
+-------------
+INGEST_CHUNK_SIZE : int
+    CSV rows read per chunk (default 10000).
+INGEST_ENCODE_BATCH_SIZE : int
+    Texts per encode call (default 256).
+INGEST_UPSERT_BATCH_SIZE : int
+    Points per upsert request (default 256).
+INGEST_CHECKPOINT_PATH : str
+    Checkpoint file (default "data/processed/shot_ingest_checkpoint.json").
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from typing import Callable, List, Optional
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from qdrant_client import QdrantClient, models
+
+from backend.core.local_embeddings import (
+    EMBEDDING_MODEL,
+    document_text,
+    encode_with_model,
+)
+from backend.core.logging_config import logger
+from backend.core.qdrant import (
+    SHOT_COLLECTION_NAME,
+    SHOT_PAYLOAD_INDEXES,
+    ensure_shot_payload_indexes,
+    get_qdrant_client,
+)
+from backend.core.shot_data import SHOT_DATA_CSV, shot_payloads
+from backend.core.shot_index import (
+    QUANTIZATION_MODES,
+    SHOT_QUANTIZATION,
+    qdrant_quantization_config,
+)
+
+load_dotenv()
+
+INGEST_CHUNK_SIZE = int(os.getenv("INGEST_CHUNK_SIZE", "10000"))
+INGEST_ENCODE_BATCH_SIZE = int(os.getenv("INGEST_ENCODE_BATCH_SIZE", "256"))
+INGEST_UPSERT_BATCH_SIZE = int(os.getenv("INGEST_UPSERT_BATCH_SIZE", "256"))
+INGEST_CHECKPOINT_PATH = os.getenv(
+    "INGEST_CHECKPOINT_PATH", "data/processed/shot_ingest_checkpoint.json"
+)
+RETRIEVE_BATCH_SIZE = 1000
+
+# Fixed namespace so the same CSV row always maps to the same point ID
+SHOT_ID_NAMESPACE = uuid.UUID("5b0d1f5e-8c52-4f0a-9a55-3f6c2e0f7d41")
+
+
+def shot_point_id(row: int) -> str:
+    """Deterministic point ID for the shot on data row ``row`` (0-based) of the CSV."""
+    return str(uuid.uuid5(SHOT_ID_NAMESPACE, f"row:{row}"))
+
+
+def content_hash(text: str, model_name: Optional[str] = None) -> str:
+    """Hash of what a shot's vector is computed from: the model and the text."""
+    model_name = model_name or EMBEDDING_MODEL
+    return hashlib.sha1(
+        f"{model_name}\n{document_text(text, model_name)}".encode()
+    ).hexdigest()
+
+
+def encode_documents(texts: List[str]) -> np.ndarray:
+    """Normalized embeddings of stored shot texts (runs in worker processes too)."""
+    return np.asarray(
+        encode_with_model([document_text(t) for t in texts], normalize=True),
+        dtype=np.float32,
+    )
+
+
+@dataclass
+class IngestCheckpoint:
+    """Progress of a CSV ingestion; rows before ``rows_done`` are stored."""
+    csv_path: str
+    collection_name: str
+    model: str
+    rows_done: int = 0
+
+    @classmethod
+    def load(
+        cls, path: str, csv_path: str, collection_name: str, model: str
+    ) -> "IngestCheckpoint":
+        """The saved checkpoint for this run, or a fresh one if none matches."""
+        fresh = cls(os.path.abspath(csv_path), collection_name, model)
+        if path and os.path.exists(path):
+            with open(path) as f:
+                saved = cls(**json.load(f))
+            if (saved.csv_path, saved.collection_name, saved.model) == (
+                fresh.csv_path,
+                collection_name,
+                model,
+            ):
+                return saved
+            logger.info(
+                f"Ignoring checkpoint {path}: "
+                "it belongs to a different CSV, collection or model"
+            )
+        return fresh
+
+    def save(self, path: str) -> None:
+        if not path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(asdict(self), f)
+        os.replace(tmp_path, path)
+
+
+def ensure_collection(
+    client: QdrantClient,
+    collection_name: str,
+    dim: Optional[int] = None,
+    recreate: bool = False,
+    quantization: str = SHOT_QUANTIZATION,
+) -> None:
+    """
+    Create the cosine collection (and its payload indexes) if it does not exist.
+
+    With ``quantization`` other than "none", the quantized vectors are kept in
+    RAM and the originals on disk for rescoring; an existing collection is
+    switched to that quantization.
+    """
+    quantization_config = qdrant_quantization_config(quantization)
+    if recreate and client.collection_exists(collection_name):
+        client.delete_collection(collection_name)
+    if not client.collection_exists(collection_name):
+        client.create_collection(
+            collection_name=collection_name,
+            vectors_config=models.VectorParams(
+                size=dim,
+                distance=models.Distance.COSINE,
+                on_disk=quantization_config is not None,
+            ),
+            quantization_config=quantization_config,
+        )
+        logger.info(
+            f"Created collection {collection_name} "
+            f"({dim} dims, quantization={quantization})"
+        )
+    elif quantization_config is not None:
+        if (
+            client.get_collection(collection_name).config.quantization_config
+            != quantization_config
+        ):
+            client.update_collection(
+                collection_name=collection_name, quantization_config=quantization_config
+            )
+            logger.info(
+                f"Switched collection {collection_name} to {quantization} quantization"
+            )
+    ensure_shot_payload_indexes(collection_name, client)
+
+
+def stored_content_hashes(
+    client: QdrantClient, collection_name: str, ids: List[str]
+) -> dict:
+    """
+    ``content_hash`` of the points among ``ids`` already stored in the collection.
+
+    Points stored without one of the filterable payload fields (ingested before
+    the field existed) are left out, so they are rewritten like new rows.
+    """
+    fields = ["content_hash", *SHOT_PAYLOAD_INDEXES]
+    found = {}
+    for start in range(0, len(ids), RETRIEVE_BATCH_SIZE):
+        records = client.retrieve(
+            collection_name=collection_name, ids=ids[start:start + RETRIEVE_BATCH_SIZE],
+            with_payload=fields, with_vectors=False,
+        )
+        for record in records:
+            payload = record.payload or {}
+            if all(field in payload for field in fields):
+                found[str(record.id)] = payload["content_hash"]
+    return found
+
+
+def delete_rows_from(client: QdrantClient, collection_name: str, row: int) -> None:
+    """Delete the points of CSV rows ``row`` and later (rows no longer in the CSV)."""
+    client.delete(
+        collection_name=collection_name,
+        points_selector=models.FilterSelector(
+            filter=models.Filter(
+                must=[models.FieldCondition(key="row", range=models.Range(gte=row))]
+            )
+        ),
+        wait=True,
+    )
+
+
+def ingest_shots(
+    csv_path: str = SHOT_DATA_CSV,
+    collection_name: Optional[str] = None,
+    chunk_size: int = INGEST_CHUNK_SIZE,
+    encode_batch_size: int = INGEST_ENCODE_BATCH_SIZE,
+    upsert_batch_size: int = INGEST_UPSERT_BATCH_SIZE,
+    workers: int = 1,
+    upsert_workers: int = 4,
+    checkpoint_path: Optional[str] = INGEST_CHECKPOINT_PATH,
+    recreate: bool = False,
+    quantization: str = SHOT_QUANTIZATION,
+    client: Optional[QdrantClient] = None,
+    encode: Callable[[List[str]], np.ndarray] = encode_documents,
+) -> dict:
+    """
+    Embed and upsert the shots of a CSV into Qdrant, chunk by chunk.
+
+    Parameters
+    ----------
+    csv_path : str
+        Cleaned shot CSV (same columns as ``cleaned_shot_data.csv``).
+    collection_name : str, optional
+        Target collection (default ``QDRANT_COLLECTION_NAME``).
+    chunk_size, encode_batch_size, upsert_batch_size : int
+        Rows per CSV chunk, texts per encode call and points per upsert.
+    workers : int
+        Encoding processes; 1 encodes in this process with the shared model.
+    upsert_workers : int
+        Concurrent upsert requests.
+    checkpoint_path : str, optional
+        Where progress is saved; None disables checkpointing.
+    recreate : bool
+        Drop the collection and the checkpoint first.
+    quantization : str
+        "none", "scalar" or "binary" vector quantization for the collection.
+    client : QdrantClient, optional
+        Client to use (default: the shared client).
+    encode : callable
+        ``encode(texts) -> array``; must be picklable when ``workers > 1``.
+
+    Returns
+    -------
+    dict
+        Counts of rows read, rows skipped as unchanged, points embedded and
+        stored, and seconds taken.
+        Points of rows past the end of the CSV are deleted at the end of the run.
+    """
+    collection_name = collection_name or SHOT_COLLECTION_NAME
+    client = client or get_qdrant_client()
+    if recreate and checkpoint_path and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    checkpoint = IngestCheckpoint.load(
+        checkpoint_path, csv_path, collection_name, EMBEDDING_MODEL
+    )
+    if checkpoint.rows_done:
+        logger.info(
+            f"Resuming ingestion of {csv_path} after row {checkpoint.rows_done}"
+        )
+
+    stats = {"rows": 0, "unchanged": 0, "embedded": 0, "upserted": 0, "seconds": 0.0}
+    start = time.perf_counter()
+    collection_ready = not recreate and client.collection_exists(collection_name)
+    if collection_ready:
+        # Existing collections pick up quantization changes and missing payload indexes
+        ensure_collection(client, collection_name, quantization=quantization)
+    encoder_pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    upsert_pool = ThreadPoolExecutor(
+        max_workers=upsert_workers, thread_name_prefix="shot-upsert"
+    )
+    pending = None  # (rows_done, upsert futures) of the previous chunk
+
+    def finish(previous) -> None:
+        rows_done, futures = previous
+        wait(futures)
+        for future in futures:
+            future.result()  # surface upsert errors before recording progress
+        checkpoint.rows_done = rows_done
+        checkpoint.save(checkpoint_path)
+
+    try:
+        chunks = pd.read_csv(
+            csv_path, chunksize=chunk_size, skiprows=range(1, checkpoint.rows_done + 1)
+        )
+        rows_done = checkpoint.rows_done
+        for chunk in chunks:
+            payloads = {
+                shot_point_id(row): {
+                    **payload,
+                    "row": row,
+                    "content_hash": content_hash(payload["text"]),
+                }
+                for row, payload in enumerate(shot_payloads(chunk), start=rows_done)
+            }
+            rows_done += len(chunk)
+            stats["rows"] += len(chunk)
+            stored = (
+                stored_content_hashes(client, collection_name, list(payloads))
+                if collection_ready
+                else {}
+            )
+            new_ids = [
+                point_id
+                for point_id, p in payloads.items()
+                if stored.get(point_id) != p["content_hash"]
+            ]
+            stats["unchanged"] += len(chunk) - len(new_ids)
+
+            batches = [
+                new_ids[i : i + encode_batch_size]
+                for i in range(0, len(new_ids), encode_batch_size)
+            ]
+            texts = [
+                [payloads[point_id]["text"] for point_id in batch] for batch in batches
+            ]
+            encoded = (
+                encoder_pool.map(encode, texts) if encoder_pool else map(encode, texts)
+            )
+            points = []
+            for batch, vectors in zip(batches, encoded):
+                if not collection_ready:
+                    ensure_collection(
+                        client, collection_name, len(vectors[0]), recreate, quantization
+                    )
+                    collection_ready = True
+                points.extend(
+                    models.PointStruct(
+                        id=point_id, vector=vector.tolist(), payload=payloads[point_id]
+                    )
+                    for point_id, vector in zip(batch, vectors)
+                )
+            stats["embedded"] += len(points)
+
+            # Store the previous chunk's progress while this chunk's upserts run
+            futures = [
+                upsert_pool.submit(
+                    client.upsert,
+                    collection_name=collection_name,
+                    points=points[i : i + upsert_batch_size],
+                    wait=True,
+                )
+                for i in range(0, len(points), upsert_batch_size)
+            ]
+            if pending:
+                finish(pending)
+            pending = (rows_done, futures)
+            stats["upserted"] += len(points)
+            logger.info(
+                f"Ingested {rows_done} rows ({stats['embedded']} embedded, "
+                f"{stats['unchanged']} unchanged)"
+            )
+        if pending:
+            finish(pending)
+        if collection_ready:
+            delete_rows_from(client, collection_name, rows_done)
+    finally:
+        upsert_pool.shutdown(wait=True)
+        if encoder_pool:
+            encoder_pool.shutdown()
+    stats["seconds"] = round(time.perf_counter() - start, 2)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Stream shot data from a CSV into the Qdrant collection"
+    )
+    parser.add_argument("--csv", default=SHOT_DATA_CSV, help="cleaned shot data CSV")
+    parser.add_argument(
+        "--collection",
+        default=None,
+        help="collection name (default QDRANT_COLLECTION_NAME)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=INGEST_CHUNK_SIZE)
+    parser.add_argument(
+        "--encode-batch-size", type=int, default=INGEST_ENCODE_BATCH_SIZE
+    )
+    parser.add_argument(
+        "--upsert-batch-size", type=int, default=INGEST_UPSERT_BATCH_SIZE
+    )
+    parser.add_argument("--workers", type=int, default=1, help="encoding processes")
+    parser.add_argument(
+        "--upsert-workers", type=int, default=4, help="concurrent upsert requests"
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=INGEST_CHECKPOINT_PATH,
+        help="checkpoint file ('' to disable)",
+    )
+    parser.add_argument(
+        "--recreate",
+        action="store_true",
+        help="drop the collection and checkpoint first",
+    )
+    parser.add_argument(
+        "--quantization", choices=QUANTIZATION_MODES, default=SHOT_QUANTIZATION
+    )
+    args = parser.parse_args()
+    result = ingest_shots(
+        csv_path=args.csv,
+        collection_name=args.collection,
+        chunk_size=args.chunk_size,
+        encode_batch_size=args.encode_batch_size,
+        upsert_batch_size=args.upsert_batch_size,
+        workers=args.workers,
+        upsert_workers=args.upsert_workers,
+        checkpoint_path=args.checkpoint or None,
+        recreate=args.recreate,
+        quantization=args.quantization,
+    )
+    print(json.dumps(result))
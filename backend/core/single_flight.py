@@ -0,0 +1,155 @@
+"""
+Single-flight coalescing of identical concurrent work.
+
+When several callers ask for the same key while a call is already in flight,
+they all wait on that one execution instead of starting their own. Streams are
+coalesced too: late joiners replay the events emitted so far and then follow
+the live stream.
+
+The shared work runs in its own task, so a caller that disconnects does not
+cancel the execution the other callers are waiting on.
+"""
+
+import asyncio
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+)
+
+
+class _Broadcast:
+    """Events from one producer stream, replayable by any number of subscribers."""
+
+    def __init__(self):
+        self.events: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.condition = asyncio.Condition()
+        self.task: Optional[asyncio.Task] = None
+
+    async def pump(self, source: AsyncIterator) -> None:
+        try:
+            async for event in source:
+                async with self.condition:
+                    self.events.append(event)
+                    self.condition.notify_all()
+        except Exception as e:
+            self.error = e
+        finally:
+            async with self.condition:
+                self.done = True
+                self.condition.notify_all()
+
+    async def subscribe(self) -> AsyncIterator:
+        index = 0
+        while True:
+            async with self.condition:
+                await self.condition.wait_for(
+                    lambda index=index: len(self.events) > index or self.done
+                )
+                batch = self.events[index:]
+                index = len(self.events)
+                finished = self.done
+            for event in batch:
+                yield event
+            if finished:
+                if self.error is not None:
+                    raise self.error
+                return
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key.
+
+    Attributes
+    ----------
+    stats : dict
+        ``executions`` counts calls that actually ran; ``coalesced`` counts callers
+        that joined an execution already in flight.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self._streams: Dict[Hashable, _Broadcast] = {}
+        self.stats = {"executions": 0, "coalesced": 0}
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``factory()`` once per key at a time and share its result.
+
+        Parameters
+        ----------
+        key : hashable
+            Identifies equivalent work.
+        factory : callable
+            Returns the coroutine to run when no call for ``key`` is in flight.
+
+        Returns
+        -------
+        Any
+            The shared result; exceptions propagate to every waiter.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            self.stats["executions"] += 1
+            task = asyncio.ensure_future(factory())
+            self._calls[key] = task
+            task.add_done_callback(lambda finished: self._forget_call(key, finished))
+        else:
+            self.stats["coalesced"] += 1
+        # Shield so one cancelled waiter does not cancel the shared execution
+        return await asyncio.shield(task)
+
+    async def stream(
+        self, key: Hashable, factory: Callable[[], AsyncIterator]
+    ) -> AsyncIterator:
+        """
+        Share one async event stream between all concurrent subscribers of a key.
+
+        Parameters
+        ----------
+        key : hashable
+            Identifies equivalent streams.
+        factory : callable
+            Returns the async iterator to consume when no stream for ``key`` is
+            in flight.
+
+        Yields
+        ------
+        Any
+            Every event of the shared stream, from the beginning.
+        """
+        broadcast = self._streams.get(key)
+        if broadcast is None:
+            self.stats["executions"] += 1
+            broadcast = _Broadcast()
+            self._streams[key] = broadcast
+            broadcast.task = asyncio.ensure_future(broadcast.pump(factory()))
+            broadcast.task.add_done_callback(
+                lambda _: self._forget_stream(key, broadcast)
+            )
+        else:
+            self.stats["coalesced"] += 1
+        async for event in broadcast.subscribe():
+            yield event
+
+    def in_flight(self) -> int:
+        return len(self._calls) + len(self._streams)
+
+    def _forget_stream(self, key: Hashable, broadcast: _Broadcast) -> None:
+        if self._streams.get(key) is broadcast:
+            del self._streams[key]
+
+    def _forget_call(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every waiter went away
+            task.exception()
@@ -1,18 +1,85 @@
-import os
 import json
+import os
+from contextlib import asynccontextmanager
+
+from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from starlette.requests import Request
+
+from backend.agents.graph_registry import graph_registry
+from backend.agents.local_router import LOCAL_ROUTER_ENABLED, local_router
 from backend.api import router as api_router
+from backend.core.executors import run_blocking, shutdown_tool_executor
+from backend.core.llm_clients import aclose_llm_clients
+from backend.core.local_embeddings import (
+    EMBEDDING_PRELOAD,
+    embedding_batcher,
+    warm_up_sentence_model,
+)
 from backend.core.logging_config import logger
-from dotenv import load_dotenv
-from starlette.requests import Request
+from backend.core.qdrant import aclose_qdrant_clients
+from backend.core.shot_analytics import SHOT_ANALYTICS_ENABLED, get_shot_analytics
+from backend.core.shot_bm25 import SHOT_HYBRID_SEARCH, get_shot_lexical_index
+from backend.core.shot_index import SHOT_INDEX_BACKEND, get_local_shot_index
 
 load_dotenv()
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Compile the agent graph once; every /api/query request shares it
+    graph_registry.build()
+    if EMBEDDING_PRELOAD:
+        # Load the shared embedding model before serving so no request pays for it
+        try:
+            await run_blocking(warm_up_sentence_model)
+        except Exception:
+            logger.warning(
+                "Embedding model warm-up failed; it will load on first use",
+                exc_info=True,
+            )
+    if SHOT_INDEX_BACKEND == "local":
+        try:
+            await run_blocking(get_local_shot_index)
+        except Exception:
+            logger.warning(
+                "Could not load the local shot index; shot recommendations will fail",
+                exc_info=True,
+            )
+    if SHOT_HYBRID_SEARCH:
+        try:
+            await run_blocking(get_shot_lexical_index)
+        except Exception:
+            logger.warning(
+                "Could not build the BM25 shot index; "
+                "shot search will use dense results only",
+                exc_info=True,
+            )
+    if SHOT_ANALYTICS_ENABLED:
+        try:
+            await run_blocking(get_shot_analytics)
+        except Exception:
+            logger.warning(
+                "Could not load the shot analytics; "
+                "aggregate questions will use shot search",
+                exc_info=True,
+            )
+    if LOCAL_ROUTER_ENABLED:
+        try:
+            await run_blocking(local_router.warm_up)
+        except Exception:
+            logger.warning(
+                "Local router warm-up failed; routing with the LLM only", exc_info=True
+            )
+    yield
+    graph_registry.clear()
+    shutdown_tool_executor(wait=False)
+    embedding_batcher.close()
+    await aclose_llm_clients()
+    await aclose_qdrant_clients()
 
-from starlette.requests import Request
+app = FastAPI(lifespan=lifespan)
 
 @app.middleware("http")
 async def log_request_origin(request: Request, call_next):
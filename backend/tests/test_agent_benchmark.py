@@ -0,0 +1,33 @@
+import pytest
+
+from backend.benchmarks.agent_benchmark import run_benchmark, summarize_latencies
+from backend.benchmarks.fakes import UpstreamProfile
+
+
+def test_summarize_latencies():
+    stats = summarize_latencies([0.01] * 99 + [0.5], wall_seconds=1.0, errors=1)
+    assert stats["requests"] == 101
+    assert stats["throughput_rps"] == 100.0
+    assert stats["p50_ms"] == 10.0
+    assert stats["p99_ms"] > stats["p95_ms"]
+
+@pytest.mark.asyncio
+async def test_run_benchmark_graph_reports_each_route():
+    profile = UpstreamProfile(
+        llm_latency=0,
+        llm_token_delay=0,
+        tavily_latency=0,
+        golfcourse_latency=0,
+        qdrant_latency=0,
+        encode_latency=0,
+    )
+    report = await run_benchmark(
+        mode="graph", requests=3, concurrency=2, profile=profile
+    )
+
+    for route, stats in report["routes"].items():
+        assert stats["errors"] == 0
+        assert {"router", route} <= set(stats["nodes"])
+    # Stats are rendered from a template; everything else is summarized
+    assert "summarize" not in report["routes"]["get_pro_stats"]["nodes"]
+    assert "summarize" in report["routes"]["search_golfpedia"]["nodes"]
@@ -0,0 +1,92 @@
+import numpy as np
+
+from backend.agents.context_compression import (
+    ContextCompressor,
+    estimate_tokens,
+    split_records,
+    split_sentences,
+)
+
+VOCAB = ["flop", "shot", "wedge", "open", "history", "scotland", "putter"]
+
+def fake_encode(texts):
+    """Bag-of-words embedding over a tiny vocabulary, L2-normalized."""
+    vectors = []
+    for text in texts:
+        words = text.lower().replace("?", "").replace(".", "").split()
+        vector = np.array([float(word in words) for word in VOCAB])
+        norm = np.linalg.norm(vector)
+        vectors.append(vector / norm if norm else vector)
+    return np.array(vectors, dtype=np.float32)
+
+RESULT = """Here are some relevant search results:
+
+1. Flop shot basics
+   Open the wedge face for a flop shot. Golf history began in Scotland. Open the wedge face for a flop shot today.
+   Source: https://example.com/flop
+
+2. Putting
+   Choose a putter on fast greens.
+"""
+
+def test_split_sentences_drops_exact_repeats_and_prefixes():
+    text = (
+        "Score: 0.9123 | Open the face. Swing hard.\nScore: 0.8 | Open the face.\n2. Tips"
+    )
+    assert split_sentences(text) == ["Open the face.", "Swing hard.", "Tips"]
+
+def test_compress_keeps_relevant_sentences_in_order():
+    compressor = ContextCompressor(
+        route_budgets={"search_golfpedia": 24}, encode=fake_encode
+    )
+    compressed = compressor.compress(
+        "How do I hit a flop shot with an open wedge?", RESULT, "search_golfpedia"
+    )
+
+    lines = compressed.splitlines()
+    assert lines[0] == "Flop shot basics"
+    # The two "Open the wedge face" sentences are near-duplicates, so only one is kept
+    assert sum(line.startswith("Open the wedge face") for line in lines) == 1
+    # The kept sentences' result is still cited
+    assert lines[-1] == "Source: https://example.com/flop"
+    # Irrelevant sentences are dropped even though budget remains
+    assert "history" not in compressed and "Putting" not in compressed
+    assert estimate_tokens(compressed) <= 24
+    assert compressor.stats["compressed"] == 1
+
+def shot(club, shape):
+    return (
+        f"On 2024-05-01, the golfer hit a shot 100 yards with a carry of 95 yards "
+        f"using a {club}. "
+        f"The shot was classified as {shape}. "
+        "The known contributing factors to this result were: "
+        "Ball speed: 80 mph. Club speed: 70 mph. Spin rate: 9000 rpm. "
+        "Attack angle: -4 degrees. Descent angle: 50 degrees."
+    )
+
+def test_compress_keeps_whole_scored_records():
+    shots = [
+        shot("Pitching Wedge", "Slice"),
+        shot("Driver", "Slice"),
+        shot("Sand Wedge", "Draw"),
+        shot("Driver", "Fade"),
+    ]
+    result = "\n".join(f"Score: 0.{9 - i}000 | {text}" for i, text in enumerate(shots))
+    assert split_records(result) == shots
+    assert split_records(RESULT) is None
+
+    compressor = ContextCompressor(
+        route_budgets={"get_shot_recommendations": 200}, encode=fake_encode
+    )
+    compressed = compressor.compress(
+        "Which wedge shot?", result, "get_shot_recommendations"
+    )
+    # The two wedge shots are kept intact, metrics included, in their original order
+    assert compressed.splitlines() == [shots[0], shots[2]]
+
+def test_compress_passes_through_short_and_exempt_routes():
+    compressor = ContextCompressor(
+        route_budgets={"get_pro_stats": None}, default_budget=10_000, encode=fake_encode
+    )
+    assert compressor.compress("flop shot", RESULT, "search_golfpedia") == RESULT
+    assert compressor.compress("flop shot", RESULT * 50, "get_pro_stats") == RESULT * 50
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from backend.core import local_embeddings
+from backend.core.embedding_batcher import EmbeddingBatcher
+from backend.core.embedding_cache import EmbeddingCache
+
+
+class RecordingEncoder:
+    """Fake encode that records batch sizes and embeds text i as [len(text), 0]."""
+
+    def __init__(self, delay: float = 0.0):
+        self.batches = []
+        self.delay = delay
+
+    def __call__(self, texts):
+        self.batches.append(len(texts))
+        time.sleep(self.delay)
+        return np.array([[float(len(text)), 0.0] for text in texts])
+
+@pytest.fixture
+def encoder():
+    return RecordingEncoder(delay=0.01)
+
+@pytest.fixture
+def batcher(encoder):
+    batcher = EmbeddingBatcher(encoder, max_batch_size=8, window_ms=20)
+    yield batcher
+    batcher.close()
+
+def test_concurrent_requests_share_batches(batcher, encoder):
+    texts = [f"query {'x' * i}" for i in range(16)]
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(
+            pool.map(lambda text: batcher.encode([text], normalize=False), texts)
+        )
+    assert [result[0][0] for result in results] == [float(len(text)) for text in texts]
+    assert sum(encoder.batches) == 16
+    assert len(encoder.batches) < 16
+    assert max(encoder.batches) <= 8
+    assert batcher.stats == {
+        "requests": 16,
+        "texts": 16,
+        "batches": len(encoder.batches),
+    }
+
+def test_rows_are_normalized_per_request(batcher):
+    first = batcher.submit(["abcd"], normalize=True)
+    second = batcher.submit(["abcd", "ab"], normalize=False)
+    assert np.allclose(first.result(), [[1.0, 0.0]])
+    assert np.allclose(second.result(), [[4.0, 0.0], [2.0, 0.0]])
+
+@pytest.mark.asyncio
+async def test_aencode_and_errors_reach_every_caller():
+    def failing(texts):
+        raise RuntimeError("model unavailable")
+
+    batcher = EmbeddingBatcher(failing, max_batch_size=8, window_ms=10)
+    try:
+        results = await asyncio.gather(
+            batcher.aencode(["a"]), batcher.aencode(["b"]), return_exceptions=True
+        )
+        assert all(isinstance(result, RuntimeError) for result in results)
+    finally:
+        batcher.close()
+
+def test_encode_texts_batches_cache_misses(monkeypatch, encoder):
+    batcher = EmbeddingBatcher(encoder, max_batch_size=32, window_ms=20)
+    monkeypatch.setattr(local_embeddings, "embedding_batcher", batcher)
+    monkeypatch.setattr(local_embeddings, "EMBEDDING_BATCHING_ENABLED", True)
+    monkeypatch.setattr(
+        local_embeddings, "embedding_cache", EmbeddingCache(max_entries=100, path=None)
+    )
+    try:
+        barrier = threading.Barrier(8)
+        def encode(i):
+            barrier.wait()
+            return local_embeddings.encode_texts([f"shot query {i}"])
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(encode, range(8)))
+        assert all(result.shape == (1, 2) for result in results)
+        assert len(encoder.batches) < 8
+        # Cached texts never wait for a batch
+        local_embeddings.encode_texts(["shot query 0"])
+        assert sum(encoder.batches) == 8
+    finally:
+        batcher.close()
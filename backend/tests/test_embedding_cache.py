@@ -0,0 +1,35 @@
+import numpy as np
+
+from backend.core.embedding_cache import EmbeddingCache
+
+
+def test_lru_eviction():
+    cache = EmbeddingCache(max_entries=2, path=None)
+    cache.put("model", "a", [1.0, 0.0])
+    cache.put("model", "b", [0.0, 1.0])
+    assert cache.get("model", "a") is not None  # "a" is now most recent
+    cache.put("model", "c", [1.0, 1.0])
+
+    assert cache.get("model", "b") is None
+    assert cache.get("model", "a") is not None
+    assert cache.snapshot()["entries"] == 2
+
+def test_keys_include_model_and_normalization():
+    cache = EmbeddingCache(path=None)
+    cache.put("gte-small", "flop  shot", [1.0, 2.0])
+    assert np.array_equal(cache.get("gte-small", " flop shot "), [1.0, 2.0])
+    assert cache.get("bge-base", "flop shot") is None
+    assert cache.get("gte-small", "flop shot", normalized=False) is None
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite")
+    EmbeddingCache(path=path).put(
+        "model", "flop shot", np.array([0.5, 0.25], dtype=np.float32)
+    )
+
+    restarted = EmbeddingCache(path=path)
+    vector = restarted.get("model", "flop shot")
+    assert np.array_equal(vector, [0.5, 0.25])
+    assert restarted.stats["disk_hits"] == 1
+    restarted.get("model", "flop shot")
+    assert restarted.stats["hits"] == 1
@@ -1,6 +1,6 @@
 import pytest
 from unittest.mock import patch
-from backend.tools.get_pro_stats_tool import get_pro_stats
+from backend.tools.get_pro_stats_tool import get_pro_stats, render_pro_stats_answer
 
 @pytest.fixture
 def mock_logger():
@@ -85,4 +85,35 @@ def test_get_pro_stats_empty_query(mock_logger):
     result = get_pro_stats.invoke("")
     
     assert "Could not determine which stat to compare" in result
-    mock_logger.debug.assert_called_once() 
\ No newline at end of file
+    mock_logger.debug.assert_called_once()
+
+def test_render_pro_stats_answer_comparison(mock_logger):
+    """The direct answer ranks the players and names the leader."""
+    query = "Compare putting between Rory McIlroy and Scottie Scheffler"
+    answer = render_pro_stats_answer(query, get_pro_stats.invoke(query))
+
+    assert answer.startswith(
+        "SG Putting comparison:\n- Scottie Scheffler: 0.73\n- Rory McIlroy: 0.19"
+    )
+    assert (
+        "Scottie Scheffler leads on SG Putting (0.73 vs 0.19 for Rory McIlroy)."
+        in answer
+    )
+
+def test_render_pro_stats_answer_falls_back_when_unresolved(mock_logger):
+    """Queries the tool cannot resolve are left to the summarizer."""
+    assert (
+        render_pro_stats_answer(
+            "What is Tiger Woods' putting?", "Please specify at least one known player."
+        )
+        is None
+    )
+    query = "Compare driving accuracy for Jon Rahm and Rory McIlroy"
+    assert render_pro_stats_answer(query, get_pro_stats.invoke(query)) is None
+
+def test_render_pro_stats_answer_follows_the_tool_result():
+    """The answer is rendered from the tool's output, not re-derived from the query."""
+    answer = render_pro_stats_answer(
+        "What is Rory McIlroy's putting?", "SG Putting for Jon Rahm: Jon Rahm: 0.45"
+    )
+    assert answer == "Jon Rahm's SG Putting is 0.45."
@@ -1,7 +1,16 @@
 import pytest
 import asyncio
-from unittest.mock import patch, MagicMock
-from backend.agents.golf_langgraph import route_with_llm, AgentState, tool_map
+from unittest.mock import patch, MagicMock, AsyncMock
+from backend.agents.golf_langgraph import (
+    route_with_llm,
+    AgentState,
+    tool_map,
+    astream_agent_events,
+    arun_batch,
+    parse_route,
+    wrap_tool,
+)
+from backend.agents.graph_registry import GraphRegistry, graph_registry
 
 # Create a mock graph that we can use for testing
 @pytest.fixture
@@ -12,7 +21,7 @@ def mock_graph():
         query = input_dict.get("input", "")
         
         # Determine which tool to use based on the query
-        tool_name = route_with_llm({"input": query})["next"]
+        tool_name = (await route_with_llm({"input": query}))["next"]
         
         # Return a mock result
         return {
@@ -30,7 +39,8 @@ def mock_llm():
     """Mock the LLM to avoid actual API calls."""
     with patch('backend.agents.golf_langgraph.get_llm') as mock:
         mock_llm = MagicMock()
-        mock_llm.invoke.return_value.content = "This is a mock summary response."
+        mock_llm.ainvoke = AsyncMock()
+        mock_llm.ainvoke.return_value.content = "This is a mock summary response."
         mock.return_value = mock_llm
         yield mock
 
@@ -51,9 +61,10 @@ def mock_tools():
 async def test_graph_pro_stats_query(mock_graph):
     """Test the graph with a pro stats query."""
     # Patch the graph and get_llm with our mocks
-    with patch('backend.agents.golf_langgraph.graph', mock_graph), \
+    with patch.object(graph_registry, '_graph', mock_graph), \
          patch('backend.agents.golf_langgraph.get_llm') as mock_llm:
-        mock_llm.return_value.invoke.return_value.content = "get_pro_stats"
+        mock_llm.return_value.ainvoke = AsyncMock()
+        mock_llm.return_value.ainvoke.return_value.content = "get_pro_stats"
         result = await mock_graph.ainvoke({"input": "Compare Scottie Scheffler and Rory McIlroy in putting"})
         # Check the final response
         assert result["final_response"] == "This is a mock summary response for Compare Scottie Scheffler and Rory McIlroy in putting"
@@ -62,9 +73,10 @@ async def test_graph_pro_stats_query(mock_graph):
 @pytest.mark.asyncio
 async def test_graph_course_insights_query(mock_graph):
     """Test the graph with a course insights query."""
-    with patch('backend.agents.golf_langgraph.graph', mock_graph), \
+    with patch.object(graph_registry, '_graph', mock_graph), \
          patch('backend.agents.golf_langgraph.get_llm') as mock_llm:
-        mock_llm.return_value.invoke.return_value.content = "course_insights"
+        mock_llm.return_value.ainvoke = AsyncMock()
+        mock_llm.return_value.ainvoke.return_value.content = "course_insights"
         result = await mock_graph.ainvoke({"input": "What is the course layout at Pine Valley?"})
         # Check the final response
         assert result["final_response"] == "This is a mock summary response for What is the course layout at Pine Valley?"
@@ -73,36 +85,184 @@ async def test_graph_course_insights_query(mock_graph):
 @pytest.mark.asyncio
 async def test_graph_search_golfpedia_query(mock_graph):
     """Test the graph with a search golfpedia query."""
-    with patch('backend.agents.golf_langgraph.graph', mock_graph), \
+    with patch.object(graph_registry, '_graph', mock_graph), \
          patch('backend.agents.golf_langgraph.get_llm') as mock_llm:
-        mock_llm.return_value.invoke.return_value.content = "search_golfpedia"
+        mock_llm.return_value.ainvoke = AsyncMock()
+        mock_llm.return_value.ainvoke.return_value.content = "search_golfpedia"
         result = await mock_graph.ainvoke({"input": "What is the history of golf?"})
         # Check the final response
         assert result["final_response"] == "This is a mock summary response for What is the history of golf?"
         assert result["tool_result"] == "Mock result for search_golfpedia"
 
-def test_route_with_llm(mock_llm):
+@pytest.mark.asyncio
+async def test_route_with_llm(mock_llm):
     """Test the tool routing logic."""
     # Test pro stats route
     state = AgentState(input="Compare Scottie Scheffler and Rory McIlroy in putting")
-    mock_llm.return_value.invoke.return_value.content = "get_pro_stats"
-    assert route_with_llm(state)["next"] == "get_pro_stats"
+    mock_llm.return_value.ainvoke.return_value.content = "get_pro_stats"
+    assert (await route_with_llm(state))["next"] == "get_pro_stats"
     
     # Test course insights route - update to match current implementation
     state = AgentState(input="Tell me about Pine Valley Golf Club")
-    mock_llm.return_value.invoke.return_value.content = "search_golfpedia"
-    assert route_with_llm(state)["next"] == "search_golfpedia"
+    mock_llm.return_value.ainvoke.return_value.content = "search_golfpedia"
+    assert (await route_with_llm(state))["next"] == "search_golfpedia"
     
     # Test course insights route with a query that should match
     state = AgentState(input="What is the course layout at Pine Valley?")
-    mock_llm.return_value.invoke.return_value.content = "course_insights"
-    assert route_with_llm(state)["next"] == "course_insights"
+    mock_llm.return_value.ainvoke.return_value.content = "course_insights"
+    assert (await route_with_llm(state))["next"] == "course_insights"
     
     # Test search golfpedia route
     state = AgentState(input="What is the history of golf?")
-    mock_llm.return_value.invoke.return_value.content = "search_golfpedia"
-    assert route_with_llm(state)["next"] == "search_golfpedia"
+    mock_llm.return_value.ainvoke.return_value.content = "search_golfpedia"
+    assert (await route_with_llm(state))["next"] == "search_golfpedia"
     
     # Test error handling
     with pytest.raises(ValueError):
-        route_with_llm(AgentState()) 
\ No newline at end of file
+        await route_with_llm(AgentState())
+
+@pytest.mark.parametrize(
+    "content,expected",
+    [
+        ('{"tool": "get_pro_stats", "args": {}}', ("get_pro_stats", None)),
+        (
+            '```json\n{"tool": "get_shot_recommendations", "args": {"distance": 150, "club": "7 iron"}}\n```',
+            ("get_shot_recommendations", {"distance": 150, "club": "7 iron"}),
+        ),
+        ("search_golfpedia", ("search_golfpedia", None)),
+    ],
+)
+def test_parse_route(content, expected):
+    assert parse_route(content) == expected
+
+@pytest.mark.asyncio
+async def test_route_with_llm_returns_shot_intent(mock_llm):
+    """Shot queries get their structured intent from the routing call itself."""
+    intent = {"distance": 150, "intent": "avoid", "shape": "slice", "club": "7 iron"}
+    mock_llm.return_value.ainvoke.return_value.content = '{"tool": "get_shot_recommendations", "args": {"distance": 150, "intent": "avoid", "shape": "slice", "club": "7 iron"}}'
+    result = await route_with_llm(
+        AgentState(input="What club from 150 yards to avoid a slice?")
+    )
+    assert result == {"next": "get_shot_recommendations", "tool_args": intent}
+
+@pytest.mark.asyncio
+async def test_tool_node_uses_router_args():
+    """A structured tool receives the router's args instead of re-extracting them."""
+    structured = MagicMock(return_value="Score: 0.9 | 7 iron fade")
+    with patch.dict(
+        "backend.agents.golf_langgraph.structured_tools",
+        {"get_shot_recommendations": structured},
+    ):
+        node = wrap_tool("get_shot_recommendations")
+        state = AgentState(
+            input="150 yards, avoid a slice", tool_args={"distance": 150}
+        )
+        result = await node.ainvoke(state)
+    structured.assert_called_once_with("150 yards, avoid a slice", {"distance": 150})
+    assert result["tool_result"] == "Score: 0.9 | 7 iron fade"
+
+@pytest.mark.asyncio
+async def test_tool_node_direct_answer():
+    """Tools with a direct-answer template set the final response themselves."""
+    node = wrap_tool("get_pro_stats")
+    result = await node.ainvoke(
+        AgentState(input="Compare putting between Scottie Scheffler and Rory McIlroy")
+    )
+    assert "Scottie Scheffler leads on SG Putting" in result["final_response"]
+
+    unresolved = await node.ainvoke(AgentState(input="What is Tiger Woods' putting?"))
+    assert "final_response" not in unresolved
+
+def test_graph_registry_compiles_once():
+    """The registry compiles on first use and reuses the compiled graph."""
+    registry = GraphRegistry()
+    with patch('backend.agents.graph_registry.create_graph') as mock_create:
+        mock_create.side_effect = lambda: MagicMock()
+        first = registry.get()
+        second = registry.get()
+        assert first is second
+        assert mock_create.call_count == 1
+        assert registry.version == 1
+
+def test_graph_registry_rebuild():
+    """rebuild() recompiles and swaps in the new graph."""
+    registry = GraphRegistry()
+    with patch('backend.agents.graph_registry.create_graph') as mock_create:
+        mock_create.side_effect = lambda: MagicMock()
+        first = registry.build()
+        rebuilt = registry.rebuild()
+        assert rebuilt is not first
+        assert registry.get() is rebuilt
+        assert registry.version == 2
+
+@pytest.mark.asyncio
+async def test_astream_agent_events():
+    """Graph events are translated into progress, token and done events."""
+    chunk = MagicMock()
+    chunk.content = "Hello"
+    raw_events = [
+        {
+            "event": "on_chain_start",
+            "name": "router",
+            "metadata": {"langgraph_node": "router"},
+        },
+        {
+            "event": "on_chain_end",
+            "name": "router",
+            "metadata": {"langgraph_node": "router"},
+            "data": {"output": {"next": "get_pro_stats"}},
+        },
+        {
+            "event": "on_chat_model_stream",
+            "name": "ChatOpenAI",
+            "metadata": {"langgraph_node": "summarize"},
+            "data": {"chunk": chunk},
+        },
+        {
+            "event": "on_chain_end",
+            "name": "LangGraph",
+            "parent_ids": [],
+            "metadata": {},
+            "data": {"output": {"final_response": "Hello"}},
+        },
+    ]
+
+    async def fake_astream_events(payload, version):
+        for event in raw_events:
+            yield event
+
+    graph = MagicMock()
+    graph.astream_events = fake_astream_events
+    events = [event async for event in astream_agent_events(graph, "Compare putting")]
+
+    assert events[0] == {"type": "progress", "node": "router", "status": "start"}
+    assert events[1]["route"] == "get_pro_stats"
+    assert events[2] == {"type": "token", "content": "Hello"}
+    assert events[-1] == {"type": "done", "response": "Hello", "route": None}
+
+@pytest.mark.asyncio
+async def test_arun_batch_bounds_concurrency():
+    """Batch runs never exceed the concurrency limit and report every query."""
+    in_flight = 0
+    peak = 0
+
+    async def fake_invoke(query):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if query == "bad":
+            raise RuntimeError("boom")
+        return f"answer to {query}"
+
+    queries = [f"q{i}" for i in range(10)] + ["bad"]
+    results = [
+        result
+        async for result in arun_batch(queries, concurrency=3, invoke=fake_invoke)
+    ]
+
+    assert peak == 3
+    assert sorted(result["index"] for result in results) == list(range(11))
+    assert next(r for r in results if r["query"] == "bad")["error"] == "boom"
+    assert next(r for r in results if r["query"] == "q4")["response"] == "answer to q4"
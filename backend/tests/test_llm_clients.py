@@ -0,0 +1,30 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from backend.core.llm_clients import get_chat_llm, get_node_settings, get_openai_client
+
+
+@pytest.fixture(autouse=True)
+def fake_env():
+    """Mock the API key so clients can be constructed without a real one."""
+    with patch.dict(os.environ, {"OPENAI_API_KEY": "fake-api-key"}):
+        yield
+
+def test_node_defaults():
+    settings = get_node_settings("router")
+    assert settings.model == "gpt-4"
+    assert settings.temperature == 0.3
+
+def test_node_env_overrides():
+    with patch.dict(
+        os.environ, {"LLM_ROUTER_MODEL": "gpt-4o-mini", "LLM_ROUTER_TIMEOUT": "5"}
+    ):
+        settings = get_node_settings("router")
+    assert settings.model == "gpt-4o-mini"
+    assert settings.timeout == 5.0
+
+def test_clients_are_reused():
+    assert get_chat_llm("summarize") is get_chat_llm("summarize")
+    assert get_openai_client() is get_openai_client()
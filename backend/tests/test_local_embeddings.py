@@ -0,0 +1,64 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from backend.core import local_embeddings
+from backend.core.embedding_cache import EmbeddingCache
+
+
+class CountingModel:
+    """Fake SentenceTransformer that fails if two encodes overlap."""
+
+    def __init__(self):
+        self.active = 0
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def encode(self, texts, normalize_embeddings=True):
+        with self.lock:
+            self.active += 1
+            self.calls += 1
+            assert self.active == 1, "concurrent encode on the shared model"
+        time.sleep(0.005)
+        with self.lock:
+            self.active -= 1
+        return np.ones((len(texts), 4))
+
+@pytest.fixture
+def model(monkeypatch):
+    model = CountingModel()
+    monkeypatch.setattr(local_embeddings, "_model", model)
+    monkeypatch.setattr(local_embeddings, "_ready", threading.Event())
+    monkeypatch.setattr(
+        local_embeddings, "embedding_cache", EmbeddingCache(max_entries=100, path=None)
+    )
+    monkeypatch.setattr(local_embeddings, "EMBEDDING_BATCHING_ENABLED", False)
+    return model
+
+def test_warm_up_marks_model_ready(model):
+    assert not local_embeddings.is_sentence_model_ready()
+    local_embeddings.warm_up_sentence_model()
+    assert local_embeddings.is_sentence_model_ready()
+    assert model.calls == 1
+
+def test_concurrent_encodes_share_one_model(model):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(
+            pool.map(lambda i: local_embeddings.encode_texts([f"query {i}"]), range(16))
+        )
+    assert model.calls == 16
+    assert all(
+        result.shape == (1, 4) and result.dtype == np.float32 for result in results
+    )
+
+def test_repeat_texts_skip_the_model(model):
+    first = local_embeddings.encode_texts(["150 yards, 7 iron", "avoid a slice"])
+    second = local_embeddings.encode_texts(
+        ["avoid a slice", "150  yards, 7 iron", "new text"]
+    )
+    assert model.calls == 2  # only "new text" was encoded the second time
+    assert np.array_equal(second[0], first[1])
+    assert second.shape == (3, 4)
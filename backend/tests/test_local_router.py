@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from backend.agents.local_router import LocalRouter
+
+VOCAB = ["putting", "driving", "course", "slope", "club", "yards", "history", "rules"]
+
+def fake_encode(texts):
+    """Bag-of-words embedding over a tiny vocabulary, L2-normalized."""
+    vectors = []
+    for text in texts:
+        words = text.lower().split()
+        vector = np.array([float(word in words) for word in VOCAB]) + 1e-3
+        vectors.append(vector / np.linalg.norm(vector))
+    return np.array(vectors, dtype=np.float32)
+
+@pytest.fixture
+def router():
+    examples = {
+        "get_pro_stats": ["compare putting", "driving distance stats"],
+        "course_insights": ["course slope rating", "tell me about the course"],
+        "get_shot_recommendations": ["which club from 150 yards", "club for yards"],
+        "search_golfpedia": ["golf history", "golf rules"],
+    }
+    router = LocalRouter(
+        examples=examples, threshold=0.7, temperature=0.05, encode=fake_encode
+    )
+    router.warm_up()
+    return router
+
+def test_classify_picks_closest_route(router):
+    tool_name, confidence = router.classify("who is better at putting")
+    assert tool_name == "get_pro_stats"
+    assert 0.7 <= confidence <= 1.0
+
+def test_route_confident_counts_local(router):
+    assert router.route("what club from 150 yards") == "get_shot_recommendations"
+    assert router.stats == {"local": 1, "fallback": 0}
+
+def test_route_ambiguous_falls_back(router):
+    assert router.route("tell me something interesting") is None
+    assert router.stats == {"local": 0, "fallback": 1}
+
+def test_classify_requires_warm_up():
+    router = LocalRouter(encode=fake_encode)
+    assert not router.is_ready
+    with pytest.raises(ValueError):
+        router.classify("putting")
@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backend.core.onnx_embeddings import OnnxSentenceEncoder, pool_embeddings
+
+
+def test_mean_pooling_ignores_padding():
+    hidden = np.array([[[1.0, 1.0], [3.0, 3.0], [100.0, 100.0]]], dtype=np.float32)
+    mask = np.array([[1, 1, 0]])
+    assert np.allclose(pool_embeddings(hidden, mask, "mean"), [[2.0, 2.0]])
+
+def test_cls_pooling_takes_first_token():
+    hidden = np.array([[[1.0, 2.0], [3.0, 4.0]]], dtype=np.float32)
+    assert np.allclose(pool_embeddings(hidden, np.ones((1, 2)), "cls"), [[1.0, 2.0]])
+    with pytest.raises(ValueError):
+        pool_embeddings(hidden, np.ones((1, 2)), "max")
+
+class FakeTokenizer:
+    def encode_batch(self, texts):
+        # One real token per word, padded to the longest text
+        width = max(len(t.split()) for t in texts)
+        return [
+            SimpleNamespace(
+                ids=[1] * len(t.split()) + [0] * (width - len(t.split())),
+                attention_mask=[1] * len(t.split()) + [0] * (width - len(t.split())),
+                type_ids=[0] * width,
+            )
+            for t in texts
+        ]
+
+class FakeSession:
+    def __init__(self):
+        self.batches = []
+
+    def run(self, _outputs, inputs):
+        self.batches.append(inputs)
+        ids = inputs["input_ids"].astype(np.float32)
+        return [np.stack([ids * 3.0, ids * 4.0], axis=-1)]
+
+def test_encoder_batches_pools_and_normalizes():
+    encoder = OnnxSentenceEncoder.__new__(OnnxSentenceEncoder)
+    encoder.meta = {"pooling": "mean", "dim": 2}
+    encoder.session = FakeSession()
+    encoder.input_names = {"input_ids", "attention_mask"}
+    encoder.tokenizer = FakeTokenizer()
+
+    vectors = encoder.encode(
+        ["seven iron", "driver", "avoid a slice"],
+        normalize_embeddings=True,
+        batch_size=2,
+    )
+    assert vectors.shape == (3, 2) and vectors.dtype == np.float32
+    assert np.allclose(vectors, [[0.6, 0.8]] * 3)
+    assert len(encoder.session.batches) == 2
+    assert "token_type_ids" not in encoder.session.batches[0]
+    assert encoder.encode([]).shape == (0, 2)
@@ -0,0 +1,37 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from backend.core import qdrant
+from backend.core.qdrant import get_async_qdrant_client, get_qdrant_client
+
+
+@pytest.fixture(autouse=True)
+def fresh_clients():
+    """Mock the API key and start every test without cached clients."""
+    get_qdrant_client.cache_clear()
+    get_async_qdrant_client.cache_clear()
+    with patch.dict(os.environ, {"QDRANT_API_KEY": "fake-api-key"}):
+        yield
+    get_qdrant_client.cache_clear()
+    get_async_qdrant_client.cache_clear()
+
+def test_clients_are_reused():
+    assert get_qdrant_client() is get_qdrant_client()
+    assert get_async_qdrant_client() is get_async_qdrant_client()
+
+def test_grpc_settings_are_passed_through(monkeypatch):
+    monkeypatch.setattr(qdrant, "QDRANT_PREFER_GRPC", True)
+    monkeypatch.setattr(qdrant, "QDRANT_TIMEOUT", 3)
+    with patch("backend.core.qdrant.QdrantClient") as mock_client:
+        get_qdrant_client()
+    kwargs = mock_client.call_args.kwargs
+    assert kwargs["prefer_grpc"] is True
+    assert kwargs["timeout"] == 3
+    assert kwargs["api_key"] == "fake-api-key"
+
+def test_missing_api_key_raises():
+    with patch.dict(os.environ, {}, clear=True):
+        with pytest.raises(ValueError, match="QDRANT_API_KEY"):
+            get_qdrant_client()
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from backend.core.semantic_cache import SemanticCache, normalize_query
+
+VOCAB = ["flop", "shot", "technique", "hit", "putting", "slope"]
+
+def fake_encode(texts):
+    """Bag-of-words embedding over a tiny vocabulary, L2-normalized."""
+    vectors = []
+    for text in texts:
+        words = text.lower().replace("?", "").split()
+        vector = np.array([float(word in words) for word in VOCAB]) + 1e-3
+        vectors.append(vector / np.linalg.norm(vector))
+    return np.array(vectors, dtype=np.float32)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def cache(clock):
+    return SemanticCache(
+        threshold=0.8,
+        max_bytes=10_000,
+        route_ttls={"search_golfpedia": 60, "get_pro_stats": 3600},
+        encode=fake_encode,
+        clock=clock,
+    )
+
+def test_normalize_query():
+    assert (
+        normalize_query("  How do I   hit a FLOP shot? ") == "how do i hit a flop shot?"
+    )
+
+def test_exact_hit(cache):
+    cache.put("How do I hit a flop shot?", "Open the face.", route="search_golfpedia")
+    assert cache.get("how do i hit a  flop shot?") == "Open the face."
+    assert cache.stats["exact_hits"] == 1
+
+def test_semantic_hit(cache):
+    cache.put("how do I hit a flop shot", "Open the face.", route="search_golfpedia")
+    assert cache.get("flop shot technique hit") == "Open the face."
+    assert cache.stats["hits"] == 1
+
+def test_dissimilar_query_misses(cache):
+    cache.put("how do I hit a flop shot", "Open the face.", route="search_golfpedia")
+    assert cache.get("slope putting") is None
+    assert cache.stats["misses"] == 1
+
+def test_route_ttl_expiry(cache, clock):
+    cache.put("flop shot", "Open the face.", route="search_golfpedia")
+    cache.put("putting", "Scheffler leads.", route="get_pro_stats")
+    clock.now = 120
+    assert cache.get("flop shot") is None
+    assert cache.get("putting") == "Scheffler leads."
+    assert cache.stats["expirations"] == 1
+
+def test_lru_eviction_under_memory_budget(clock):
+    cache = SemanticCache(
+        threshold=0.99, max_bytes=900, encode=fake_encode, clock=clock
+    )
+    cache.put("flop", "a" * 50)
+    cache.put("putting", "b" * 50)
+    cache.get("flop")
+    cache.put("slope", "c" * 50)
+    snapshot = cache.snapshot()
+    assert snapshot["evictions"] == 1
+    assert snapshot["size_bytes"] <= 900
+    assert cache.get("flop") is not None
+    assert cache.get("putting") is None
+
+def test_pro_stats_and_shot_answers_need_an_exact_match(cache):
+    cache.put(
+        "how do I hit a flop shot", "Open the face.", route="get_shot_recommendations"
+    )
+    assert cache.get("flop shot technique hit") is None
+    assert cache.get("How do I hit a flop shot") == "Open the face."
+
+def test_rewrites_reuse_vector_slots(cache):
+    for i in range(100):
+        cache.put("flop shot", f"answer {i}", route="search_golfpedia")
+    assert cache.get("flop shot technique") == "answer 99"
+    assert cache.snapshot()["entries"] == 1
+    assert len(cache._slot_keys) == 1
@@ -0,0 +1,215 @@
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.core import shot_analytics
+from backend.core.shot_analytics import ShotAnalytics, get_shot_analytics
+from backend.tools.golf_shot_recommendations_tool import (
+    answer_aggregate_question,
+    format_analytics,
+    intent_to_sentence,
+    parse_aggregate_question,
+    recommend_shots,
+    render_shot_analytics_answer,
+)
+
+SHOTS = pd.DataFrame(
+    {
+        "Club Type": [
+            "7 Iron",
+            "7 Iron",
+            "7 Iron",
+            "7 Iron",
+            "Driver",
+            "Driver",
+            "Pitching Wedge",
+            "Unknown",
+        ],
+        "Shot Classification": [
+            "Slice",
+            "Straight",
+            "Slice",
+            "Draw",
+            "Draw",
+            "Fade",
+            "Straight",
+            "Straight",
+        ],
+        "Carry Distance": [140.0, 150.0, 145.0, 155.0, 240.0, 230.0, 105.0, 99.0],
+        "Total Distance": [148.0, 158.0, 150.0, 165.0, 262.0, 250.0, 112.0, 101.0],
+        "Ball Speed": [110.0, 115.0, 112.0, 116.0, 160.0, 158.0, 90.0, 85.0],
+        "Club Speed": [80.0, 82.0, 81.0, 83.0, 105.0, 104.0, 75.0, 70.0],
+        "Spin Rate": [7000.0, 6500.0, 7200.0, 6400.0, 2600.0, 2900.0, 9000.0, None],
+        "Attack Angle": [-4.0, -4.5, -3.8, -4.2, 2.0, 1.5, -5.0, -5.0],
+        "Descent Angle": [48.0, 47.0, 49.0, 46.0, 38.0, 39.0, 52.0, 50.0],
+    }
+)
+
+@pytest.fixture
+def analytics(tmp_path):
+    ShotAnalytics.from_frame(SHOTS).save(str(tmp_path))
+    return ShotAnalytics.load(str(tmp_path))
+
+def test_columns_are_memory_mapped(analytics):
+    assert isinstance(analytics.columns["carry_distance"], np.memmap)
+    assert analytics.clubs == ["7 iron", "driver", "pitching wedge"]
+    assert len(analytics) == 8
+
+def test_summarize_club_matches_numpy(analytics):
+    summary = analytics.summarize("7 iron", metrics=("carry_distance", "spin_rate"))
+    carry = np.array([140.0, 150.0, 145.0, 155.0])
+    assert summary["shots"] == 4
+    assert summary["metrics"]["carry_distance"]["mean"] == pytest.approx(
+        carry.mean(), abs=0.05
+    )
+    assert summary["metrics"]["carry_distance"]["p90"] == pytest.approx(
+        np.percentile(carry, 90), abs=0.05
+    )
+    assert summary["metrics"]["carry_distance"]["std"] == pytest.approx(
+        carry.std(), abs=0.05
+    )
+    assert summary["shapes"]["slice"] == {"count": 2, "share": 0.5}
+
+def test_shape_questions_count_the_whole_family():
+    drives = pd.DataFrame(
+        {
+            "Club Type": ["Driver"] * 6,
+            "Shot Classification": [
+                "Slice",
+                "Push Slice",
+                "Push Slice",
+                "Pull Slice",
+                "Straight",
+                "Draw",
+            ],
+            "Carry Distance": [220.0, 225.0, 230.0, 215.0, 240.0, 245.0],
+        }
+    )
+    analytics = ShotAnalytics.from_frame(drives)
+    assert analytics.summarize("driver", "slice")["matching"] == 4
+    question = parse_aggregate_question("How often do I slice my driver?")
+    answer = format_analytics(analytics, question)
+    assert (
+        "- Slice: 4 of 6 shots (66.7%): push slice 2, pull slice 1, slice 1" in answer
+    )
+
+def test_summarize_shape_restricts_metrics_only(analytics):
+    summary = analytics.summarize("7 iron", "slice")
+    assert (summary["shots"], summary["matching"]) == (4, 2)
+    assert summary["metrics"]["carry_distance"]["mean"] == pytest.approx(142.5)
+
+def test_by_club_matches_per_club_summaries(analytics):
+    rows = analytics.by_club("carry_distance")
+    assert [row["club"] for row in rows] == ["driver", "7 iron", "pitching wedge"]
+    for row in rows:
+        expected = analytics.summarize(row["club"])["metrics"]["carry_distance"]
+        assert {key: row[key] for key in expected} == pytest.approx(expected)
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        (
+            "What's my average carry with a 7 iron?",
+            {
+                "club": "7 iron",
+                "shape": None,
+                "metrics": ["carry_distance"],
+                "by_club": False,
+            },
+        ),
+        (
+            "How often do I slice my driver?",
+            {
+                "club": "driver",
+                "shape": "slice",
+                "metrics": ["carry_distance", "total_distance"],
+                "by_club": False,
+            },
+        ),
+        (
+            "Show my median total distance for each club",
+            {
+                "club": None,
+                "shape": None,
+                "metrics": ["total_distance"],
+                "by_club": True,
+            },
+        ),
+    ],
+)
+def test_parse_aggregate_question(query, expected):
+    assert parse_aggregate_question(query) == expected
+
+def test_recommendation_queries_are_not_aggregate():
+    assert parse_aggregate_question("How do I avoid slicing my 7 iron?") is None
+    assert (
+        parse_aggregate_question(
+            "How far do I need to carry my 7 iron to avoid a slice?"
+        )
+        is None
+    )
+
+def test_extracted_intent_decides_over_wording():
+    query = "What's my average carry with a 7 iron?"
+    assert (
+        parse_aggregate_question(query, {"intent": "achieve", "club": "7 iron"}) is None
+    )
+    assert (
+        parse_aggregate_question("7 iron", {"intent": "aggregate", "club": "7 iron"})[
+            "club"
+        ]
+        == "7 iron"
+    )
+
+def test_aggregate_question_skips_search(analytics):
+    with (
+        patch(
+            "backend.tools.golf_shot_recommendations_tool.get_shot_analytics",
+            return_value=analytics,
+        ),
+        patch("backend.tools.golf_shot_recommendations_tool.encode_texts") as encode,
+    ):
+        answer = recommend_shots("How often do I slice my 7 iron?")
+    encode.assert_not_called()
+    assert "Slice: 2 of 4 shots (50.0%)" in answer
+    assert render_shot_analytics_answer("", answer) == answer
+    assert render_shot_analytics_answer("", "Score: 0.9000 | a shot") is None
+
+def test_missing_shot_data_falls_back_to_search():
+    with patch(
+        "backend.tools.golf_shot_recommendations_tool.get_shot_analytics",
+        side_effect=FileNotFoundError,
+    ):
+        assert answer_aggregate_question("What's my average carry?") is None
+
+def test_aggregate_intent_searches_with_a_neutral_sentence():
+    intent = {
+        "distance": "unknown",
+        "intent": "aggregate",
+        "shape": "slice",
+        "club": "driver",
+    }
+    sentence = intent_to_sentence(intent)
+    assert "aggregate" not in sentence
+    assert "wants to hit a slice using driver" in sentence
+
+def test_failed_load_is_not_retried(tmp_path, monkeypatch):
+    monkeypatch.setattr(shot_analytics, "_analytics", None)
+    monkeypatch.setattr(shot_analytics, "_analytics_error", None)
+    monkeypatch.setattr(
+        shot_analytics, "SHOT_ANALYTICS_PATH", str(tmp_path / "columns")
+    )
+    with patch.object(
+        shot_analytics,
+        "build_shot_analytics",
+        side_effect=FileNotFoundError("no shot data"),
+    ) as build:
+        with pytest.raises(FileNotFoundError):
+            get_shot_analytics()
+        with pytest.raises(RuntimeError):
+            get_shot_analytics()
+    assert build.call_count == 1
+    assert shot_analytics.is_shot_analytics_unavailable()
+    assert answer_aggregate_question("What's my average carry?") is None
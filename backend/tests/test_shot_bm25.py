@@ -0,0 +1,145 @@
+import pytest
+
+from backend.core.shot_bm25 import (
+    BM25Index,
+    ShotLexicalIndex,
+    reciprocal_rank_fusion,
+    tokenize,
+)
+from backend.core.shot_index import ShotFilter, ShotHit
+from backend.tools.golf_shot_recommendations_tool import (
+    lexical_query,
+    parse_shot_intent,
+)
+
+SHOTS = [
+    {
+        "text": "hit a shot 150 yards using a 7 Iron (7i). "
+        "The shot was classified as Slice.",
+        "club": "7 iron",
+        "shape": "slice",
+        "total_distance": 150.0,
+    },
+    {
+        "text": "hit a shot 255 yards using a Driver (Dr). "
+        "The shot was classified as Draw.",
+        "club": "driver",
+        "shape": "draw",
+        "total_distance": 255.0,
+    },
+    {
+        "text": "hit a shot 152 yards using a 7 Iron (7i). "
+        "The shot was classified as Straight.",
+        "club": "7 iron",
+        "shape": "straight",
+        "total_distance": 152.0,
+    },
+    {
+        "text": "hit a shot 110 yards using a Pitching Wedge (PW). "
+        "The shot was classified as Hook.",
+        "club": "pitching wedge",
+        "shape": "hook",
+        "total_distance": 110.0,
+    },
+]
+
+def test_tokenize_splits_words_and_numbers():
+    assert tokenize("7 Iron (7i), 150.3 yards") == [
+        "7",
+        "iron",
+        "7",
+        "i",
+        "150",
+        "3",
+        "yards",
+    ]
+
+def test_bm25_ranks_exact_token_matches_first():
+    index = BM25Index([shot["text"] for shot in SHOTS])
+    results = index.search("7 iron slice", limit=3)
+    assert results[0][0] == 0
+    assert {doc for doc, _ in results} == {0, 2}  # only shots sharing a term score
+    assert index.search("putter", limit=3) == []
+
+def test_lexical_index_applies_shot_filter():
+    index = ShotLexicalIndex(SHOTS)
+    hits = index.search(
+        "7 iron slice",
+        limit=5,
+        shot_filter=ShotFilter(club="7 iron", exclude_shape="slice"),
+    )
+    assert [hit.payload["shape"] for hit in hits] == ["straight"]
+
+def test_avoid_query_does_not_boost_the_avoided_shape():
+    shapes = ["Pull Slice", "Push Slice", "Straight", "Draw", "Fade", "Hook"]
+    index = ShotLexicalIndex(
+        [
+            {
+                "text": "hit a shot 250 yards using a Driver (Dr). "
+                f"The shot was classified as {shape}.",
+                "club": "driver",
+            }
+            for shape in shapes
+        ]
+    )
+    query = "How do I avoid slicing my driver?"
+    avoid = {
+        "distance": "unknown",
+        "intent": "avoid",
+        "shape": "slice",
+        "club": "driver",
+    }
+    assert lexical_query(query, avoid) == f"{query} driver"
+    hits = index.search(lexical_query(query, avoid), limit=6)
+    assert "Slice" not in hits[0].payload["text"]
+    achieve = {**avoid, "intent": "achieve", "shape": "draw"}
+    assert (
+        index.search(lexical_query("I want to hit a draw", achieve), limit=1)[0]
+        .payload["text"]
+        .endswith("Draw.")
+    )
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    dense = [
+        ShotHit(0.9, {"text": "a"}),
+        ShotHit(0.8, {"text": "b"}),
+        ShotHit(0.7, {"text": "c"}),
+    ]
+    lexical = [
+        ShotHit(12.0, {"text": "b"}),
+        ShotHit(9.0, {"text": "c"}),
+        ShotHit(3.0, {"text": "d"}),
+    ]
+    fused = reciprocal_rank_fusion([dense, lexical], limit=3, k=60)
+    assert [hit.payload["text"] for hit in fused] == ["b", "c", "a"]
+    assert fused[0].score == pytest.approx(1 / 61 + 1 / 62)
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        (
+            "How do I avoid hooking my 7 iron from 160 yards?",
+            {"distance": "160", "intent": "avoid", "shape": "hook", "club": "7 iron"},
+        ),
+        (
+            "I want to hit a draw with my driver",
+            {
+                "distance": "unknown",
+                "intent": "achieve",
+                "shape": "draw",
+                "club": "driver",
+            },
+        ),
+        (
+            "What club should I hit from 150y?",
+            {
+                "distance": "150",
+                "intent": "achieve",
+                "shape": "unknown",
+                "club": "unknown",
+            },
+        ),
+    ],
+)
+def test_parse_shot_intent(query, expected):
+    assert parse_shot_intent(query) == expected
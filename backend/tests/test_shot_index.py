@@ -0,0 +1,162 @@
+import numpy as np
+import pytest
+
+from backend.core.shot_data import normalize_club, normalize_shape, shape_family
+from backend.core.shot_index import LocalShotIndex, ShotFilter
+
+
+@pytest.fixture
+def index(tmp_path):
+    vectors = np.array(
+        [[1, 0, 0], [0, 1, 0], [0.9, 0.1, 0], [0, 0, 2]], dtype=np.float32
+    )
+    fields = [
+        ("7 iron", "slice", 150.0),
+        ("driver", "draw", 260.0),
+        ("7 iron", "straight", 155.0),
+        ("7 iron", "slice", 190.0),
+    ]
+    payloads = [
+        {"text": f"shot {i}", "club": club, "shape": shape, "total_distance": distance}
+        for i, (club, shape, distance) in enumerate(fields)
+    ]
+    LocalShotIndex.build(str(tmp_path), vectors, payloads, model="test-model")
+    # Reopen from disk, as the app does
+    return LocalShotIndex(str(tmp_path)).load()
+
+def test_search_returns_nearest_in_score_order(index):
+    hits = index.search([1, 0, 0], limit=2)
+    assert [hit.payload["text"] for hit in hits] == ["shot 0", "shot 2"]
+    assert hits[0].score == pytest.approx(1.0)
+    assert hits[0].score > hits[1].score
+
+def test_vectors_are_normalized_and_memory_mapped(index):
+    hits = index.search([0, 0, 5], limit=1)
+    assert hits[0].payload["text"] == "shot 3"
+    assert hits[0].score == pytest.approx(1.0)
+    assert isinstance(index._vectors, np.memmap)
+
+def test_limit_larger_than_index(index):
+    assert len(index.search([1, 1, 1], limit=10)) == 4
+
+def test_check_model_mismatch(index):
+    index.check_model("test-model")
+    with pytest.raises(ValueError, match="built with test-model"):
+        index.check_model("other-model")
+
+def test_filtered_search_only_scores_matching_shots(index):
+    shot_filter = ShotFilter(
+        club="7 iron", min_distance=140, max_distance=170, exclude_shape="slice"
+    )
+    hits = index.search([1, 0, 0], limit=5, shot_filter=shot_filter)
+    assert [hit.payload["text"] for hit in hits] == ["shot 2"]
+
+def test_filter_from_intent():
+    avoid = ShotFilter.from_intent(
+        {
+            "distance": "150 yards",
+            "intent": "avoid",
+            "shape": "Slice",
+            "club": "7-Iron",
+        },
+        tolerance=10,
+    )
+    assert avoid == ShotFilter(
+        club="7 iron", min_distance=140, max_distance=160, exclude_shape="slice"
+    )
+
+    achieve = ShotFilter.from_intent(
+        {"distance": "unknown", "intent": "achieve", "shape": "draw", "club": "unknown"}
+    )
+    assert achieve == ShotFilter(shape="draw")
+
+    assert (
+        ShotFilter.from_intent(
+            {
+                "distance": "unknown",
+                "intent": "avoid",
+                "shape": "unknown",
+                "club": "unknown",
+            }
+        )
+        is None
+    )
+
+def test_shape_filters_match_the_shape_family(tmp_path):
+    classifications = ["Slice", "Push Slice", "Pull Slice", "Straight", "Push Draw"]
+    payloads = [
+        {
+            "text": c,
+            "club": "driver",
+            "shape": normalize_shape(c),
+            "shape_family": shape_family(c),
+            "total_distance": 250.0,
+        }
+        for c in classifications
+    ]
+    index = LocalShotIndex.build(
+        str(tmp_path), np.eye(5, dtype=np.float32), payloads, model="test-model"
+    )
+    avoid = ShotFilter.from_intent(
+        {"distance": "unknown", "intent": "avoid", "shape": "slice", "club": "driver"}
+    )
+    assert sorted(
+        hit.payload["text"] for hit in index.search(np.ones(5), 5, avoid)
+    ) == ["Push Draw", "Straight"]
+    achieve = ShotFilter.from_intent(
+        {"distance": "unknown", "intent": "achieve", "shape": "Draw", "club": "driver"}
+    )
+    assert [hit.payload["text"] for hit in index.search(np.ones(5), 5, achieve)] == [
+        "Push Draw"
+    ]
+    assert avoid.to_qdrant().must_not[0].key == "shape_family"
+
+@pytest.mark.parametrize("mode", ["scalar", "binary"])
+def test_quantized_search_rescores_to_exact_results(index, mode):
+    quantized = LocalShotIndex(index.path, quantization=mode, oversampling=2.0).load()
+    hits = quantized.search([1, 0, 0], limit=2)
+    assert [hit.payload["text"] for hit in hits] == ["shot 0", "shot 2"]
+    assert hits[0].score == pytest.approx(1.0)
+    assert quantized.memory_bytes() < index.memory_bytes()
+    filtered = quantized.search(
+        [1, 0, 0], limit=5, shot_filter=ShotFilter(club="driver")
+    )
+    assert [hit.payload["text"] for hit in filtered] == ["shot 1"]
+
+def test_scalar_quantization_keeps_recall(tmp_path):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(500, 32)).astype(np.float32)
+    LocalShotIndex.build(
+        str(tmp_path),
+        vectors,
+        [{"text": str(i)} for i in range(500)],
+        model="test-model",
+    )
+    exact = LocalShotIndex(str(tmp_path), quantization="none")
+    scalar = LocalShotIndex(str(tmp_path), quantization="scalar", oversampling=3.0)
+    queries = rng.normal(size=(20, 32))
+    recall = np.mean(
+        [
+            len(
+                {h.payload["text"] for h in exact.search(q, 10)}
+                & {h.payload["text"] for h in scalar.search(q, 10)}
+            )
+            / 10
+            for q in queries
+        ]
+    )
+    assert recall >= 0.95
+
+@pytest.mark.parametrize(
+    "raw,expected",
+    [
+        ("7 Iron", "7 iron"),
+        ("7i", "7 iron"),
+        ("PW", "pitching wedge"),
+        ("3W", "3 wood"),
+        ("AW", "approach wedge"),
+        ("unknown", None),
+    ],
+)
+def test_normalize_club(raw, expected):
+    assert normalize_club(raw) == expected
@@ -0,0 +1,204 @@
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.core import shot_ingest
+
+COLUMNS = {
+    "Date": "2024-05-01",
+    "Carry Distance": 140,
+    "Club Description": "7i",
+    "Ball Speed": 110,
+    "Club Speed": 85,
+    "Spin Rate": 6500,
+    "Attack Angle": -3.5,
+    "Descent Angle": 48,
+}
+
+class FakeQdrant:
+    """In-memory stand-in for the QdrantClient calls used by ingestion."""
+
+    def __init__(self, fail_on_upsert: int = None):
+        self.collections = {}
+        self.quantization = {}
+        self.upserts = 0
+        self.fail_on_upsert = fail_on_upsert
+
+    def collection_exists(self, name):
+        return name in self.collections
+
+    def create_collection(
+        self, collection_name, vectors_config, quantization_config=None
+    ):
+        self.collections[collection_name] = {}
+        self.quantization[collection_name] = quantization_config
+
+    def get_collection(self, collection_name):
+        return SimpleNamespace(
+            config=SimpleNamespace(
+                quantization_config=self.quantization[collection_name]
+            )
+        )
+
+    def update_collection(self, collection_name, quantization_config=None):
+        self.quantization[collection_name] = quantization_config
+
+    def delete_collection(self, name):
+        self.collections.pop(name, None)
+
+    def create_payload_index(self, **kwargs):
+        pass
+
+    def retrieve(self, collection_name, ids, **kwargs):
+        points = self.collections[collection_name]
+        return [
+            SimpleNamespace(id=i, payload=points[i].payload) for i in ids if i in points
+        ]
+
+    def delete(self, collection_name, points_selector, wait=True):
+        condition = points_selector.filter.must[0]
+        points = self.collections[collection_name]
+        for point_id in [
+            i
+            for i, point in points.items()
+            if point.payload[condition.key] >= condition.range.gte
+        ]:
+            del points[point_id]
+
+    def upsert(self, collection_name, points, wait=True):
+        self.upserts += 1
+        if self.upserts == self.fail_on_upsert:
+            raise ConnectionError("qdrant unavailable")
+        for point in points:
+            self.collections[collection_name][point.id] = point
+
+class CountingEncoder:
+    def __init__(self):
+        self.texts = 0
+
+    def __call__(self, texts):
+        self.texts += len(texts)
+        return np.ones((len(texts), 3), dtype=np.float32)
+
+def write_csv(path, shots):
+    rows = [
+        {
+            **COLUMNS,
+            "Club Type": club,
+            "Total Distance": total,
+            "Shot Classification": shape,
+        }
+        for club, total, shape in shots
+    ]
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+SHOTS = [("7 Iron", 150 + i, "Slice" if i % 2 else "Draw") for i in range(10)]
+
+@pytest.fixture
+def run(tmp_path):
+    csv_path, checkpoint = tmp_path / "shots.csv", tmp_path / "checkpoint.json"
+    write_csv(csv_path, SHOTS)
+
+    def run(client, encoder, **kwargs):
+        return shot_ingest.ingest_shots(
+            csv_path=str(csv_path),
+            collection_name="shots",
+            chunk_size=4,
+            encode_batch_size=2,
+            upsert_batch_size=3,
+            upsert_workers=1,
+            checkpoint_path=str(checkpoint),
+            client=client,
+            encode=encoder,
+            **kwargs,
+        )
+    run.csv_path, run.checkpoint = csv_path, checkpoint
+    return run
+
+def test_ingest_stores_payloads_and_skips_unchanged_rows(run):
+    client, encoder = FakeQdrant(), CountingEncoder()
+    stats = run(client, encoder)
+    assert stats["rows"] == 10 and stats["embedded"] == 10 and encoder.texts == 10
+    points = client.collections["shots"]
+    assert len(points) == 10
+    payload = next(iter(points.values())).payload
+    assert payload["club"] == "7 iron" and payload["shape"] in ("slice", "draw")
+
+    # A re-run with one edited row only embeds that row, replacing its point
+    run.checkpoint.unlink()
+    write_csv(run.csv_path, SHOTS[:-1] + [("Driver", 250, "Hook")])
+    stats = run(client, encoder)
+    assert stats["embedded"] == 1 and stats["unchanged"] == 9
+    assert encoder.texts == 11
+    assert len(points) == 10
+    assert points[shot_ingest.shot_point_id(9)].payload["club"] == "driver"
+
+    # Rows removed from the end of the CSV are deleted from the collection
+    run.checkpoint.unlink()
+    write_csv(run.csv_path, SHOTS[:6])
+    run(client, encoder)
+    assert sorted(point.payload["row"] for point in points.values()) == list(range(6))
+
+def test_points_missing_a_payload_field_are_rewritten(run):
+    client, encoder = FakeQdrant(), CountingEncoder()
+    run(client, encoder)
+    for point in client.collections["shots"].values():
+        del point.payload["shape_family"]
+    run.checkpoint.unlink()
+    stats = run(client, encoder)
+    assert stats["embedded"] == 10
+    assert all(
+        point.payload["shape_family"] in ("slice", "draw")
+        for point in client.collections["shots"].values()
+    )
+
+def test_changing_the_model_reembeds_every_row(run, monkeypatch):
+    client, encoder = FakeQdrant(), CountingEncoder()
+    run(client, encoder)
+    monkeypatch.setattr(shot_ingest, "EMBEDDING_MODEL", "another-model")
+    stats = run(client, encoder)
+    assert stats["rows"] == 10 and stats["embedded"] == 10
+    assert len(client.collections["shots"]) == 10
+
+def test_interrupted_ingest_resumes_from_checkpoint(run):
+    client, encoder = FakeQdrant(fail_on_upsert=4), CountingEncoder()
+    with pytest.raises(ConnectionError):
+        run(client, encoder)
+    assert json.loads(run.checkpoint.read_text())["rows_done"] == 4
+
+    client.fail_on_upsert = None
+    stats = run(client, encoder)
+    assert stats["rows"] == 6
+    assert len(client.collections["shots"]) == 10
+    assert json.loads(run.checkpoint.read_text())["rows_done"] == 10
+
+def test_point_ids_follow_rows_and_hashes_follow_content():
+    assert (
+        shot_ingest.shot_point_id(3)
+        == shot_ingest.shot_point_id(3)
+        != shot_ingest.shot_point_id(4)
+    )
+    assert shot_ingest.content_hash("a shot", "model-a") != shot_ingest.content_hash(
+        "another shot", "model-a"
+    )
+    assert shot_ingest.content_hash("a shot", "model-a") != shot_ingest.content_hash(
+        "a shot", "model-b"
+    )
+
+def test_quantization_is_applied_on_create_and_update():
+    client = FakeQdrant()
+    shot_ingest.ensure_collection(client, "shots", dim=3, quantization="none")
+    assert client.quantization["shots"] is None
+
+    shot_ingest.ensure_collection(client, "shots", quantization="scalar")
+    assert client.quantization["shots"] == shot_ingest.qdrant_quantization_config(
+        "scalar"
+    )
+
+    shot_ingest.ensure_collection(client, "binary_shots", dim=3, quantization="binary")
+    assert client.quantization[
+        "binary_shots"
+    ] == shot_ingest.qdrant_quantization_config("binary")
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from backend.core.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"final_response": "Open the face."}
+
+    results = await asyncio.gather(*(flights.do("flop shot", work) for _ in range(5)))
+
+    assert calls == 1
+    assert all(result == {"final_response": "Open the face."} for result in results)
+    assert flights.stats == {"executions": 1, "coalesced": 4}
+    assert flights.in_flight() == 0
+
+@pytest.mark.asyncio
+async def test_sequential_calls_run_again():
+    flights = SingleFlight()
+
+    async def work():
+        return "answer"
+
+    await flights.do("flop shot", work)
+    await flights.do("flop shot", work)
+    assert flights.stats["executions"] == 2
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_waiter():
+    flights = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(
+        flights.do("q", work), flights.do("q", work), return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_call():
+    flights = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "answer"
+
+    first = asyncio.ensure_future(flights.do("q", work))
+    second = asyncio.ensure_future(flights.do("q", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == "answer"
+
+@pytest.mark.asyncio
+async def test_streams_are_shared_and_replayed():
+    flights = SingleFlight()
+    started = 0
+
+    async def events():
+        nonlocal started
+        started += 1
+        for token in ["Open ", "the ", "face."]:
+            await asyncio.sleep(0.005)
+            yield {"type": "token", "content": token}
+
+    async def collect():
+        return [event["content"] async for event in flights.stream("q", events)]
+
+    first = asyncio.ensure_future(collect())
+    await asyncio.sleep(0.007)  # join after the first event was emitted
+    second = asyncio.ensure_future(collect())
+
+    assert await first == await second == ["Open ", "the ", "face."]
+    assert started == 1
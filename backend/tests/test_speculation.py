@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from backend.agents.speculation import (
+    SpeculationStats,
+    guess_tools,
+    resolve_speculation,
+)
+
+
+@pytest.mark.parametrize("query,expected", [
+    ("Compare putting between Scottie Scheffler and Rory McIlroy", "get_pro_stats"),
+    ("What club should I use from 150 yards?", "get_shot_recommendations"),
+    ("What is the history of golf?", "search_golfpedia"),
+])
+def test_guess_tools(query, expected):
+    assert guess_tools(query)[0] == expected
+
+def test_guess_tools_no_signal():
+    assert guess_tools("Tell me about Pine Valley") == []
+
+@pytest.mark.asyncio
+async def test_resolve_speculation_hit_and_miss(monkeypatch):
+    stats = SpeculationStats()
+    monkeypatch.setattr("backend.agents.speculation.speculation_stats", stats)
+
+    async def tool_result():
+        return "SG Putting comparison"
+
+    hit = asyncio.ensure_future(tool_result())
+    miss = asyncio.ensure_future(asyncio.sleep(10))
+    started = {"get_pro_stats": (hit, 0.0), "search_golfpedia": (miss, 0.0)}
+
+    assert (
+        await resolve_speculation(started, "get_pro_stats") == "SG Putting comparison"
+    )
+    await asyncio.sleep(0)
+    assert miss.cancelled()
+    snapshot = stats.snapshot()
+    assert snapshot["hits"] == 1
+    assert snapshot["misses"] == 1
+    assert snapshot["hit_rate"] == 0.5
+
+@pytest.mark.asyncio
+async def test_resolve_speculation_wrong_guess_returns_none(monkeypatch):
+    monkeypatch.setattr(
+        "backend.agents.speculation.speculation_stats", SpeculationStats()
+    )
+    task = asyncio.ensure_future(asyncio.sleep(10))
+    assert (
+        await resolve_speculation({"get_pro_stats": (task, 0.0)}, "course_insights")
+        is None
+    )
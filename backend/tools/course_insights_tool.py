@@ -3,6 +3,7 @@ import json
 import requests
 from langchain.tools import tool
 from backend.core.logging_config import logger
+from backend.core.metrics import observe_upstream
 
 BASE_URL = "https://api.golfcourseapi.com/v1"
 
@@ -32,7 +33,12 @@ def course_insights(search_query: str) -> str:
 
     try:
         # Step 1: Search
-        search_resp = requests.get(f"{BASE_URL}/search", headers=get_headers(), params={"search_query": search_query})
+        with observe_upstream("golfcourseapi", "search"):
+            search_resp = requests.get(
+                f"{BASE_URL}/search",
+                headers=get_headers(),
+                params={"search_query": search_query},
+            )
         search_resp.raise_for_status()
         try:
             courses = search_resp.json().get("courses", [])
@@ -52,7 +58,10 @@ def course_insights(search_query: str) -> str:
             course_name = course_meta["course_name"]
             club_name = course_meta["club_name"]
 
-            detail_resp = requests.get(f"{BASE_URL}/courses/{course_id}", headers=get_headers())
+            with observe_upstream("golfcourseapi", "course_detail"):
+                detail_resp = requests.get(
+                    f"{BASE_URL}/courses/{course_id}", headers=get_headers()
+                )
             detail_resp.raise_for_status()
             try:
                 data = detail_resp.json()
@@ -1,3 +1,5 @@
+import re
+from typing import Optional
 from langchain.tools import tool
 from backend.core.logging_config import logger
 
@@ -8,25 +10,32 @@ MOCK_STATS_DB = {
     "Bryson DeChambeau": {"SG Putting": -0.12, "Driving Distance": 337.8}
 }
 
-@tool
-def get_pro_stats(query: str) -> str:
-    """Returns mock stat data for one or two PGA players from a simulated database."""
-    logger.debug(f"[TOOL CALLED] get_pro_stats: {query}")
+# Checked in order: "driving accuracy" must select accuracy before "driving" matches
+STAT_KEYWORDS = {
+    "putting": "SG Putting",
+    "distance": "Driving Distance",
+    "accuracy": "Driving Accuracy",  # placeholder
+    "driving": "Driving Distance",
+}
+
+def lookup_pro_stats(query: str) -> dict:
+    """
+    Find the requested stat and the players mentioned in a query.
 
-    stat_keywords = ["putting", "distance", "accuracy", "driving"]
+    Returns
+    -------
+    dict
+        ``{"stat": str or None, "players": [(name, value), ...]}``; ``value`` is
+        None when the player has no figure for the stat.
+    """
     selected_stat = None
-    for keyword in stat_keywords:
+    for keyword, stat in STAT_KEYWORDS.items():
         if keyword in query.lower():
-            selected_stat = {
-                "putting": "SG Putting",
-                "distance": "Driving Distance",
-                "driving": "Driving Distance",
-                "accuracy": "Driving Accuracy"  # placeholder
-            }[keyword]
+            selected_stat = stat
             break
 
     if not selected_stat:
-        return "Could not determine which stat to compare."
+        return {"stat": None, "players": []}
 
     # Find players in the query
     found_players = []
@@ -44,12 +53,116 @@ def get_pro_stats(query: str) -> str:
                     found_players.append(player)
                     break
 
-    if not found_players:
+    return {
+        "stat": selected_stat,
+        "players": [
+            (name, MOCK_STATS_DB[name].get(selected_stat)) for name in found_players
+        ],
+    }
+
+@tool
+def get_pro_stats(query: str) -> str:
+    """Returns mock stat data for one or two PGA players from a simulated database."""
+    logger.debug(f"[TOOL CALLED] get_pro_stats: {query}")
+
+    stats = lookup_pro_stats(query)
+    selected_stat, players = stats["stat"], stats["players"]
+    if not selected_stat:
+        return "Could not determine which stat to compare."
+
+    if not players:
         return "Please specify at least one known player."
 
-    lines = [f"{name}: {MOCK_STATS_DB[name].get(selected_stat, 'N/A')}" for name in found_players]
+    lines = [f"{name}: {'N/A' if value is None else value}" for name, value in players]
     
-    if len(found_players) == 1:
-        return f"{selected_stat} for {found_players[0]}: {lines[0]}"
+    if len(players) == 1:
+        return f"{selected_stat} for {players[0][0]}: {lines[0]}"
     else:
         return f"{selected_stat} comparison:\n" + "\n".join(f"- {line}" for line in lines)
+
+# The two output formats of get_pro_stats
+SINGLE_PLAYER_RESULT = re.compile(
+    r"^(?P<stat>.+) for (?P<name>.+?): (?P=name): (?P<value>\S+)$"
+)
+COMPARISON_RESULT = re.compile(r"^(?P<stat>.+) comparison:$")
+COMPARISON_LINE = re.compile(r"^- (?P<name>.+): (?P<value>\S+)$")
+
+def parse_stat_value(value: str) -> Optional[float]:
+    try:
+        return float(value)
+    except ValueError:
+        return None  # "N/A"
+
+def parse_pro_stats_result(tool_result: str) -> Optional[dict]:
+    """
+    Parse the output of ``get_pro_stats`` back into a stat and player values.
+
+    Returns
+    -------
+    dict or None
+        ``{"stat": str, "players": [(name, value), ...]}`` as in
+        ``lookup_pro_stats``, or None when the result is not a stat listing
+        (e.g. "Please specify at least one known player.").
+    """
+    lines = tool_result.strip().splitlines()
+    if len(lines) == 1:
+        match = SINGLE_PLAYER_RESULT.match(lines[0])
+        if match:
+            return {
+                "stat": match["stat"],
+                "players": [(match["name"], parse_stat_value(match["value"]))],
+            }
+        return None
+    header = COMPARISON_RESULT.match(lines[0]) if lines else None
+    rows = [COMPARISON_LINE.match(line) for line in lines[1:]]
+    if header is None or not all(rows):
+        return None
+    return {
+        "stat": header["stat"],
+        "players": [(row["name"], parse_stat_value(row["value"])) for row in rows],
+    }
+
+def render_pro_stats_answer(query: str, tool_result: str) -> Optional[str]:
+    """
+    Render the user-facing answer for a stats query from a local template.
+
+    Used as the tool's direct answer (see ``direct_answers`` in
+    ``backend/tools/registry.py``), so stat lookups skip the summary LLM. The
+    answer is rendered from ``tool_result``, so it always agrees with what the
+    tool returned.
+
+    Returns
+    -------
+    str or None
+        The answer, or None when the tool could not resolve the query (no stat,
+        player or figure found) and the summarizer should handle it instead.
+    """
+    stats = parse_pro_stats_result(tool_result)
+    if stats is None:
+        return None
+    selected_stat, players = (
+        stats["stat"],
+        [(n, v) for n, v in stats["players"] if v is not None],
+    )
+    if not players:
+        return None
+
+    if len(players) == 1:
+        name, value = players[0]
+        return f"{name}'s {selected_stat} is {value}."
+
+    # Every tracked stat is higher-is-better
+    ranked = sorted(players, key=lambda player: player[1], reverse=True)
+    (leader, best), (runner_up, second) = ranked[0], ranked[1]
+    lines = [f"{selected_stat} comparison:"] + [
+        f"- {name}: {value}" for name, value in ranked
+    ]
+    if best == second:
+        lines.append(
+            f"\n{leader} and {runner_up} are level on {selected_stat} at {best}."
+        )
+    else:
+        lines.append(
+            f"\n{leader} leads on {selected_stat} ({best} vs {second} for {runner_up})."
+        )
+    return "\n".join(lines)
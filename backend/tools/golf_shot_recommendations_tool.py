@@ -1,108 +1,555 @@
 import os
-from sentence_transformers import SentenceTransformer
-from qdrant_client import QdrantClient
+import re
 from qdrant_client.http.exceptions import UnexpectedResponse
 from langchain.tools import tool
+from backend.core.executors import run_blocking
+from backend.core.llm_clients import get_node_settings, get_openai_client
+from backend.core.local_embeddings import (
+    EMBEDDING_MODEL,
+    encode_texts,
+    get_sentence_model,
+    query_text,
+)
 from backend.core.logging_config import logger
-from openai import OpenAI
+from backend.core.metrics import observe_upstream, record_token_usage
+from backend.core.qdrant import (
+    SHOT_COLLECTION_NAME,
+    get_async_qdrant_client,
+    get_qdrant_client,
+)
+from backend.core.shot_analytics import (
+    SHOT_ANALYTICS_ENABLED,
+    UNITS,
+    get_shot_analytics,
+    is_shot_analytics_unavailable,
+)
+from backend.core.shot_bm25 import (
+    SHOT_HYBRID_CANDIDATES,
+    SHOT_HYBRID_SEARCH,
+    get_shot_lexical_index,
+    is_shot_lexical_index_unavailable,
+    reciprocal_rank_fusion,
+)
+from backend.core.shot_data import normalize_club, shape_family
+from backend.core.shot_index import (
+    SHOT_INDEX_BACKEND,
+    ShotFilter,
+    get_local_shot_index,
+    qdrant_search_params,
+)
 from dotenv import load_dotenv
 import json
+from typing import Optional
 
 # Load environment variables
 load_dotenv()
 
-# Get collection name and model from environment variables with defaults
-COLLECTION_NAME = os.getenv("QDRANT_COLLECTION_NAME", "golf_shot_vectors")
-EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "thenlper/gte-small")
+# Collection name comes from QDRANT_COLLECTION_NAME (see backend/core/qdrant.py)
+COLLECTION_NAME = SHOT_COLLECTION_NAME
+SHOT_SEARCH_LIMIT = 5
+# Narrow shot searches by the club, distance and shape in the golfer's intent
+SHOT_FILTERS_ENABLED = os.getenv("SHOT_FILTERS_ENABLED", "true").lower() == "true"
+# When to extract the shot intent with the LLM: "always", "auto" (only when the
+# query names no club or shape) or "never" (lexical parsing only)
+SHOT_LLM_PREPROCESSING = os.getenv("SHOT_LLM_PREPROCESSING", "always").lower()
+# Quantized search with oversampling and rescoring when SHOT_QUANTIZATION is set
+# (see backend/core/shot_index.py)
+SHOT_SEARCH_PARAMS = qdrant_search_params()
 
-# Initialize the model and client lazily
+# The embedding model is loaded once per process and shared
+# (see backend/core/local_embeddings.py)
 def get_model():
-    return SentenceTransformer(EMBEDDING_MODEL)
-
-def get_qdrant_client():
-    qdrant_api_key = os.getenv("QDRANT_API_KEY")
-    if not qdrant_api_key:
-        raise ValueError("QDRANT_API_KEY environment variable is not set")
-        
-    return QdrantClient(
-        url="https://6f592f43-f667-4234-ad3a-4f15ed5882ef.us-west-2-0.aws.cloud.qdrant.io:6333",
-        api_key=qdrant_api_key
-    )
+    return get_sentence_model()
 
+# Qdrant clients are shared and reused across queries (see backend/core/qdrant.py)
+
+# Shot intent fields, also requested from the router for shot queries
+# (see golf_langgraph.py)
+SHOT_INTENT_FIELDS = ("distance", "intent", "shape", "club")
+
+def extract_shot_intent(query: str) -> dict:
+    """Extract the shot intent (distance, intent, shape, club) with the LLM."""
+    client = get_openai_client()
+    settings = get_node_settings("shot_intent")
 
-def preprocess_query_with_llm(query: str) -> str:
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    
     system_msg = (
         "You are a golf shot planner assistant. "
         "Given a golfer's query, extract the structured intent behind the shot.\n\n"
         "Respond in JSON with:\n"
         "- distance (number or 'unknown')\n"
-        "- intent ('avoid' or 'achieve')\n"
+        "- intent ('avoid', 'achieve', or 'aggregate' for statistics about "
+        "the golfer's past shots)\n"
         "- shape (or 'unknown')\n"
         "- club (or 'unknown')"
     )
 
     user_msg = f"Query: {query}"
     
-    response = client.chat.completions.create(
-        model="gpt-4",
-        messages=[
-            {"role": "system", "content": system_msg},
-            {"role": "user", "content": user_msg}
-        ],
-        temperature=0
-    )
+    with observe_upstream("openai", "shot_intent"):
+        response = client.chat.completions.create(
+            model=settings.model,
+            messages=[
+                {"role": "system", "content": system_msg},
+                {"role": "user", "content": user_msg}
+            ],
+            temperature=settings.temperature,
+            timeout=settings.timeout
+        )
+    if response.usage:
+        record_token_usage(
+            "shot_intent",
+            settings.model,
+            response.usage.prompt_tokens,
+            response.usage.completion_tokens,
+        )
 
     try:
-        parsed = json.loads(response.choices[0].message.content)
-        return (
-            f"The golfer is planning a {parsed['distance']}-yard shot and wants to "
-            f"{parsed['intent']} a {parsed['shape']} using {parsed['club']}."
-        )
+        return json.loads(response.choices[0].message.content)
     except json.JSONDecodeError as e:
         raise ValueError(f"Failed to parse LLM response as JSON: {e}")
 
-@tool
-def get_shot_recommendations(query: str) -> str:
+def normalize_shot_intent(intent) -> Optional[dict]:
+    """Fill missing intent fields with 'unknown'; None if there are no shot fields."""
+    if not isinstance(intent, dict) or not any(
+        field in intent for field in SHOT_INTENT_FIELDS
+    ):
+        return None
+    return {field: intent.get(field, "unknown") for field in SHOT_INTENT_FIELDS}
+
+def intent_to_sentence(intent: dict) -> str:
+    """Phrase a shot intent the way the embedded shot descriptions are written."""
+    # An "aggregate" intent reaches shot search only when analytics are off or
+    # unavailable; "wants to aggregate a slice" would just add noise
+    verb = intent["intent"] if intent["intent"] in ("avoid", "achieve") else "hit"
+    return (
+        f"The golfer is planning a {intent['distance']}-yard shot and wants to "
+        f"{verb} a {intent['shape']} using {intent['club']}."
+    )
+
+DISTANCE_PATTERN = re.compile(r"\b(\d{2,3})\s*(?:yards?|yds?|y)\b")
+CLUB_PATTERN = re.compile(
+    r"\b(?:(\d{1,2})\s*-?\s*(iron|wood|hybrid|i|w|h)|driver|(?:pitching|gap|sand|lob)\s+wedge|[pgsl]w)\b"
+)
+# Shot shape -> word stem, so "slicing", "hooks" and "faded" are recognized
+SHAPE_STEMS = {
+    "slice": "slic",
+    "hook": "hook",
+    "draw": "draw",
+    "fade": "fad",
+    "push": "push",
+    "pull": "pull",
+    "straight": "straight",
+}
+AVOID_WORDS = re.compile(
+    r"\b(avoid|stop|fix|prevent|without|less|never|no more|cure)\b"
+)
+
+def parse_shot_intent(query: str) -> dict:
     """
-    Retrieves relevant golf shot recommendations based on the query using semantic search.
-    Useful for questions about club selection, shot technique, or avoiding certain shot patterns.
+    Cheap lexical shot intent (distance, intent, shape, club) from the query text.
+
+    Used instead of the LLM extraction when ``SHOT_LLM_PREPROCESSING`` allows;
+    unrecognized fields are "unknown".
     """
-    logger.debug(f"[TOOL CALLED] get_shot_recommendations: {query}")
-    
-    # structure the query to more closely align with the embedded data.
-    preprocessed_query = preprocess_query_with_llm(query)
+    text = query.lower()
+    distance = DISTANCE_PATTERN.search(text)
+    club = CLUB_PATTERN.search(text)
+    shape = next(
+        (
+            shape
+            for shape, stem in SHAPE_STEMS.items()
+            if re.search(rf"\b{stem}\w*", text)
+        ),
+        None,
+    )
+    return {
+        "distance": distance.group(1) if distance else "unknown",
+        "intent": "avoid" if AVOID_WORDS.search(text) else "achieve",
+        "shape": shape or "unknown",
+        "club": normalize_club(club.group(0)) if club else "unknown",
+    }
 
-    # Get embeddings for the query
-    model = get_model()
-    query_vector = model.encode(preprocessed_query)
-    
-    # Search Qdrant
-    client = get_qdrant_client()
+# Aggregate questions about the golfer's own history ("average carry with my 7 iron",
+# "how often do I slice my driver") are answered from the shot analytics columns
+AGGREGATE_PATTERN = re.compile(
+    r"\b(average|avg|mean|median|how often|how many|how far do i (usually )?(hit|carry)"
+    r"|percent(age)?|dispersion|stats|statistics|distribution|gapping)\b"
+)
+BY_CLUB_PATTERN = re.compile(r"\b(each|every|all|per|by) (my )?clubs?\b|\bgapping\b")
+METRIC_PATTERNS = [
+    ("spin_rate", re.compile(r"\bspin\b")),
+    ("ball_speed", re.compile(r"\bball speed\b")),
+    ("club_speed", re.compile(r"\b(club|swing) speed\b")),
+    ("attack_angle", re.compile(r"\battack angle\b")),
+    ("descent_angle", re.compile(r"\b(descent|landing) angle\b")),
+    ("carry_distance", re.compile(r"\bcarr(y|ies)\b")),
+    ("total_distance", re.compile(r"\b(total|roll|how far)\b")),
+]
+ANALYTICS_HEADER = "Shot analytics"
+
+def parse_aggregate_question(
+    query: str, intent: Optional[dict] = None
+) -> Optional[dict]:
+    """
+    The aggregate question in ``query`` as ``{"club", "shape", "metrics", "by_club"}``.
+
+    An extracted ``intent`` (from the router or the LLM) decides: the question
+    is aggregate only if its intent is "aggregate". Without one, the query must
+    use aggregate wording and no avoid/fix wording. The lexical club and shape
+    win over the intent's.
+    """
+    text = query.lower()
+    intent = normalize_shot_intent(intent) or {}
+    extracted = intent.get("intent", "unknown")
+    if extracted != "unknown":
+        if extracted != "aggregate":
+            return None
+    elif not AGGREGATE_PATTERN.search(text) or AVOID_WORDS.search(text):
+        return None
+    parsed = parse_shot_intent(query)
+    club = normalize_club(parsed["club"]) or normalize_club(intent.get("club"))
+    shape = shape_family(parsed["shape"]) or shape_family(intent.get("shape"))
+    metrics = [metric for metric, pattern in METRIC_PATTERNS if pattern.search(text)]
+    return {
+        "club": club,
+        "shape": shape,
+        "metrics": metrics or ["carry_distance", "total_distance"],
+        "by_club": club is None and bool(BY_CLUB_PATTERN.search(text)),
+    }
+
+def format_stats(metric: str, stats: dict) -> str:
+    unit = UNITS[metric]
+    return (
+        f"mean {stats['mean']} {unit}, median {stats['p50']} {unit} "
+        f"(10th-90th percentile {stats['p10']}-{stats['p90']} {unit}), "
+        f"dispersion (std) {stats['std']} {unit}"
+    )
+
+def format_analytics(analytics, question: dict) -> str:
+    """Render the answer to ``question`` (see ``parse_aggregate_question``)."""
+    if question["by_club"]:
+        metric = question["metrics"][0]
+        rows = analytics.by_club(metric)
+        if not rows:
+            return f"{ANALYTICS_HEADER}: no recorded shots."
+        lines = [f"{ANALYTICS_HEADER}: {metric.replace('_', ' ')} by club"]
+        lines += [
+            f"- {row['club']} ({row['count']} shots): {format_stats(metric, row)}"
+            for row in rows
+        ]
+        return "\n".join(lines)
+
+    club, shape = question["club"], question["shape"]
+    summary = analytics.summarize(club, shape, question["metrics"])
+    subject = f"the {club}" if club else "all clubs"
+    if not summary["shots"]:
+        return f"{ANALYTICS_HEADER}: no recorded shots with {subject}."
+    lines = [f"{ANALYTICS_HEADER} for {subject} ({summary['shots']} shots):"]
+    if shape:
+        share = summary["matching"] / summary["shots"]
+        matching, shots = summary["matching"], summary["shots"]
+        line = f"- {shape.capitalize()}: {matching} of {shots} shots ({share:.1%})"
+        # The family total, then its classifications ("push slice 2, slice 1")
+        family = [
+            f"{name} {entry['count']}"
+            for name, entry in summary["shapes"].items()
+            if shape_family(name) == shape
+        ]
+        lines.append(f"{line}: {', '.join(family)}" if len(family) > 1 else line)
+    of_shape = f" of {shape} shots" if shape else ""
+    for metric, stats in summary["metrics"].items():
+        if stats is not None:
+            name = metric.replace("_", " ").capitalize()
+            lines.append(f"- {name}{of_shape}: {format_stats(metric, stats)}")
+    shapes = ", ".join(
+        f"{name} {entry['share']:.1%}" for name, entry in summary["shapes"].items()
+    )
+    if shapes:
+        lines.append(f"- Shot shapes: {shapes}")
+    return "\n".join(lines)
+
+def answer_aggregate_question(
+    query: str, intent: Optional[dict] = None
+) -> Optional[str]:
+    """
+    Answer an aggregate question exactly from the shot analytics columns.
+
+    Returns
+    -------
+    str or None
+        The answer, or None when the query is not aggregate, analytics are
+        disabled, or the shot data is unavailable (shot search answers instead).
+    """
+    if not SHOT_ANALYTICS_ENABLED or is_shot_analytics_unavailable():
+        return None
+    question = parse_aggregate_question(query, intent)
+    if question is None:
+        return None
     try:
-        search_result = client.query_points(
-            collection_name=COLLECTION_NAME,
-            query=query_vector,
-            limit=5,
-            with_payload=True
+        analytics = get_shot_analytics()
+    except Exception as e:
+        logger.warning(f"[SHOT ANALYTICS] Unavailable, searching shots instead: {e}")
+        return None
+    with observe_upstream("analytics", "aggregate"):
+        return format_analytics(analytics, question)
+
+def render_shot_analytics_answer(query: str, tool_result: str) -> Optional[str]:
+    """
+    Direct answer for the shot tool (see ``direct_answers`` in
+    ``backend/tools/registry.py``): analytics answers are returned as they are,
+    shot recommendations (None) still go to the summary LLM.
+    """
+    return tool_result if tool_result.startswith(ANALYTICS_HEADER) else None
+
+def preprocess_query_with_llm(query: str) -> str:
+    return intent_to_sentence(extract_shot_intent(query))
+
+def resolve_shot_intent(query: str, intent: Optional[dict] = None) -> dict:
+    """
+    The router's intent when usable; otherwise the lexical parse when
+    ``SHOT_LLM_PREPROCESSING`` allows it, else extract it from the query with the LLM.
+    """
+    resolved = normalize_shot_intent(intent)
+    if resolved is None and SHOT_LLM_PREPROCESSING != "always":
+        parsed = parse_shot_intent(query)
+        if (
+            SHOT_LLM_PREPROCESSING == "never"
+            or parsed["club"] != "unknown"
+            or parsed["shape"] != "unknown"
+        ):
+            resolved = parsed
+    if resolved is None:
+        # structure the query to more closely align with the embedded data.
+        resolved = normalize_shot_intent(extract_shot_intent(query)) or dict.fromkeys(
+            SHOT_INTENT_FIELDS, "unknown"
         )
+    return resolved
+
+def shot_filter_for(intent: dict) -> Optional[ShotFilter]:
+    return ShotFilter.from_intent(intent) if SHOT_FILTERS_ENABLED else None
+
+def raise_for_dimension_mismatch(error: UnexpectedResponse) -> None:
+    if "Vector dimension error" in str(error):
+        raise ValueError(
+            f"Vector dimension mismatch! "
+            f"The current embedding model ({EMBEDDING_MODEL}) "
+            f"produces vectors of a different dimension than what's expected "
+            f"by the Qdrant collection. "
+            f"Please check your EMBEDDING_MODEL environment variable "
+            f"and ensure it matches the model "
+            f"used to create the vectors in your Qdrant collection."
+        ) from error
+
+def search_local_index(query_vector, limit: int, shot_filter: Optional[ShotFilter]):
+    index = get_local_shot_index()
+    index.check_model(EMBEDDING_MODEL)
+    with observe_upstream("local_index", "search"):
+        return index.search(query_vector, limit, shot_filter)
+
+def query_qdrant(query_vector, limit: int, shot_filter: Optional[ShotFilter]):
+    client = get_qdrant_client()
+    try:
+        with observe_upstream("qdrant", "query_points"):
+            search_result = client.query_points(
+                collection_name=COLLECTION_NAME,
+                query=query_vector,
+                query_filter=shot_filter.to_qdrant() if shot_filter else None,
+                search_params=SHOT_SEARCH_PARAMS,
+                limit=limit,
+                with_payload=True
+            )
     except UnexpectedResponse as e:
-        if "Vector dimension error" in str(e):
-            raise ValueError(
-                f"Vector dimension mismatch! The current embedding model ({EMBEDDING_MODEL}) "
-                f"produces vectors of a different dimension than what's expected by the Qdrant collection. "
-                f"Please check your EMBEDDING_MODEL environment variable and ensure it matches the model "
-                f"used to create the vectors in your Qdrant collection."
-            ) from e
+        raise_for_dimension_mismatch(e)
         raise  # Re-raise other UnexpectedResponse errors
-    
-    # Format the results
+    return search_result.points
+
+async def aquery_qdrant(query_vector, limit: int, shot_filter: Optional[ShotFilter]):
+    client = get_async_qdrant_client()
+    try:
+        with observe_upstream("qdrant", "query_points"):
+            search_result = await client.query_points(
+                collection_name=COLLECTION_NAME,
+                query=query_vector,
+                query_filter=shot_filter.to_qdrant() if shot_filter else None,
+                search_params=SHOT_SEARCH_PARAMS,
+                limit=limit,
+                with_payload=True
+            )
+    except UnexpectedResponse as e:
+        raise_for_dimension_mismatch(e)
+        raise
+    return search_result.points
+
+def search_shots(
+    query_vector,
+    limit: int = SHOT_SEARCH_LIMIT,
+    shot_filter: Optional[ShotFilter] = None,
+):
+    """
+    Return the stored shots closest to ``query_vector`` from the configured backend.
+
+    With a ``shot_filter`` only matching shots are searched; if none match (too
+    narrow a filter, or a collection ingested without the payload fields) the
+    search is repeated over every shot.
+    """
+    search = search_local_index if SHOT_INDEX_BACKEND == "local" else query_qdrant
+    points = search(query_vector, limit, shot_filter)
+    if not points and shot_filter is not None:
+        logger.debug(
+            f"[SHOT SEARCH] No shots match {shot_filter}; searching without filters"
+        )
+        points = search(query_vector, limit, None)
+    return points
+
+async def asearch_shots(
+    query_vector,
+    limit: int = SHOT_SEARCH_LIMIT,
+    shot_filter: Optional[ShotFilter] = None,
+):
+    """
+    Async ``search_shots``: the local index searches in the tool executor,
+    Qdrant with the shared async client.
+    """
+    if SHOT_INDEX_BACKEND == "local":
+        # A full scan (plus rescoring) over every shot vector is CPU-bound;
+        # keep it off the event loop
+        return await run_blocking(search_shots, query_vector, limit, shot_filter)
+    points = await aquery_qdrant(query_vector, limit, shot_filter)
+    if not points and shot_filter is not None:
+        logger.debug(
+            f"[SHOT SEARCH] No shots match {shot_filter}; searching without filters"
+        )
+        points = await aquery_qdrant(query_vector, limit, None)
+    return points
+
+def lexical_query(query: str, intent: dict) -> str:
+    """
+    BM25 query: the golfer's words plus the club of the intent, and its shape
+    when the golfer wants that shape (boosting it would favour the very shots
+    an "avoid" query is trying to get away from).
+    """
+    fields = ("club", "shape") if intent["intent"] == "achieve" else ("club",)
+    return " ".join([query] + [intent[f] for f in fields if intent[f] != "unknown"])
+
+def search_lexical(text: str, limit: int, shot_filter: Optional[ShotFilter]):
+    """BM25 search of the shot texts, with the fallback of ``search_shots``."""
+    index = get_shot_lexical_index()
+    with observe_upstream("bm25", "search"):
+        hits = index.search(text, limit, shot_filter)
+        if not hits and shot_filter is not None:
+            hits = index.search(text, limit, None)
+    return hits
+
+def fuse_lexical(
+    dense_points, text: str, limit: int, shot_filter: Optional[ShotFilter]
+):
+    """Reciprocal rank fusion of dense and BM25 results (dense only without BM25)."""
+    if is_shot_lexical_index_unavailable():
+        # The failure was already logged once; don't retry the build on every query
+        return list(dense_points)[:limit]
+    try:
+        lexical = search_lexical(text, SHOT_HYBRID_CANDIDATES, shot_filter)
+    except Exception as e:
+        logger.warning(
+            f"[SHOT SEARCH] BM25 search unavailable, using dense results only: {e}"
+        )
+        return list(dense_points)[:limit]
+    return reciprocal_rank_fusion([dense_points, lexical], limit)
+
+def format_recommendations(points) -> str:
     recommendations = []
-    for point in search_result.points:
+    for point in points:
         recommendations.append(f"Score: {point.score:.4f} | {point.payload['text']}")
     
     if not recommendations:
         return "No relevant shot recommendations found."
     
-    return "\n".join(recommendations) 
\ No newline at end of file
+    return "\n".join(recommendations)
+
+def recommend_shots(query: str, intent: Optional[dict] = None) -> str:
+    """
+    Find the stored shots most similar to the golfer's intended shot.
+
+    The intent's club, distance and shape narrow the candidate shots before
+    the vector search (see ``ShotFilter``). With ``SHOT_HYBRID_SEARCH`` the
+    dense results are fused with a BM25 search of the shot texts. Aggregate
+    questions ("average carry with my 7 iron") are answered from the shot
+    analytics instead (see ``answer_aggregate_question``).
+
+    Parameters
+    ----------
+    query : str
+        The golfer's query.
+    intent : dict, optional
+        Shot intent already extracted by the router. When missing, it is
+        extracted here with a separate LLM call.
+
+    Returns
+    -------
+    str
+        The top matching shot descriptions with their similarity scores, or
+        the aggregate statistics.
+    """
+    answer = answer_aggregate_question(query, intent)
+    if answer is not None:
+        return answer
+    intent = resolve_shot_intent(query, intent)
+    if intent["intent"] == "aggregate":
+        answer = answer_aggregate_question(query, intent)
+        if answer is not None:
+            return answer
+    shot_filter = shot_filter_for(intent)
+    # Get embeddings for the query (normalized; the collection uses cosine distance)
+    query_vector = encode_texts([query_text(intent_to_sentence(intent))])[0]
+    if not SHOT_HYBRID_SEARCH:
+        return format_recommendations(
+            search_shots(query_vector, shot_filter=shot_filter)
+        )
+    dense = search_shots(query_vector, SHOT_HYBRID_CANDIDATES, shot_filter)
+    return format_recommendations(
+        fuse_lexical(
+            dense, lexical_query(query, intent), SHOT_SEARCH_LIMIT, shot_filter
+        )
+    )
+
+async def arecommend_shots(query: str, intent: Optional[dict] = None) -> str:
+    """
+    Async ``recommend_shots`` for the graph: the LLM and encode steps run in the
+    tool executor and the Qdrant search uses the async client.
+    """
+    answer = await run_blocking(answer_aggregate_question, query, intent)
+    if answer is not None:
+        return answer
+    intent = await run_blocking(resolve_shot_intent, query, intent)
+    if intent["intent"] == "aggregate":
+        answer = await run_blocking(answer_aggregate_question, query, intent)
+        if answer is not None:
+            return answer
+    shot_filter = shot_filter_for(intent)
+    query_vector = (
+        await run_blocking(encode_texts, [query_text(intent_to_sentence(intent))])
+    )[0]
+    if not SHOT_HYBRID_SEARCH:
+        return format_recommendations(
+            await asearch_shots(query_vector, shot_filter=shot_filter)
+        )
+    dense = await asearch_shots(query_vector, SHOT_HYBRID_CANDIDATES, shot_filter)
+    hits = await run_blocking(
+        fuse_lexical,
+        dense,
+        lexical_query(query, intent),
+        SHOT_SEARCH_LIMIT,
+        shot_filter,
+    )
+    return format_recommendations(hits)
+
+@tool
+def get_shot_recommendations(query: str) -> str:
+    """
+    Retrieves relevant golf shot recommendations based on the query using semantic search.
+    Useful for questions about club selection, shot technique, or avoiding certain
+    shot patterns, and for statistics about the golfer's past shots (average
+    carry, how often they slice).
+    """
+    logger.debug(f"[TOOL CALLED] get_shot_recommendations: {query}")
+    return recommend_shots(query)
@@ -5,8 +5,12 @@ Tool registry for the agent. Add tools here to make them available to your agent
 from langchain.tools import Tool
 from backend.tools.search_golfpedia_tool import search_golfpedia
 from backend.tools.course_insights_tool import course_insights
-from backend.tools.get_pro_stats_tool import get_pro_stats
-from backend.tools.golf_shot_recommendations_tool import get_shot_recommendations
+from backend.tools.get_pro_stats_tool import get_pro_stats, render_pro_stats_answer
+from backend.tools.golf_shot_recommendations_tool import (
+    arecommend_shots,
+    get_shot_recommendations,
+    render_shot_analytics_answer,
+)
 
 tools = [
     Tool(
@@ -27,7 +31,21 @@ tools = [
     Tool(
         name="get_shot_recommendations",
         func=get_shot_recommendations,
-        description="Retrieves relevant golf shot recommendations based on the query using semantic search. Useful for questions about club selection, shot technique, or avoiding certain shot patterns.",
+        description="Retrieves relevant golf shot recommendations based on the query using semantic search. Useful for questions about club selection, shot technique, or avoiding certain shot patterns, and for statistics about the golfer's past shots.",
     ),
     # Add other tools here later
 ]
+
+# Tools that can take structured arguments extracted by the router in the same LLM call.
+    # Each entry maps a tool name to a callable (or coroutine) taking (query, args).
+structured_tools = {
+    "get_shot_recommendations": arecommend_shots,
+}
+
+# Tools whose output is already user-ready. Each entry maps a tool name to a
+# renderer taking (query, tool_result) and returning the final answer, or None
+# to fall back to the summary LLM. Rendered answers go straight to the end of the graph.
+direct_answers = {
+    "get_pro_stats": render_pro_stats_answer,
+    "get_shot_recommendations": render_shot_analytics_answer,
+}
@@ -4,6 +4,7 @@ from tavily import TavilyClient
 from langchain.tools import tool
 from backend.tools.constants_tools import NO_SUMMARY_AVAILABLE
 from backend.core.logging_config import logger
+from backend.core.metrics import observe_upstream
 
 # Initialize the client lazily to allow for environment variable mocking in tests
 def get_tavily_client():
@@ -23,7 +24,8 @@ def search_golfpedia(query: str) -> str:
 
 def search_golfpedia_api(query: str) -> str:
     tavily = get_tavily_client()
-    result = tavily.search(query=query, search_depth="basic")
+    with observe_upstream("tavily", "search"):
+        result = tavily.search(query=query, search_depth="basic")
     
     # If there's a direct answer, return it
     if result.get("answer"):
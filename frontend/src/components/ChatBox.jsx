@@ -26,7 +26,7 @@ export default function ChatBox() {
     setIsStreaming(true)
 
     try {
-      const res = await fetch(`${getApiUrl()}/api/query`, {
+      const res = await fetch(`${getApiUrl()}/api/query/stream`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -44,43 +44,51 @@ export default function ChatBox() {
       }
 
       let aiResponse = ''
-      if (res.body) {
-        const reader = res.body.getReader()
-        const decoder = new TextDecoder('utf-8')
-        while (true) {
-          const { done, value } = await reader.read()
-          if (done) break
-          const text = decoder.decode(value)
-          try {
-            const parsed = JSON.parse(text)
-            const responseText = parsed.response || parsed.final_response || text
-            aiResponse += responseText
-            setMessages(prev => {
-              const newMessages = [...prev]
-              if (newMessages[newMessages.length - 1]?.type === 'ai') {
-                newMessages[newMessages.length - 1].content = aiResponse
-              } else {
-                newMessages.push({ type: 'ai', content: aiResponse })
-              }
-              return newMessages
-            })
-          } catch {
-            aiResponse += text
-            setMessages(prev => {
-              const newMessages = [...prev]
-              if (newMessages[newMessages.length - 1]?.type === 'ai') {
-                newMessages[newMessages.length - 1].content = aiResponse
-              } else {
-                newMessages.push({ type: 'ai', content: aiResponse })
-              }
-              return newMessages
-            })
+      const showAiMessage = (content) => {
+        setMessages(prev => {
+          const newMessages = [...prev]
+          if (newMessages[newMessages.length - 1]?.type === 'ai') {
+            newMessages[newMessages.length - 1].content = content
+          } else {
+            newMessages.push({ type: 'ai', content })
           }
+          return newMessages
+        })
+      }
+
+      // The agent streams Server-Sent Events: progress, token, done and error frames
+      const handleEvent = (eventType, data) => {
+        if (eventType === 'progress' && !aiResponse && data.status === 'start') {
+          showAiMessage(data.node === 'summarize' ? 'Writing answer…' : `Running ${data.node}…`)
+        } else if (eventType === 'token') {
+          aiResponse += data.content
+          showAiMessage(aiResponse)
+        } else if (eventType === 'done') {
+          aiResponse = data.response || aiResponse || 'No response received'
+          showAiMessage(aiResponse)
+        } else if (eventType === 'error') {
+          throw new Error(data.detail)
+        }
+      }
+
+      const reader = res.body.getReader()
+      const decoder = new TextDecoder('utf-8')
+      let buffer = ''
+      while (true) {
+        const { done, value } = await reader.read()
+        if (done) break
+        buffer += decoder.decode(value, { stream: true })
+        const frames = buffer.split('\n\n')
+        buffer = frames.pop()
+        for (const frame of frames) {
+          let eventType = 'message'
+          let data = ''
+          for (const line of frame.split('\n')) {
+            if (line.startsWith('event: ')) eventType = line.slice(7)
+            else if (line.startsWith('data: ')) data += line.slice(6)
+          }
+          if (data) handleEvent(eventType, JSON.parse(data))
         }
-      } else {
-        const data = await res.json()
-        const responseText = data.response || data.final_response || 'No response received'
-        setMessages(prev => [...prev, { type: 'ai', content: responseText }])
       }
     } catch (error) {
       console.error('Error:', error)